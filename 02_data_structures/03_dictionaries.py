@@ -4,6 +4,11 @@ Python Dictionaries
 This script demonstrates the creation, manipulation, and operations on Python dictionaries.
 """
 
+from collections import Counter
+
+from path_query import find_all, get_path
+from persistent_map import FrozenMap, deep_update as iterative_deep_update
+
 def demonstrate_dictionary_creation():
     """Demonstrate different ways to create dictionaries."""
     print("=== Dictionary Creation ===")
@@ -178,25 +183,24 @@ def demonstrate_nested_dictionaries():
     # Safe nested access
     def get_nested_value(dict_obj, keys, default=None):
         """Safely get nested dictionary value."""
-        try:
-            for key in keys:
-                dict_obj = dict_obj[key]
-            return dict_obj
-        except (KeyError, TypeError):
-            return default
+        # The key list is compiled once into a chained lookup and cached
+        # (see path_query.py), instead of being walked on every call
+        return get_path(dict_obj, keys, default)
     
     # Example of safe nested access
     physics_teacher = get_nested_value(school, ['teachers', 'physics'], 'Not assigned')
     print(f"\nPhysics teacher: {physics_teacher}")
     
+    # Path expressions with wildcards
+    all_subjects = find_all(school, "students.*.subjects[*]")
+    print(f"All subjects taken: {all_subjects}")
+    
     # Merging nested dictionaries
     def deep_update(d1, d2):
-        """Recursively update dictionary d1 with d2."""
-        for key, value in d2.items():
-            if key in d1 and isinstance(d1[key], dict) and isinstance(value, dict):
-                deep_update(d1[key], value)
-            else:
-                d1[key] = value
+        """Update dictionary d1 in place with d2, merging nested dicts."""
+        # Walks with an explicit stack instead of recursing (see
+        # persistent_map.py), so very deep trees are fine
+        iterative_deep_update(d1, d2)
     
     # Example of deep update
     update_info = {
@@ -207,6 +211,14 @@ def demonstrate_nested_dictionaries():
         }
     }
     
+    # Persistent merge: a new map sharing every untouched subtree, with no
+    # deepcopy and the original left as it was
+    frozen_school = FrozenMap(school)
+    updated_school = frozen_school.merge(update_info)
+    print(f"\nMerged copy: {updated_school['students']['alice']['subjects']}, "
+          f"original: {frozen_school['students']['alice']['subjects']}")
+    print(f"Teachers subtree shared: {updated_school['teachers'] is frozen_school['teachers']}")
+    
     deep_update(school, update_info)
     print(f"\nAlice's updated subjects: {school['students']['alice']['subjects']}")
 
@@ -216,11 +228,9 @@ def demonstrate_practical_examples():
     
     # Word frequency counter
     def count_words(text):
-        words = text.lower().split()
-        frequency = {}
-        for word in words:
-            frequency[word] = frequency.get(word, 0) + 1
-        return frequency
+        # Counter does the counting loop in C; for files bigger than memory,
+        # see word_counter.py (chunked, parallel and with top-k)
+        return dict(Counter(text.lower().split()))
     
     text = "the quick brown fox jumps over the lazy dog"
     print(f"Word frequency: {count_words(text)}")
@@ -4,11 +4,13 @@ Python Advanced Data Structure Operations
 This script demonstrates advanced operations and combinations of Python data structures.
 """
 
-from collections import defaultdict, Counter, deque
+from collections import defaultdict, Counter
 from typing import List, Dict, Set, Tuple
 import heapq
 from dataclasses import dataclass
-from datetime import datetime
+
+from lru_cache import LRUCache
+from timestamp_parser import parse_timestamp
 
 def demonstrate_advanced_comprehensions():
     """Demonstrate advanced comprehension techniques."""
@@ -137,42 +139,15 @@ def demonstrate_custom_data_structure():
     """Demonstrate implementation of a custom data structure."""
     print("\n=== Custom Data Structure ===")
     
-    class LRUCache:
-        """Least Recently Used (LRU) cache implementation."""
-        
-        def __init__(self, capacity: int):
-            self.capacity = capacity
-            self.cache = {}
-            self.usage = deque()
-        
-        def get(self, key: str) -> str:
-            if key not in self.cache:
-                return "Not found"
-            
-            # Move to most recently used
-            self.usage.remove(key)
-            self.usage.append(key)
-            return self.cache[key]
-        
-        def put(self, key: str, value: str) -> None:
-            if key in self.cache:
-                self.usage.remove(key)
-            elif len(self.cache) >= self.capacity:
-                # Remove least recently used
-                oldest = self.usage.popleft()
-                del self.cache[oldest]
-            
-            self.cache[key] = value
-            self.usage.append(key)
-    
     # Demonstrate LRU Cache
     cache = LRUCache(2)  # Cache with capacity 2
     cache.put("A", "Value A")
     cache.put("B", "Value B")
     print(f"Get A: {cache.get('A')}")
     cache.put("C", "Value C")  # This will remove B
-    print(f"Get B: {cache.get('B')}")  # Should be "Not found"
+    print(f"Get B: {cache.get('B', 'Not found')}")  # Should be "Not found"
     print(f"Get C: {cache.get('C')}")
+    print(f"Cache statistics: {cache.stats()}")
 
 def demonstrate_functional_operations():
     """Demonstrate functional programming operations on data structures."""
@@ -215,7 +190,10 @@ def demonstrate_practical_application():
         "2024-03-14 10:03:00 ERROR Network timeout"
     ]
     
-    # Parse and analyze logs
+    # Parse and analyze logs (see log_analyzer.py for a streaming,
+    # file-backed version that handles logs larger than memory, and
+    # sketches.py for fixed-memory counts and unique_errors when
+    # messages are unbounded)
     def analyze_logs(logs: List[str]) -> Dict[str, dict]:
         # Initialize data structures
         error_counts = Counter()
@@ -223,9 +201,9 @@ def demonstrate_practical_application():
         severity_stats = defaultdict(int)
         
         for entry in logs:
-            # Parse log entry
-            timestamp_str, severity, *message = entry.split()
-            timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d")
+            # Parse log entry: "YYYY-MM-DD HH:MM:SS SEVERITY message"
+            _, _, severity, *message = entry.split()
+            timestamp = parse_timestamp(entry)  # reads the leading 19 characters
             message = " ".join(message)
             
             # Update statistics
@@ -34,6 +34,8 @@ def exercise_1(data: Dict[str, List[Dict]]) -> List[str]:
     }
     
     Expected output: ['Figma', 'JavaScript', 'Python', 'R']
+    
+    ../path_query.py compiles such nested loops from one path expression.
     """
     # Your solution here
     # solution = sorted(set(
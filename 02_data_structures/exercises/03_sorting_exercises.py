@@ -41,6 +41,8 @@ def exercise_1(students: List[Student]) -> List[Student]:
     
     Expected output order: Charlie, Alice, David, Bob
     (First by grade desc, then age asc, then name asc)
+    
+    columnar_sort.py sorts by key columns instead of a tuple per record.
     """
     # Your solution here
     # solution = sorted(
@@ -68,6 +70,8 @@ def exercise_2(transactions: List[Transaction]) -> List[Tuple[str, float]]:
     ]
     
     Expected output: [('Food', 150.0), ('Transport', 225.0)]
+    
+    group_by.py adds count/mean/min/max; transaction_index.py totals date ranges.
     """
     # Your solution here
     # from collections import defaultdict
@@ -30,6 +30,8 @@ class Exercise1Stack:
     print(stack.get_max())  # Should print: 5
     stack.pop()
     print(stack.get_max())  # Should print: 3
+    
+    typed_stack.py keeps the same stack in array.array storage.
     """
     
     def __init__(self):
@@ -86,6 +88,8 @@ class Exercise2Queue:
     print(queue.get_average())  # Should print: 20.0
     queue.dequeue()
     print(queue.get_average())  # Should print: 25.0
+    
+    window_stats.py tracks these statistics over a sliding window.
     """
     
     def __init__(self):
@@ -140,6 +144,8 @@ class Exercise3Cache:
     print(cache.get("A"))  # Should print: 1
     # After 60 seconds...
     print(cache.get("A"))  # Should print: None
+    
+    expiring_cache.py expires entries from a heap instead of a full scan.
     """
     
     def __init__(self):
@@ -203,6 +209,8 @@ class Exercise4PriorityQueue:
     print(pq.get_highest_priority())  # Should print: "Task A"
     pq.update_priority("Task B", 4)
     print(pq.get_highest_priority())  # Should print: "Task B"
+    
+    indexed_heap.py updates priorities in place, without tombstones.
     """
     
     def __init__(self):
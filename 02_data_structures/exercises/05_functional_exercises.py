@@ -33,6 +33,8 @@ def exercise_1(numbers: List[int]) -> List[int]:
     Requirements:
     - Use only map, filter, and lambda functions
     - No list comprehensions or explicit loops
+    
+    03_functions_advanced/batch_pipeline.py runs this chain in NumPy chunks.
     """
     # Your solution here
     # solution = sorted(
@@ -67,6 +69,8 @@ def exercise_2(text: str) -> Dict[str, int]:
     Requirements:
     - Use functional programming concepts (map, filter, reduce)
     - No explicit loops
+    
+    ../sketches.py estimates these counts for unbounded streams in fixed memory.
     """
     # Your solution here
     # words = text.lower().split()
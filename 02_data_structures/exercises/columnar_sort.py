@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Columnar multi-key sorting.
+Sorts records as exercise_1 in 03_sorting_exercises.py does, but each sort
+key is extracted into a column once, the columns are argsorted, and the
+records are permuted by index.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, List, NamedTuple, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; argsort() falls back to list.sort
+    np = None
+
+
+class SortKey(NamedTuple):
+    """One sort criterion: an attribute name or key function, and a direction."""
+    key: Union[str, Callable[[Any], Any]]
+    descending: bool = False
+
+
+def _as_sort_key(key: Union[str, Callable, SortKey, tuple]) -> SortKey:
+    if isinstance(key, SortKey):
+        return key
+    if isinstance(key, tuple):
+        return SortKey(*key)
+    return SortKey(key)
+
+
+def extract_column(records: Sequence[Any], key: Union[str, Callable[[Any], Any]]) -> List[Any]:
+    """Return one key value per record, in record order."""
+    getter = attrgetter(key) if isinstance(key, str) else key
+    return list(map(getter, records))
+
+
+def _numpy_rank(column: Sequence[Any], descending: bool):
+    """Integer array ordering like column (reversed if descending), or None."""
+    try:
+        values = np.asarray(column)
+    except ValueError:   # Ragged sequences, such as tuples of varying length
+        return None
+    if values.ndim != 1 or values.dtype.kind not in "biufUS":
+        # Tuple keys become 2-D arrays, which lexsort cannot take as one key
+        return None
+    if values.dtype.kind in "US":
+        # asarray silently turns a mixed int/str column into strings, which
+        # would sort numbers as text
+        if not set(map(type, column)) <= {str if values.dtype.kind == "U" else bytes}:
+            return None
+        # Strings cannot be negated, so sort by their rank among unique values
+        _, values = np.unique(values, return_inverse=True)
+    if descending:
+        if values.dtype.kind in "bu":
+            # Negating unsigned values would wrap around
+            values = values.astype(np.int64)
+        values = -values
+    return values
+
+
+def argsort(columns: Sequence[Sequence[Any]], descending: Sequence[bool]) -> List[int]:
+    """
+    Return the indices that sort rows lexicographically by columns.
+
+    columns[0] is the primary key. The sort is stable, so rows that tie on
+    every column keep their original order. Uses numpy.lexsort when NumPy
+    is installed and every column has a numeric or string dtype; otherwise
+    does one stable list.sort pass per column, least significant first.
+    """
+    if not columns:
+        return []
+    if np is not None:
+        ranked = [_numpy_rank(column, desc) for column, desc in zip(columns, descending)]
+        if all(rank is not None for rank in ranked):
+            # lexsort treats its last key as the primary one
+            return np.lexsort(ranked[::-1]).tolist()
+
+    order = list(range(len(columns[0])))
+    for column, desc in zip(reversed(columns), reversed(descending)):
+        # reverse=True keeps ties in their current order, so passes compose
+        order.sort(key=column.__getitem__, reverse=desc)
+    return order
+
+
+def sort_records(records: Sequence[Any], keys: Sequence[Union[str, Callable, SortKey, tuple]]) -> List[Any]:
+    """
+    Sort records by several keys, each ascending or descending.
+
+    Args:
+        records: Objects to sort (dataclasses, namedtuples, ...)
+        keys: Criteria, most significant first: attribute names, key
+            functions, SortKey(...) or (key, descending) tuples
+
+    Returns:
+        List[Any]: A new, sorted list of the same records
+
+    Example:
+        sort_records(students, [SortKey("grade", descending=True), "age", "name"])
+    """
+    keys = [_as_sort_key(key) for key in keys]
+    columns = [extract_column(records, key.key) for key in keys]
+    order = argsort(columns, [key.descending for key in keys])
+    return list(map(records.__getitem__, order))
+
+
+def check_columnar_sort():
+    """Check against the tuple-key sort from exercise_1."""
+    import random
+    from dataclasses import dataclass
+
+    print("\nTesting columnar sort:")
+    print(f"NumPy available: {np is not None}")
+
+    @dataclass
+    class Student:
+        name: str
+        grade: float
+        age: int
+
+    students = [Student('Alice', 85.5, 20), Student('Bob', 85.5, 19),
+                Student('Charlie', 90.0, 20), Student('David', 85.5, 20)]
+    result = sort_records(students, [("grade", True), "age", "name"])
+    expected = sorted(students, key=lambda s: (-s.grade, s.age, s.name))
+    print(f"Result order: {[s.name for s in result]} "
+          f"(Expected: {[s.name for s in expected]}, as from the tuple key)")
+
+    rng = random.Random(9)
+    students = [Student(rng.choice("ABCDEFGH") * rng.randint(1, 3), rng.randint(0, 20) / 2,
+                        rng.randint(17, 25)) for _ in range(5_000)]
+    expected = sorted(students, key=lambda s: (-s.grade, s.age, s.name))
+    ok = sort_records(students, [("grade", True), "age", "name"]) == expected
+    # Descending strings are what the tuple-key trick cannot express
+    expected = sorted(sorted(students, key=lambda s: s.age), key=lambda s: s.name, reverse=True)
+    ok &= sort_records(students, [("name", True), "age"]) == expected
+    print(f"Random students match sorted(): {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+
+def benchmark_sort(n: int = 1_000_000):
+    """Compare a tuple key per record with columnar argsort."""
+    import random
+    import time
+    from dataclasses import dataclass
+
+    @dataclass
+    class Student:
+        name: str
+        grade: float
+        age: int
+
+    print(f"\n=== Multi-Key Sort Benchmark ({n:,} students) ===")
+    rng = random.Random(4)
+    names = [f"student{i}" for i in range(5_000)]
+    students = [Student(rng.choice(names), rng.randint(0, 200) / 2, rng.randint(17, 30))
+                for _ in range(n)]
+
+    candidates = {
+        "tuple key": lambda: sorted(students, key=lambda s: (-s.grade, s.age, s.name)),
+        "columnar": lambda: sort_records(students, [("grade", True), "age", "name"]),
+    }
+    expected = None
+    print(f"{'variant':<12} {'seconds':>8} {'speedup':>8}")
+    baseline = None
+    for name, run in candidates.items():
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        expected = expected if expected is not None else result
+        baseline = baseline or elapsed
+        status = '✓' if result == expected else '✗'
+        print(f"{name:<12} {elapsed:>8.2f} {baseline / elapsed:>7.1f}x {status}")
+    if np is None:
+        print("(NumPy is not installed; columnar used the multi-pass fallback)")
+
+
+def main():
+    """Check and benchmark columnar sorting."""
+    check_columnar_sort()
+    # Pass n=1_000_000 for the full-size run
+    benchmark_sort(n=200_000)
+
+
+if __name__ == "__main__":
+    main()
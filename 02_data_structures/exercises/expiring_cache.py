@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Time-based cache with a heap-ordered expiry index.
+Exercise3Cache from 04_custom_data_structures.py, with expired entries
+taken from a heap instead of a scan over every entry.
+"""
+
+import heapq
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class ExpiringCache:
+    """
+    Key-value cache whose entries expire after a per-entry duration.
+
+    Alongside the dictionary, a min-heap orders entries by expiry time, so
+    clear_expired() pops only what has expired: O(expired * log n) instead of
+    scanning every entry. Overwritten or removed entries leave stale heap
+    records behind; they are skipped when popped and the heap is rebuilt
+    once stale records outnumber live ones.
+
+    Example usage:
+    cache = ExpiringCache()
+    cache.put("A", 1, 60)  # Expires in 60 seconds
+    print(cache.get("A"))  # 1
+    cache.start_sweeper(interval=1.0, budget=0.005)
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._counter = 0
+        self._stale = 0
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, key: Hashable, value: Any, duration: float) -> None:
+        """Add key-value pair that expires after duration seconds."""
+        expiry = self._clock() + duration
+        with self._lock:
+            if key in self._entries:
+                self._stale += 1
+            self._entries[key] = (value, expiry)
+            self._counter += 1
+            heapq.heappush(self._heap, (expiry, self._counter, key))
+            self._maybe_compact()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get value for key (default if expired or not found)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expiry = entry
+            if self._clock() >= expiry:
+                del self._entries[key]
+                self._stale += 1
+                return default
+            return value
+
+    def remove(self, key: Hashable) -> None:
+        """Remove key-value pair."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._stale += 1
+                self._maybe_compact()
+
+    def clear_expired(self, budget: Optional[float] = None) -> int:
+        """
+        Remove expired entries, earliest expiry first.
+
+        Args:
+            budget: Maximum seconds to spend in this sweep. Work left over is
+                picked up by the next sweep. None means no limit.
+
+        Returns:
+            Number of entries removed
+        """
+        now = self._clock()
+        deadline = None if budget is None else time.perf_counter() + budget
+        removed = popped = 0
+        with self._lock:
+            heap, entries = self._heap, self._entries
+            while heap and heap[0][0] <= now:
+                expiry, _, key = heapq.heappop(heap)
+                popped += 1
+                entry = entries.get(key)
+                if entry is not None and entry[1] == expiry:
+                    del entries[key]
+                    removed += 1
+                else:
+                    self._stale -= 1
+                # Checking the clock on every pop would cost more than the pop
+                if deadline is not None and not popped & 63 and time.perf_counter() > deadline:
+                    break
+        return removed
+
+    def start_sweeper(self, interval: float = 1.0, budget: Optional[float] = 0.005) -> None:
+        """
+        Start a daemon thread that calls clear_expired() every interval seconds.
+
+        Args:
+            interval: Seconds between sweeps
+            budget: Time budget passed to each clear_expired() call
+        """
+        if self._sweeper is not None:
+            return
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.wait(interval):
+                self.clear_expired(budget)
+
+        self._sweeper = threading.Thread(target=run, name="ExpiringCacheSweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        """Stop the background sweeper thread, if running."""
+        if self._sweeper is None:
+            return
+        self._stop_event.set()
+        self._sweeper.join()
+        self._sweeper = None
+
+    def _maybe_compact(self) -> None:
+        """Rebuild the heap from live entries when stale records dominate."""
+        if self._stale > 1024 and self._stale > len(self._entries):
+            self._heap = [
+                (expiry, i, key)
+                for i, (key, (_, expiry)) in enumerate(self._entries.items())
+            ]
+            heapq.heapify(self._heap)
+            self._counter = len(self._heap)
+            self._stale = 0
+
+
+class ScanningCache:
+    """The list-comprehension sweep from Exercise3Cache, kept for benchmarking."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.cache = {}
+
+    def put(self, key: Hashable, value: Any, duration: float) -> None:
+        self.cache[key] = (value, self._clock() + duration)
+
+    def clear_expired(self) -> int:
+        current_time = self._clock()
+        expired_keys = [
+            key for key, (_, expiry) in self.cache.items()
+            if current_time >= expiry
+        ]
+        for key in expired_keys:
+            del self.cache[key]
+        return len(expired_keys)
+
+
+class FakeClock:
+    """Manually advanced clock so benchmarks need not sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def check_expiring_cache():
+    """Check expiry, removal, sweep budgets and the background sweeper."""
+    print("\nTesting ExpiringCache:")
+    clock = FakeClock()
+    cache = ExpiringCache(clock)
+    cache.put("A", 1, 60)
+    cache.put("B", 2, 0)
+    cache.put("C", 3, 10)
+    cache.put("C", 4, 120)  # Overwrite leaves a stale heap record
+    print(f"Value for key 'A': {cache.get('A')} (Expected: 1)")
+    print(f"Removed by sweep: {cache.clear_expired()} (Expected: 1)")
+    clock.now = 61
+    print(f"Removed after 61s: {cache.clear_expired()} (Expected: 1)")
+    print(f"Value for key 'C': {cache.get('C')} (Expected: 4)")
+
+    # Sweeps under a tight budget make steady progress instead of stalling
+    for i in range(100_000):
+        cache.put(i, i, 1)
+    clock.now = 100
+    sweeps = 0
+    while len(cache) > 1:
+        cache.clear_expired(budget=0.002)
+        sweeps += 1
+    print(f"Cleared 100,000 entries in {sweeps} budgeted sweeps")
+
+    live_cache = ExpiringCache()
+    live_cache.put("short", 1, 0.01)
+    live_cache.start_sweeper(interval=0.01)
+    time.sleep(0.05)
+    live_cache.stop_sweeper()
+    print(f"Entries left after background sweeps: {len(live_cache)} (Expected: 0)")
+
+
+def benchmark_expiry(sizes=(100_000, 1_000_000), ttls=(60, 300, 3600, 86400)):
+    """
+    Compare heap-indexed sweeps with full scans on a mix of TTLs.
+
+    Each entry lives between one and two times a TTL picked from ttls. After
+    an untimed sweep at the shortest TTL, the clock advances one second per
+    sweep, so each sweep only finds the entries that expired in that second.
+    """
+    import random
+
+    print("\n=== Expiry Sweep Benchmark (mixed TTLs) ===")
+    print(f"{'entries':>10} {'expired/sweep':>14} {'heap ms/sweep':>14} {'scan ms/sweep':>14}")
+    for n in sizes:
+        rng = random.Random(n)
+        durations = [rng.choice(ttls) * (1 + rng.random()) for _ in range(n)]
+        timings = []
+        for cache_type in (ExpiringCache, ScanningCache):
+            clock = FakeClock()
+            cache = cache_type(clock)
+            for key, duration in enumerate(durations):
+                cache.put(key, key, duration)
+            clock.now = min(ttls)
+            cache.clear_expired()
+            sweeps, expired = 10, 0
+            start = time.perf_counter()
+            for _ in range(sweeps):
+                clock.now += 1
+                expired += cache.clear_expired()
+            timings.append((time.perf_counter() - start) / sweeps)
+        print(f"{n:>10} {expired // sweeps:>14} {timings[0] * 1e3:>14.3f} "
+              f"{timings[1] * 1e3:>14.3f}")
+
+
+def main():
+    """Check and benchmark the expiring cache."""
+    check_expiring_cache()
+    benchmark_expiry()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Dictionary-encoded group-by aggregation.
+Group keys, such as exercise_2's categories in 03_sorting_exercises.py, are
+encoded to dense integer codes once, and sum, count, mean, min and max are
+computed per code with NumPy.
+"""
+
+from collections import Counter, defaultdict
+from itertools import count
+from typing import Any, Callable, Hashable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from columnar_sort import extract_column
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; aggregate() falls back to plain loops
+    np = None
+
+AGGREGATES = ("sum", "count", "mean", "min", "max")
+
+
+class GroupStats(NamedTuple):
+    """Aggregates for one group; aggregates that were not requested are None."""
+    key: Hashable
+    sum: Optional[float]
+    count: Optional[int]
+    mean: Optional[float]
+    min: Optional[float]
+    max: Optional[float]
+
+
+def encode(keys: Sequence[Hashable]) -> Tuple[List[int], List[Hashable]]:
+    """
+    Dictionary-encode keys into dense codes 0..k-1, in first-seen order.
+
+    Returns (codes, uniques) where uniques[codes[i]] == keys[i]. The lookup
+    runs through map() with a defaultdict whose factory hands out the next
+    code, so there is no Python-level loop.
+    """
+    mapping = defaultdict(count().__next__)
+    codes = list(map(mapping.__getitem__, keys))
+    return codes, list(mapping)
+
+
+def _aggregate_numpy(codes: Sequence[int], values: Sequence[float], groups: int, wanted: set) -> dict:
+    codes = np.asarray(codes, dtype=np.intp)
+    raw_values, values = values, np.asarray(values, dtype=np.float64)
+    counts = np.bincount(codes, minlength=groups)
+    result = {"count": counts.tolist()}
+    if wanted & {"sum", "mean"}:
+        sums = np.bincount(codes, weights=values, minlength=groups)
+        result["sum"] = sums.tolist()
+        result["mean"] = (sums / np.maximum(counts, 1)).tolist()
+    if wanted & {"min", "max"}:
+        # Min and max keep the column's own dtype, so int columns give ints
+        # as the pure-Python path does; each group starts from its first
+        # value (the last write wins, so assign in reverse), not a sentinel
+        extremes = np.asarray(raw_values)
+        if extremes.dtype.kind not in "biuf":
+            extremes = values
+        first = np.empty(groups, dtype=np.intp)
+        first[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+        if "min" in wanted:
+            mins = extremes[first]
+            np.minimum.at(mins, codes, extremes)
+            result["min"] = mins.tolist()
+        if "max" in wanted:
+            maxs = extremes[first]
+            np.maximum.at(maxs, codes, extremes)
+            result["max"] = maxs.tolist()
+    return result
+
+
+def _aggregate_python(keys: Sequence[Hashable], values: Sequence[float], wanted: set) -> tuple:
+    # Without NumPy, encoding first would only add a pass: aggregating
+    # straight into dicts keyed by group is the fastest pure-Python path.
+    # Every dict below lists the groups in first-seen order.
+    result, uniques = {}, None
+    if wanted & {"sum", "mean"}:
+        totals = defaultdict(float)
+        for key, value in zip(keys, values):
+            totals[key] += value
+        uniques = list(totals)
+        result["sum"] = [totals[key] for key in uniques]
+    if wanted & {"count", "mean"}:
+        # Counting needs no values, so Counter does it in C
+        tally = Counter(keys)
+        uniques = uniques or list(tally)
+        result["count"] = [tally[key] for key in uniques]
+    if "mean" in wanted:
+        result["mean"] = [total / n for total, n in zip(result["sum"], result["count"])]
+    if wanted & {"min", "max"}:
+        lowest, highest = {}, {}
+        for key, value in zip(keys, values):
+            if key not in lowest:
+                lowest[key] = highest[key] = value
+            elif value < lowest[key]:
+                lowest[key] = value
+            elif value > highest[key]:
+                highest[key] = value
+        uniques = uniques or list(lowest)
+        result["min"] = [lowest[key] for key in uniques]
+        result["max"] = [highest[key] for key in uniques]
+    return uniques or [], result
+
+
+def aggregate(keys: Sequence[Hashable], values: Sequence[float],
+              aggregates: Sequence[str] = AGGREGATES, sort_by: str = "sum",
+              descending: bool = True, use_numpy: Optional[bool] = None) -> List[GroupStats]:
+    """
+    Group values by key and compute the requested aggregates.
+
+    Args:
+        keys: Group key for each row
+        values: Numeric value for each row
+        aggregates: Any of "sum", "count", "mean", "min", "max"
+        sort_by: An aggregate name, or "key", to order the result by
+        descending: Sort direction
+        use_numpy: Force (True) or disable (False) the NumPy path; by
+            default it is used whenever NumPy is installed
+
+    Returns:
+        List[GroupStats]: One entry per distinct key
+    """
+    wanted = set(aggregates) | ({sort_by} - {"key"})
+    unknown = wanted - set(AGGREGATES)
+    if unknown:
+        raise ValueError(f"unknown aggregates: {sorted(unknown)}")
+    if len(keys) != len(values):
+        raise ValueError("keys and values must have the same length")
+    if use_numpy and np is None:
+        raise RuntimeError("NumPy is not installed")
+
+    if np is not None and use_numpy is not False:
+        codes, uniques = encode(keys)
+        columns = _aggregate_numpy(codes, values, len(uniques), wanted)
+    else:
+        uniques, columns = _aggregate_python(keys, values, wanted)
+    rows = [
+        GroupStats(key, *(columns[name][code] if name in wanted else None for name in AGGREGATES))
+        for code, key in enumerate(uniques)
+    ]
+    field = "key" if sort_by == "key" else sort_by
+    rows.sort(key=lambda row: getattr(row, field), reverse=descending)
+    return rows
+
+
+def aggregate_records(records: Sequence[Any], key: Union[str, Callable[[Any], Hashable]],
+                      value: Union[str, Callable[[Any], float]], **options: Any) -> List[GroupStats]:
+    """aggregate() over attribute (or key function) columns of records."""
+    return aggregate(extract_column(records, key), extract_column(records, value), **options)
+
+
+def check_group_by():
+    """Check the engine on exercise_2's data and against a dict loop."""
+    import random
+    from dataclasses import dataclass
+    from datetime import datetime
+
+    print("\nTesting group-by aggregation:")
+    print(f"NumPy available: {np is not None}")
+
+    @dataclass
+    class Transaction:
+        date: datetime
+        amount: float
+        category: str
+        description: str
+
+    transactions = [
+        Transaction(datetime(2024, 1, 1), 100.0, 'Food', 'Grocery'),
+        Transaction(datetime(2024, 1, 2), 50.0, 'Food', 'Restaurant'),
+        Transaction(datetime(2024, 1, 3), 200.0, 'Transport', 'Flight'),
+        Transaction(datetime(2024, 1, 4), 25.0, 'Transport', 'Taxi'),
+    ]
+    rows = aggregate_records(transactions, "category", "amount")
+    print(f"Totals: {[(row.key, row.sum) for row in rows]} "
+          f"(Expected: [('Transport', 225.0), ('Food', 150.0)])")
+    print(f"By largest single amount: {[(r.key, r.max) for r in aggregate_records(transactions, 'category', 'amount', sort_by='max')]}")
+
+    rng = random.Random(8)
+    keys = [rng.choice("ABCDEFG") for _ in range(10_000)]
+    values = [rng.uniform(-50, 50) for _ in range(10_000)]
+    groups = defaultdict(list)
+    for k, v in zip(keys, values):
+        groups[k].append(v)
+    ok = True
+    for use_numpy in ((False, True) if np is not None else (False,)):
+        for row in aggregate(keys, values, sort_by="key", descending=False, use_numpy=use_numpy):
+            members = groups[row.key]
+            ok &= row.count == len(members) and abs(row.sum - sum(members)) < 1e-6
+            ok &= row.min == min(members) and row.max == max(members)
+            ok &= abs(row.mean - sum(members) / len(members)) < 1e-9
+    print(f"Random groups match a dict of lists: {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+    # An int column gives int min/max on both paths, exact beyond 2**53
+    ints = [2**60 + 1, 3, -7, 2**60]
+    extremes = []
+    for use_numpy in ((False, True) if np is not None else (False,)):
+        rows = aggregate("abab", ints, sort_by="key", descending=False, use_numpy=use_numpy)
+        extremes.append([(row.min, row.max) for row in rows])
+    ok = all(result == [(-7, 2**60 + 1), (3, 2**60)] for result in extremes)
+    ok &= all(type(value) is int for result in extremes for pair in result for value in pair)
+    print(f"Int min/max: {extremes[-1]} (Expected: [(-7, {2**60 + 1}), (3, {2**60})])")
+    print(f"Same types with and without NumPy: {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+
+def benchmark_group_by(n: int = 10_000_000, categories: int = 50):
+    """Compare the exercise_2 dict loop with the group-by engine."""
+    import random
+    import time
+    from array import array
+
+    print(f"\n=== Group-By Benchmark ({n:,} rows, {categories} categories) ===")
+    rng = random.Random(6)
+    names = [f"category{i}" for i in range(categories)]
+    keys = [names[rng.randrange(categories)] for _ in range(n)]
+    amounts = array("d", (rng.uniform(1, 500) for _ in range(n)))
+
+    def dict_loop():
+        # exercise_2's solution, sum only
+        totals = defaultdict(float)
+        for category, amount in zip(keys, amounts):
+            totals[category] += amount
+        return sorted(totals.items(), key=lambda x: -x[1])
+
+    candidates = {
+        "dict loop (sum)": dict_loop,
+        "fallback (sum)": lambda: aggregate(keys, amounts, ("sum",), use_numpy=False),
+        "fallback (all five)": lambda: aggregate(keys, amounts, use_numpy=False),
+    }
+    if np is not None:
+        candidates["numpy (all five)"] = lambda: aggregate(keys, amounts, use_numpy=True)
+    else:
+        print("(NumPy is not installed; skipping the bincount/ufunc.at run)")
+
+    print(f"{'variant':<20} {'seconds':>8} {'rows/s':>14}")
+    for name, run in candidates.items():
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<20} {elapsed:>8.2f} {n / elapsed:>14,.0f}")
+
+
+def main():
+    """Check and benchmark the group-by engine."""
+    check_group_by()
+    # Pass n=10_000_000 for the full-size run
+    benchmark_group_by(n=1_000_000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Indexed binary heap with in-place priority updates.
+Exercise4PriorityQueue from 04_custom_data_structures.py without tombstones:
+each task's heap position is tracked, so updates and removals sift in place.
+"""
+
+import heapq
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class IndexedPriorityQueue:
+    """
+    Max-priority queue that tracks where every task sits in the heap.
+
+    Because each task's index is known, update_priority() and remove_task()
+    sift the task in place in O(log n). Nothing is ever tombstoned, so the
+    heap holds exactly one entry per live task. Tasks with equal priority
+    come out in the order they were added (or last re-prioritized).
+
+    Example usage:
+    pq = IndexedPriorityQueue()
+    pq.add_task("Task A", 3)
+    pq.add_task("Task B", 1)
+    pq.update_priority("Task B", 4)
+    print(pq.get_highest_priority())  # Task B
+    """
+
+    __slots__ = ("_keys", "_tasks", "_position", "_counter")
+
+    def __init__(self):
+        # Parallel arrays: _keys[i] orders _tasks[i]. A key is
+        # (-priority, insertion counter), so the smallest key wins.
+        self._keys: List[Tuple[int, int]] = []
+        self._tasks: List[Hashable] = []
+        self._position: Dict[Hashable, int] = {}
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task: Hashable) -> bool:
+        return task in self._position
+
+    def add_task(self, task: Hashable, priority: int) -> None:
+        """Add a task with the given priority, or re-prioritize it if present."""
+        if task in self._position:
+            self.update_priority(task, priority)
+            return
+        self._counter += 1
+        self._keys.append((-priority, self._counter))
+        self._tasks.append(task)
+        index = len(self._tasks) - 1
+        self._position[task] = index
+        self._sift_up(index)
+
+    def peek(self) -> Optional[Hashable]:
+        """Return the highest priority task without removing it."""
+        return self._tasks[0] if self._tasks else None
+
+    def priority(self, task: Hashable) -> int:
+        """Return the current priority of task."""
+        return -self._keys[self._position[task]][0]
+
+    def get_highest_priority(self) -> Optional[Hashable]:
+        """Remove and return the highest priority task."""
+        if not self._tasks:
+            return None
+        task = self._tasks[0]
+        self._remove_at(0)
+        return task
+
+    def update_priority(self, task: Hashable, new_priority: int) -> None:
+        """Change the priority of an existing task, sifting it in place."""
+        index = self._position[task]
+        old_key = self._keys[index]
+        self._counter += 1
+        new_key = (-new_priority, self._counter)
+        self._keys[index] = new_key
+        if new_key < old_key:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def remove_task(self, task: Hashable) -> None:
+        """Remove a specific task. Raises KeyError if it is not queued."""
+        self._remove_at(self._position[task])
+
+    def _remove_at(self, index: int) -> None:
+        keys, tasks, position = self._keys, self._tasks, self._position
+        del position[tasks[index]]
+        last_key = keys.pop()
+        last_task = tasks.pop()
+        if index == len(tasks):
+            return
+        # Fill the hole with the last entry, then restore heap order
+        keys[index] = last_key
+        tasks[index] = last_task
+        position[last_task] = index
+        if index > 0 and last_key < keys[(index - 1) >> 1]:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def _sift_up(self, index: int) -> None:
+        keys, tasks, position = self._keys, self._tasks, self._position
+        key, task = keys[index], tasks[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_key = keys[parent]
+            if key >= parent_key:
+                break
+            # Move the parent down into the hole instead of swapping
+            keys[index] = parent_key
+            parent_task = tasks[parent]
+            tasks[index] = parent_task
+            position[parent_task] = index
+            index = parent
+        keys[index] = key
+        tasks[index] = task
+        position[task] = index
+
+    def _sift_down(self, index: int) -> None:
+        keys, tasks, position = self._keys, self._tasks, self._position
+        size = len(keys)
+        key, task = keys[index], tasks[index]
+        child = 2 * index + 1
+        while child < size:
+            right = child + 1
+            if right < size and keys[right] < keys[child]:
+                child = right
+            child_key = keys[child]
+            if key <= child_key:
+                break
+            keys[index] = child_key
+            child_task = tasks[child]
+            tasks[index] = child_task
+            position[child_task] = index
+            index = child
+            child = 2 * index + 1
+        keys[index] = key
+        tasks[index] = task
+        position[task] = index
+
+
+class TombstonePriorityQueue:
+    """The tombstoning approach from Exercise4PriorityQueue, kept for benchmarking."""
+
+    def __init__(self):
+        self.tasks = []
+        self.task_lookup = {}
+        self.counter = 0
+
+    def __len__(self) -> int:
+        return len(self.task_lookup)
+
+    def add_task(self, task: Hashable, priority: int) -> None:
+        if task in self.task_lookup:
+            self.remove_task(task)
+        entry = [-priority, self.counter, task]
+        self.counter += 1
+        heapq.heappush(self.tasks, entry)
+        self.task_lookup[task] = entry
+
+    def get_highest_priority(self) -> Optional[Hashable]:
+        while self.tasks:
+            _, _, task = heapq.heappop(self.tasks)
+            if task is not None:
+                del self.task_lookup[task]
+                return task
+        return None
+
+    def update_priority(self, task: Hashable, new_priority: int) -> None:
+        self.remove_task(task)
+        self.add_task(task, new_priority)
+
+    def remove_task(self, task: Hashable) -> None:
+        entry = self.task_lookup.pop(task, None)
+        if entry:
+            entry[-1] = None  # Mark as removed
+
+
+def check_indexed_heap():
+    """Check ordering, in-place updates and removals."""
+    print("\nTesting IndexedPriorityQueue:")
+    pq = IndexedPriorityQueue()
+    pq.add_task("Task A", 3)
+    pq.add_task("Task B", 1)
+    pq.add_task("Task C", 2)
+    print(f"Highest priority task: {pq.get_highest_priority()} (Expected: Task A)")
+
+    pq.add_task("Task D", 2)
+    pq.update_priority("Task D", 4)
+    print(f"Highest priority task after update: {pq.get_highest_priority()} (Expected: Task D)")
+
+    pq.update_priority("Task C", 0)   # decrease-key sifts down
+    pq.remove_task("Task B")
+    print(f"Remaining: {pq.get_highest_priority()}, size {len(pq)} (Expected: Task C, size 0)")
+
+    # Cross-check against sorting on random churn
+    import random
+    rng = random.Random(7)
+    pq, expected = IndexedPriorityQueue(), {}
+    for _ in range(20_000):
+        task = rng.randrange(500)
+        if task in expected and rng.random() < 0.2:
+            pq.remove_task(task)
+            del expected[task]
+        else:
+            priority = rng.randrange(1_000)
+            pq.add_task(task, priority)
+            expected[task] = priority
+    drained = []
+    while len(pq):
+        drained.append(pq.priority(pq.peek()))
+        pq.get_highest_priority()
+    ok = drained == sorted(expected.values(), reverse=True)
+    print(f"Random churn drains in priority order: {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+
+def benchmark_churn(tasks: int = 10_000, updates: int = 1_000_000):
+    """
+    Re-prioritize random tasks many times, then drain the queue.
+
+    Reports update throughput, how many heap entries each approach ends up
+    holding, and how long draining takes once the garbage has built up.
+    """
+    import random
+    import time
+
+    print(f"\n=== Churn Benchmark: {updates:,} updates over {tasks:,} tasks ===")
+    rng = random.Random(42)
+    changes = [(rng.randrange(tasks), rng.randrange(1_000_000)) for _ in range(updates)]
+
+    print(f"{'queue':<22} {'update ns/op':>13} {'heap entries':>13} {'drain ms':>10}")
+    for queue_type in (IndexedPriorityQueue, TombstonePriorityQueue):
+        pq = queue_type()
+        for task in range(tasks):
+            pq.add_task(task, rng.randrange(1_000_000))
+
+        update = pq.update_priority
+        start = time.perf_counter()
+        for task, priority in changes:
+            update(task, priority)
+        update_time = time.perf_counter() - start
+
+        entries = len(pq._keys) if isinstance(pq, IndexedPriorityQueue) else len(pq.tasks)
+
+        start = time.perf_counter()
+        while pq.get_highest_priority() is not None:
+            pass
+        drain_time = time.perf_counter() - start
+
+        print(f"{queue_type.__name__:<22} {update_time / updates * 1e9:>13.0f} "
+              f"{entries:>13,} {drain_time * 1e3:>10.1f}")
+
+
+def main():
+    """Check and benchmark the indexed heap."""
+    check_indexed_heap()
+    benchmark_churn()
+
+
+if __name__ == "__main__":
+    main()
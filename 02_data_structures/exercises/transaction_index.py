@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Date-range index over Transaction records.
+Records are kept sorted by date and daily and monthly totals per category
+are maintained on append, so exercise_2's per-category totals
+(03_sorting_exercises.py) for a window such as "March" need no full scan.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_DAY = 86_400
+_DAY_US = _DAY * 1_000_000
+
+
+def to_epoch_us(moment: datetime) -> int:
+    """
+    Microseconds since 1970-01-01 for a naive datetime, treated as UTC.
+
+    Keeping datetime's full precision means a window edge compares exactly
+    as the datetimes themselves do; whole seconds would move a record at
+    12:00:00.5 to one side of a 12:00:00.7 bound that it is really on.
+    """
+    return (((moment.toordinal() - _EPOCH_ORDINAL) * _DAY
+             + moment.hour * 3600 + moment.minute * 60 + moment.second) * 1_000_000
+            + moment.microsecond)
+
+
+def _month_index(day: int) -> int:
+    moment = date.fromordinal(day + _EPOCH_ORDINAL)
+    return moment.year * 12 + moment.month - 1
+
+
+def _month_start(month: int) -> int:
+    return date(month // 12, month % 12 + 1, 1).toordinal() - _EPOCH_ORDINAL
+
+
+class TransactionIndex:
+    """
+    Time-ordered transaction store with per-category daily/monthly rollups.
+
+    Records are kept sorted by an array of epoch-microsecond keys. An append
+    that is not older than the newest record is O(1); a late arrival is
+    placed with bisect and list.insert, which only moves the records after
+    it, so near-sorted streams stay cheap.
+
+    total() splits a [start, end) range into whole months, whole days and
+    at most two partial days. Whole periods are read from the rollups and
+    only the partial days are scanned, so a query costs O(log n + buckets
+    + records in the two boundary days) instead of O(n).
+
+    Example usage:
+    index = TransactionIndex(transactions)
+    index.total(datetime(2024, 3, 1), datetime(2024, 4, 1))           # by category
+    index.total(datetime(2024, 3, 1), datetime(2024, 4, 1), "Food")   # one category
+    """
+
+    def __init__(self, transactions: Any = ()):
+        self._keys = array("q")
+        self._records: List[Any] = []
+        # category -> day number (or month index) -> total amount
+        self._daily: Dict[str, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
+        self._monthly: Dict[str, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
+        self.late_inserts = 0
+        for transaction in transactions:
+            self.append(transaction)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, transaction: Any) -> None:
+        """Add a transaction, keeping records in date order."""
+        key = to_epoch_us(transaction.date)
+        keys = self._keys
+        if not keys or key >= keys[-1]:
+            keys.append(key)
+            self._records.append(transaction)
+        else:
+            # After any equal keys, so ties keep arrival order
+            position = bisect_right(keys, key)
+            keys.insert(position, key)
+            self._records.insert(position, transaction)
+            self.late_inserts += 1
+        day = key // _DAY_US
+        self._daily[transaction.category][day] += transaction.amount
+        self._monthly[transaction.category][_month_index(day)] += transaction.amount
+
+    def between(self, start: datetime, end: datetime) -> List[Any]:
+        """Records with start <= date < end, in date order."""
+        keys = self._keys
+        return self._records[bisect_left(keys, to_epoch_us(start)):bisect_left(keys, to_epoch_us(end))]
+
+    def _scan(self, start: int, end: int, totals: Dict[str, float], category: Optional[str]) -> None:
+        keys, records = self._keys, self._records
+        for index in range(bisect_left(keys, start), bisect_left(keys, end)):
+            record = records[index]
+            if category is None or record.category == category:
+                totals[record.category] += record.amount
+
+    def _add_bucket(self, rollup: Dict[str, Dict[int, float]], bucket: int,
+                    totals: Dict[str, float], category: Optional[str]) -> None:
+        for name in ((category,) if category is not None else rollup):
+            amount = rollup[name].get(bucket) if name in rollup else None
+            if amount is not None:
+                totals[name] += amount
+
+    def total(self, start: datetime, end: datetime, category: Optional[str] = None) -> Any:
+        """
+        Total amount for start <= date < end.
+
+        Returns a {category: total} dict, or a single float if category is
+        given.
+        """
+        totals: Dict[str, float] = defaultdict(float)
+        first, last = to_epoch_us(start), to_epoch_us(end)
+        first_day = -(-first // _DAY_US)   # First midnight at or after start
+        last_day = last // _DAY_US         # Last midnight at or before end
+        if first_day >= last_day:
+            self._scan(first, last, totals, category)
+        else:
+            self._scan(first, first_day * _DAY_US, totals, category)
+            self._scan(last_day * _DAY_US, last, totals, category)
+            day = first_day
+            while day < last_day:
+                month = _month_index(day)
+                next_month = _month_start(month + 1)
+                if _month_start(month) == day and next_month <= last_day:
+                    self._add_bucket(self._monthly, month, totals, category)
+                    day = next_month
+                else:
+                    self._add_bucket(self._daily, day, totals, category)
+                    day += 1
+        if category is not None:
+            return totals.get(category, 0.0)
+        return dict(totals)
+
+    def daily_totals(self, category: str) -> Dict[date, float]:
+        """Per-day totals for one category, in date order."""
+        return {date.fromordinal(day + _EPOCH_ORDINAL): amount
+                for day, amount in sorted(self._daily.get(category, {}).items())}
+
+    def monthly_totals(self, category: str) -> Dict[str, float]:
+        """Per-month totals for one category, keyed "YYYY-MM", in order."""
+        return {f"{month // 12:04d}-{month % 12 + 1:02d}": amount
+                for month, amount in sorted(self._monthly.get(category, {}).items())}
+
+
+def _make_transactions(n: int, seed: int, categories: int = 20, days: int = 730,
+                       late_fraction: float = 0.1) -> list:
+    """Near-sorted synthetic transactions: some arrive up to an hour late."""
+    import random
+    from dataclasses import dataclass
+    from datetime import timedelta
+
+    @dataclass
+    class Transaction:
+        date: datetime
+        amount: float
+        category: str
+        description: str
+
+    rng = random.Random(seed)
+    names = [f"category{i}" for i in range(categories)]
+    origin = datetime(2023, 1, 1)
+    step = days * _DAY / n
+    transactions = []
+    for i in range(n):
+        offset = i * step
+        if rng.random() < late_fraction:
+            offset = max(0.0, offset - rng.uniform(0, 3600))
+        transactions.append(Transaction(origin + timedelta(seconds=offset),
+                                        round(rng.uniform(1, 300), 2),
+                                        rng.choice(names), ""))
+    return transactions
+
+
+def check_transaction_index():
+    """Check windowed totals against a full scan."""
+    import random
+    from datetime import timedelta
+
+    print("\nTesting TransactionIndex:")
+    transactions = _make_transactions(20_000, seed=1, categories=4, days=120)
+    index = TransactionIndex(transactions)
+    ordered = [to_epoch_us(t.date) for t in index.between(datetime(2000, 1, 1), datetime(2100, 1, 1))]
+    print(f"Records in date order after {index.late_inserts:,} late inserts: "
+          f"{'✓ Correct!' if ordered == sorted(ordered) else '✗ Not quite right.'}")
+
+    rng = random.Random(2)
+    origin = datetime(2023, 1, 1)
+    ok = True
+    for _ in range(200):
+        # Sub-second bounds, so records in the same second fall on both sides
+        start = origin + timedelta(seconds=rng.randrange(130 * _DAY), microseconds=rng.randrange(10**6))
+        end = start + timedelta(seconds=rng.randrange(70 * _DAY), microseconds=rng.randrange(10**6))
+        expected = defaultdict(float)
+        for t in transactions:
+            if start <= t.date < end:
+                expected[t.category] += t.amount
+        result = index.total(start, end)
+        ok &= set(result) == set(expected) and all(
+            abs(result[name] - expected[name]) < 1e-6 for name in expected)
+        name = rng.choice(list(expected) or ["none"])
+        ok &= abs(index.total(start, end, name) - expected.get(name, 0.0)) < 1e-6
+    print(f"Random windows match a full scan: {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+
+def benchmark_transaction_index(n: int = 1_000_000):
+    """Compare monthly totals from a full scan with the index."""
+    import time
+
+    print(f"\n=== Transaction Index Benchmark ({n:,} transactions over 2 years) ===")
+    transactions = _make_transactions(n, seed=3)
+
+    start = time.perf_counter()
+    index = TransactionIndex(transactions)
+    elapsed = time.perf_counter() - start
+    print(f"Build by appending: {elapsed:.2f} s ({n / elapsed:,.0f} appends/s, "
+          f"{index.late_inserts:,} late)")
+
+    window = (datetime(2024, 3, 1), datetime(2024, 4, 1))
+    partial = (datetime(2024, 3, 3, 12), datetime(2024, 5, 17, 9))
+
+    def scan(start, end):
+        totals = defaultdict(float)
+        for t in transactions:
+            if start <= t.date < end:
+                totals[t.category] += t.amount
+        return totals
+
+    print(f"{'query':<28} {'full scan ms':>13} {'index ms':>10}")
+    for label, (start, end) in (("March 2024", window), ("Mar 3 12:00 - May 17 09:00", partial)):
+        began = time.perf_counter()
+        expected = scan(start, end)
+        scan_ms = (time.perf_counter() - began) * 1e3
+        began = time.perf_counter()
+        result = index.total(start, end)
+        index_ms = (time.perf_counter() - began) * 1e3
+        ok = all(abs(result[name] - expected[name]) < 1e-3 for name in expected)
+        print(f"{label:<28} {scan_ms:>13.1f} {index_ms:>10.2f} {'✓' if ok else '✗'}")
+
+
+def main():
+    """Check and benchmark the transaction index."""
+    check_transaction_index()
+    # Pass n=1_000_000 for the full-size run
+    benchmark_transaction_index(n=200_000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Typed stack with O(1) max, min and sum.
+Exercise1Stack from 04_custom_data_structures.py, stored in array.array
+instead of lists.
+"""
+
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, chain, compress, islice
+from operator import gt, lt
+from typing import Callable, Iterable, List, Optional, Union
+
+Number = Union[int, float]
+
+
+class TypedStack:
+    """
+    Stack of machine numbers with O(1) get_max(), get_min() and get_sum().
+
+    Values live in one array.array (8 bytes each for the default 'q'
+    typecode, against roughly 36 bytes for a list slot plus an int object).
+    Max and min are tracked as typed arrays of positions at which a new
+    maximum or minimum was pushed; these stay short for most inputs, and
+    popping any number of values trims them with one bisect. Integer sums
+    are kept exactly in a Python int; float stacks keep a parallel prefix
+    sum array so popping never accumulates rounding error.
+
+    Example usage:
+    stack = TypedStack()
+    stack.push_many([3, 5, 2])
+    print(stack.get_max(), stack.get_min(), stack.get_sum())  # 5 2 10
+    stack.pop_many(2)                                         # array('q', [2, 5])
+    print(stack.get_max())                                    # 3
+    """
+
+    __slots__ = ("_values", "_max_at", "_min_at", "_max", "_min", "_total", "_sums")
+
+    def __init__(self, typecode: str = "q", values: Iterable[Number] = ()):
+        self._values = array(typecode)
+        self._max_at = array("q")
+        self._min_at = array("q")
+        # Cached values at _max_at[-1] and _min_at[-1]
+        self._max = self._min = None
+        self._total = 0
+        # Prefix sums, only for float typecodes
+        self._sums = array("d") if typecode in "fd" else None
+        self.push_many(values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def typecode(self) -> str:
+        return self._values.typecode
+
+    def push(self, value: Number) -> None:
+        """Push one value. Raises OverflowError if it does not fit the typecode."""
+        values = self._values
+        index = len(values)
+        values.append(value)
+        if self._sums is None:
+            self._total += value
+        else:
+            value = values[index]  # Compare and sum the stored (rounded) value
+            self._sums.append((self._sums[-1] if index else 0.0) + value)
+        if not index:
+            self._max = self._min = value
+            self._max_at.append(0)
+            self._min_at.append(0)
+        elif value > self._max:
+            self._max = value
+            self._max_at.append(index)
+        elif value < self._min:
+            self._min = value
+            self._min_at.append(index)
+
+    def push_many(self, values: Iterable[Number]) -> None:
+        """Push values in order, with no Python-level loop per element."""
+        chunk = values if isinstance(values, array) and values.typecode == self.typecode \
+            else array(self.typecode, values)
+        if not chunk:
+            return
+        start = len(self._values)
+        self._values.extend(chunk)
+        self._extend_records(self._max_at, chunk, start, max, gt)
+        self._extend_records(self._min_at, chunk, start, min, lt)
+        self._refresh_extremes()
+        if self._sums is None:
+            self._total += sum(chunk)
+        else:
+            previous = self._sums[-1] if start else 0.0
+            self._sums.extend(islice(accumulate(chunk, initial=previous), 1, None))
+
+    def _extend_records(self, records: array, chunk: array, start: int,
+                        pick: Callable, beats: Callable) -> None:
+        # Position i becomes a record when chunk[i] beats the best value
+        # before it, which is the running best shifted by one
+        if records:
+            best = self._values[records[-1]]
+        else:
+            # chunk[0] ties with itself, so the scan below will not repeat it
+            records.append(start)
+            best = chunk[0]
+        # Once the stack is large most chunks set no new record at all
+        if not beats(pick(chunk), best):
+            return
+        running = accumulate(chain((best,), chunk), pick)
+        records.extend(compress(range(start, start + len(chunk)), map(beats, chunk, running)))
+
+    def pop(self) -> Optional[Number]:
+        """Remove and return the top value, or None if the stack is empty."""
+        values = self._values
+        if not values:
+            return None
+        value = values.pop()
+        index = len(values)
+        if self._sums is None:
+            self._total -= value
+        else:
+            self._sums.pop()
+        if self._max_at[-1] == index:
+            self._max_at.pop()
+            self._max = values[self._max_at[-1]] if index else None
+        if self._min_at[-1] == index:
+            self._min_at.pop()
+            self._min = values[self._min_at[-1]] if index else None
+        return value
+
+    def pop_many(self, count: int) -> array:
+        """
+        Remove up to count values and return them in pop order (top first).
+
+        Records for the removed positions are trimmed with a bisect each, so
+        the cost is one slice copy plus O(log n).
+        """
+        values = self._values
+        keep = max(len(values) - count, 0)
+        popped = values[keep:]
+        popped.reverse()
+        if self._sums is None:
+            self._total -= sum(popped)
+        else:
+            del self._sums[keep:]
+        del values[keep:]
+        del self._max_at[bisect_left(self._max_at, keep):]
+        del self._min_at[bisect_left(self._min_at, keep):]
+        self._refresh_extremes()
+        return popped
+
+    def _refresh_extremes(self) -> None:
+        values = self._values
+        self._max = values[self._max_at[-1]] if values else None
+        self._min = values[self._min_at[-1]] if values else None
+
+    def peek(self) -> Optional[Number]:
+        """Return the top value without removing it."""
+        return self._values[-1] if self._values else None
+
+    def get_max(self) -> Optional[Number]:
+        return self._max
+
+    def get_min(self) -> Optional[Number]:
+        return self._min
+
+    def get_sum(self) -> Number:
+        if self._sums is None:
+            return self._total
+        return self._sums[-1] if self._sums else 0.0
+
+    def is_empty(self) -> bool:
+        return not self._values
+
+    def nbytes(self) -> int:
+        """Bytes used by the stored numbers (buffers only, excluding slack)."""
+        arrays = [self._values, self._max_at, self._min_at]
+        if self._sums is not None:
+            arrays.append(self._sums)
+        return sum(len(a) * a.itemsize for a in arrays)
+
+
+class ListMaxStack:
+    """The two-list approach from Exercise1Stack, kept for benchmarking."""
+
+    def __init__(self):
+        self.stack: List[int] = []
+        self.max_stack: List[int] = []
+
+    def push(self, value: int) -> None:
+        self.stack.append(value)
+        if not self.max_stack or value >= self.max_stack[-1]:
+            self.max_stack.append(value)
+
+    def pop(self) -> Optional[int]:
+        if not self.stack:
+            return None
+        value = self.stack.pop()
+        if value == self.max_stack[-1]:
+            self.max_stack.pop()
+        return value
+
+    def get_max(self) -> Optional[int]:
+        return self.max_stack[-1] if self.max_stack else None
+
+
+def check_typed_stack():
+    """Check single and bulk operations against a plain list."""
+    print("\nTesting TypedStack:")
+    stack = TypedStack()
+    stack.push(3)
+    stack.push(5)
+    stack.push(2)
+    print(f"Max/min/sum after pushing 3, 5, 2: {stack.get_max()}, {stack.get_min()}, "
+          f"{stack.get_sum()} (Expected: 5, 2, 10)")
+    stack.pop()
+    stack.pop()
+    print(f"Maximum after popping twice: {stack.get_max()} (Expected: 3)")
+
+    import random
+    rng = random.Random(3)
+    for typecode in ("q", "d"):
+        stack, mirror, ok = TypedStack(typecode), [], True
+        for _ in range(3_000):
+            action = rng.random()
+            if action < 0.4:
+                value = rng.randint(-1_000, 1_000) if typecode == "q" else rng.uniform(-1, 1)
+                stack.push(value)
+                mirror.append(stack.peek())
+            elif action < 0.6:
+                chunk = [rng.randint(-1_000, 1_000) for _ in range(rng.randrange(20))]
+                stack.push_many(chunk)
+                mirror.extend(float(v) if typecode == "d" else v for v in chunk)
+            elif action < 0.9:
+                ok &= stack.pop() == (mirror.pop() if mirror else None)
+            else:
+                count = rng.randrange(30)
+                ok &= list(stack.pop_many(count)) == mirror[::-1][:count]
+                del mirror[max(len(mirror) - count, 0):]
+            if mirror:
+                ok &= stack.get_max() == max(mirror) and stack.get_min() == min(mirror)
+                ok &= abs(stack.get_sum() - sum(mirror)) < 1e-6
+            else:
+                ok &= stack.is_empty() and stack.get_max() is None
+        print(f"Random operations match a list ({typecode!r}): "
+              f"{'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+
+def benchmark_stacks(operations: int = 10_000_000, chunk: int = 1_000):
+    """
+    Push operations // 2 values and pop them all again.
+
+    Memory is what tracemalloc sees allocated after a separate fill with
+    operations // 2 values, so the timed runs are not slowed down by
+    allocation tracing.
+    """
+    import random
+    import time
+    import tracemalloc
+
+    half = operations // 2
+    print(f"\n=== Stack Benchmark ({operations:,} push/pop operations) ===")
+    rng = random.Random(5)
+    data = array("q", (rng.randrange(1_000_000) for _ in range(half)))
+
+    def list_one_by_one():
+        stack = ListMaxStack()
+        push, pop = stack.push, stack.pop
+        for value in data:
+            push(value)
+        for _ in range(half):
+            pop()
+        return stack
+
+    def typed_one_by_one():
+        stack = TypedStack()
+        push, pop = stack.push, stack.pop
+        for value in data:
+            push(value)
+        for _ in range(half):
+            pop()
+        return stack
+
+    def typed_bulk():
+        stack = TypedStack()
+        for start in range(0, half, chunk):
+            stack.push_many(data[start:start + chunk])
+        for _ in range(0, half, chunk):
+            stack.pop_many(chunk)
+        return stack
+
+    def fill_list():
+        stack = ListMaxStack()
+        for value in data:
+            stack.push(value)
+        return stack
+
+    def fill_typed():
+        return TypedStack(values=data)
+
+    print(f"{'variant':<22} {'seconds':>8} {'ops/s':>12} {'MiB when full':>14}")
+    for name, run, fill in (("list, push/pop", list_one_by_one, fill_list),
+                            ("typed, push/pop", typed_one_by_one, fill_typed),
+                            (f"typed, bulk x{chunk}", typed_bulk, fill_typed)):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        stack = fill()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del stack
+        print(f"{name:<22} {elapsed:>8.2f} {operations / elapsed:>12,.0f} {size / 2 ** 20:>14.1f}")
+
+
+def main():
+    """Check and benchmark the typed stack."""
+    check_typed_stack()
+    # Pass operations=10_000_000 for the full-size run
+    benchmark_stacks(operations=2_000_000)
+
+
+if __name__ == "__main__":
+    main()
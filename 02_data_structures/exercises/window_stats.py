@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Sliding-window statistics on a ring buffer.
+Exercise2Queue's running statistics (04_custom_data_structures.py) over
+the last N values, for latency monitoring.
+"""
+
+import math
+from array import array
+from typing import Dict, Optional
+
+
+class WindowedStats:
+    """
+    Fixed-size window over the most recent values with O(1) statistics.
+
+    - mean and variance use Welford's update for adding a value and its
+      inverse for removing one, and are recomputed exactly once every
+      ``capacity`` updates so rounding error cannot build up
+    - min and max come from monotonic deques (O(1) amortized per value)
+    - percentiles come from a log-bucketed sketch with counts that are
+      decremented when values leave the window; estimates are within
+      ``relative_error`` of a true window value for positive inputs, and
+      values at or below ``min_value`` share the lowest bucket
+
+    All storage is allocated up front (ring buffer, deque rings, bucket
+    counts and each slot's bucket index); adding a value never grows a
+    container.
+
+    Example usage:
+    window = WindowedStats(capacity=1000)
+    for latency_ms in samples:
+        window.enqueue(latency_ms)
+    print(window.mean(), window.stdev(), window.percentile(99))
+    """
+
+    __slots__ = ("capacity", "_values", "_buckets", "_counts", "_start", "_next",
+                 "_mean", "_m2", "_updates", "_max_seqs", "_max_head", "_max_tail",
+                 "_min_seqs", "_min_head", "_min_tail", "_min_value", "_log_gamma", "_gamma")
+
+    def __init__(self, capacity: int, relative_error: float = 0.01,
+                 min_value: float = 1e-6, max_value: float = 1e9):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0 < relative_error < 1 or not 0 < min_value < max_value:
+            raise ValueError("need 0 < relative_error < 1 and 0 < min_value < max_value")
+        self.capacity = capacity
+        self._values = array("d", bytes(8 * capacity))
+        self._start = 0   # Sequence number of the oldest value
+        self._next = 0    # Sequence number the next value will get
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._updates = 0
+
+        # Monotonic deques of sequence numbers, each in its own ring:
+        # values along _max_seqs decrease from head to tail, so the head is
+        # the window's max; every sequence number enters and leaves once.
+        # head and tail are unbounded counters, indexed modulo capacity.
+        self._max_seqs = array("q", bytes(8 * capacity))
+        self._min_seqs = array("q", bytes(8 * capacity))
+        self._max_head = self._max_tail = 0
+        self._min_head = self._min_tail = 0
+
+        # Bucket i covers (min_value * gamma**(i-1), min_value * gamma**i]
+        self._gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self._gamma)
+        self._min_value = min_value
+        bucket_count = math.ceil(math.log(max_value / min_value) / self._log_gamma) + 2
+        self._counts = array("q", bytes(8 * bucket_count))
+        self._buckets = array("l", bytes(array("l").itemsize * capacity))
+
+    def __len__(self) -> int:
+        return self._next - self._start
+
+    def enqueue(self, value: float) -> None:
+        """Add a value, evicting the oldest one if the window is full."""
+        # Everything is inlined: this runs once per sample on hot paths
+        value = float(value)
+        capacity = self.capacity
+        if self._next - self._start == capacity:
+            self.dequeue()
+        values = self._values
+        seq = self._next
+        slot = seq % capacity
+        values[slot] = value
+
+        if value <= self._min_value:
+            bucket = 0
+        else:
+            bucket = min(math.ceil(math.log(value / self._min_value) / self._log_gamma),
+                         len(self._counts) - 1)
+        self._buckets[slot] = bucket
+        self._counts[bucket] += 1
+
+        seqs, head, tail = self._max_seqs, self._max_head, self._max_tail
+        while tail != head and values[seqs[(tail - 1) % capacity] % capacity] <= value:
+            tail -= 1
+        seqs[tail % capacity] = seq
+        self._max_tail = tail + 1
+        seqs, head, tail = self._min_seqs, self._min_head, self._min_tail
+        while tail != head and values[seqs[(tail - 1) % capacity] % capacity] >= value:
+            tail -= 1
+        seqs[tail % capacity] = seq
+        self._min_tail = tail + 1
+
+        self._next = seq + 1
+        n = seq + 1 - self._start
+        delta = value - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (value - self._mean)
+        self._updates += 1
+        if self._updates >= capacity:
+            self._recompute()
+
+    def dequeue(self) -> Optional[float]:
+        """Remove and return the oldest value, or None if the window is empty."""
+        seq = self._start
+        if self._next == seq:
+            return None
+        capacity = self.capacity
+        slot = seq % capacity
+        value = self._values[slot]
+        self._counts[self._buckets[slot]] -= 1
+        if self._max_seqs[self._max_head % capacity] == seq:
+            self._max_head += 1
+        if self._min_seqs[self._min_head % capacity] == seq:
+            self._min_head += 1
+        self._start = seq + 1
+
+        n = self._next - seq - 1
+        if n == 0:
+            self._mean = self._m2 = 0.0
+        else:
+            delta = value - self._mean
+            self._mean -= delta / n
+            self._m2 -= delta * (value - self._mean)
+        self._updates += 1
+        if self._updates >= capacity:
+            self._recompute()
+        return value
+
+    def _recompute(self) -> None:
+        """Exact two-pass mean and M2 over the window (O(n) every n updates)."""
+        self._updates = 0
+        n = self._next - self._start
+        if not n:
+            return
+        values, capacity = self._values, self.capacity
+        first, last = self._start % capacity, self._next % capacity
+        # A full window has first == last and wraps like any other
+        window = values[first:last] if first < last else values[first:] + values[:last]
+        mean = math.fsum(window) / n
+        self._mean = mean
+        self._m2 = math.fsum((x - mean) * (x - mean) for x in window)
+
+    def mean(self) -> Optional[float]:
+        return self._mean if len(self) else None
+
+    get_average = mean
+
+    def get_size(self) -> int:
+        return len(self)
+
+    def variance(self, sample: bool = False) -> Optional[float]:
+        """Population variance of the window (or sample variance if sample=True)."""
+        n = len(self) - (1 if sample else 0)
+        if n <= 0:
+            return None
+        return max(self._m2, 0.0) / n
+
+    def stdev(self, sample: bool = False) -> Optional[float]:
+        variance = self.variance(sample)
+        return math.sqrt(variance) if variance is not None else None
+
+    def max(self) -> Optional[float]:
+        if not len(self):
+            return None
+        return self._values[self._max_seqs[self._max_head % self.capacity] % self.capacity]
+
+    def min(self) -> Optional[float]:
+        if not len(self):
+            return None
+        return self._values[self._min_seqs[self._min_head % self.capacity] % self.capacity]
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Approximate p-th percentile (0-100) of the values in the window."""
+        n = len(self)
+        if not n:
+            return None
+        rank = max(1, math.ceil(n * p / 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                break
+        if index == 0:
+            estimate = self._min_value
+        else:
+            # Midpoint (in relative terms) of the bucket's range
+            estimate = self._min_value * 2 * self._gamma ** index / (self._gamma + 1)
+        return min(max(estimate, self.min()), self.max())
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Return the current window statistics as a dictionary."""
+        return {
+            "count": len(self),
+            "mean": self.mean(),
+            "stdev": self.stdev(),
+            "min": self.min(),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max(),
+        }
+
+
+def check_window_stats():
+    """Check the window statistics against brute force over a list."""
+    print("\nTesting WindowedStats:")
+    window = WindowedStats(capacity=3)
+    for value in (10, 20, 30, 40):
+        window.enqueue(value)
+    print(f"Window of 3 after 10, 20, 30, 40: mean {window.mean()} (Expected: 30.0), "
+          f"min {window.min()}, max {window.max()} (Expected: 20.0, 40.0)")
+    window.dequeue()
+    print(f"After dequeue: average {window.get_average()} (Expected: 35.0), "
+          f"size {window.get_size()} (Expected: 2)")
+
+    import random
+    import statistics
+    rng = random.Random(11)
+    capacity = 200
+    window, mirror, ok = WindowedStats(capacity), [], True
+    worst_percentile_error = 0.0
+    for step in range(20_000):
+        if rng.random() < 0.1:
+            ok &= window.dequeue() == (mirror.pop(0) if mirror else None)
+        else:
+            value = rng.lognormvariate(3, 1)
+            window.enqueue(value)
+            mirror.append(value)
+            del mirror[:-capacity]
+        if len(mirror) > 1 and step % 50 == 0:
+            ok &= math.isclose(window.mean(), statistics.fmean(mirror), rel_tol=1e-9)
+            ok &= math.isclose(window.variance(), statistics.pvariance(mirror), rel_tol=1e-6)
+            ok &= window.min() == min(mirror) and window.max() == max(mirror)
+            ordered = sorted(mirror)
+            true_p95 = ordered[max(1, math.ceil(len(ordered) * 0.95)) - 1]
+            error = abs(window.percentile(95) - true_p95) / true_p95
+            worst_percentile_error = max(worst_percentile_error, error)
+    ok &= worst_percentile_error <= 0.01
+    print(f"Random stream matches brute force: {'✓ Correct!' if ok else '✗ Not quite right.'} "
+          f"(worst p95 error {worst_percentile_error:.2%})")
+
+
+def benchmark_window_stats(values: int = 1_000_000, capacity: int = 10_000):
+    """Compare per-enqueue cost with recomputing statistics from a deque."""
+    import random
+    import statistics
+    import time
+    from collections import deque
+
+    print(f"\n=== Window Stats Benchmark ({values:,} values, window {capacity:,}) ===")
+    rng = random.Random(2)
+    stream = array("d", (rng.lognormvariate(3, 1) for _ in range(values)))
+
+    window = WindowedStats(capacity)
+    enqueue = window.enqueue
+    start = time.perf_counter()
+    for value in stream:
+        enqueue(value)
+    elapsed = time.perf_counter() - start
+    print(f"WindowedStats.enqueue: {elapsed / values * 1e9:,.0f} ns/value")
+
+    start = time.perf_counter()
+    for _ in range(1_000):
+        window.snapshot()
+    print(f"WindowedStats.snapshot: {(time.perf_counter() - start) * 1e3:,.0f} us/call")
+
+    # A deque window needs a full pass for every fresh statistic
+    recent = deque(stream[-capacity:], maxlen=capacity)
+    start = time.perf_counter()
+    for _ in range(100):
+        statistics.fmean(recent), statistics.pstdev(recent), min(recent), max(recent)
+        statistics.quantiles(recent, n=100)
+    print(f"deque + statistics module: {(time.perf_counter() - start) * 1e4:,.0f} us/refresh")
+
+
+def main():
+    """Check and benchmark the sliding-window statistics."""
+    check_window_stats()
+    benchmark_window_stats(values=200_000)
+
+
+if __name__ == "__main__":
+    main()
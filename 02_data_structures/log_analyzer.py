@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Streaming Log Analyzer
+This module runs the log analysis from demonstrate_practical_application()
+in 05_advanced.py over files of any size. Lines are read lazily from large
+buffered (or memory-mapped) chunks, the Counter/defaultdict aggregates are
+updated incrementally, and progress can be checkpointed so a crashed run
+resumes from a byte offset. Large files can also be split into shards on
+line boundaries and analyzed on several cores.
+"""
+
+import json
+import mmap
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import reduce
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from timestamp_parser import TimestampParser
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def iter_lines(path: str, start: int = 0, end: Optional[int] = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE,
+               use_mmap: bool = False) -> Iterator[Tuple[str, int]]:
+    """
+    Lazily yield the lines of a file together with the offset just past each.
+
+    Args:
+        path: File to read
+        start: Byte offset to start from (must be at a line boundary)
+        end: Byte offset to stop at (None means end of file)
+        chunk_size: Bytes read per buffered read
+        use_mmap: Memory-map the file instead of reading chunks
+
+    Yields:
+        (line, next_offset) where line has its newline stripped and
+        next_offset is where the following line starts
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if start >= end:
+            return
+
+        if use_mmap:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = start
+                while pos < end:
+                    newline = mm.find(b"\n", pos, end)
+                    stop = end if newline == -1 else newline + 1
+                    yield mm[pos:stop].rstrip(b"\r\n").decode("utf-8", "replace"), stop
+                    pos = stop
+            return
+
+        f.seek(start)
+        offset = start
+        carry = b""
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            lines = (carry + chunk).split(b"\n")
+            carry = lines.pop()  # Partial last line, completed by the next chunk
+            for line in lines:
+                offset += len(line) + 1
+                yield line.rstrip(b"\r").decode("utf-8", "replace"), offset
+        if carry:
+            yield carry.rstrip(b"\r").decode("utf-8", "replace"), offset + len(carry)
+
+
+class LogStats:
+    """
+    Incrementally updated aggregates for log lines of the form
+    ``YYYY-MM-DD HH:MM:SS SEVERITY message``.
+
+    Memory depends on the number of distinct error messages, not on the
+    number of lines, unless keep_error_times is set (every error timestamp
+    is then kept, as analyze_logs() does). With epoch_times, error times
+    are stored as epoch-second integers instead of datetime objects.
+    """
+
+    def __init__(self, keep_error_times: bool = False, epoch_times: bool = False):
+        self.keep_error_times = keep_error_times
+        self.epoch_times = epoch_times
+        self._parser = TimestampParser()
+        self.error_counts = Counter()
+        self.error_times = defaultdict(list)
+        self.severity_stats = defaultdict(int)
+        self.lines = 0
+        self.malformed = 0
+
+    def add(self, entry: str) -> None:
+        """Update the aggregates with a single log line."""
+        parts = entry.split(None, 3)
+        if len(parts) < 3:
+            if entry.strip():
+                self.malformed += 1
+            return
+        date_str, time_str, severity = parts[0], parts[1], parts[2]
+        message = parts[3].rstrip() if len(parts) == 4 else ""
+
+        if severity == "ERROR" and self.keep_error_times:
+            text = f"{date_str} {time_str}"
+            try:
+                if self.epoch_times:
+                    timestamp = self._parser.parse_epoch(text)
+                else:
+                    timestamp = self._parser.parse(text)
+            except ValueError:
+                # A bad timestamp is malformed too, rather than fatal to the run
+                self.malformed += 1
+                return
+            self.error_times[message].append(timestamp)
+        self.lines += 1
+        if severity == "ERROR":
+            self.error_counts[message] += 1
+        self.severity_stats[severity] += 1
+
+    def add_lines(self, lines: Iterable[str]) -> "LogStats":
+        """Update the aggregates with every line in lines."""
+        add = self.add
+        for line in lines:
+            add(line)
+        return self
+
+    def merge(self, other: "LogStats") -> "LogStats":
+        """
+        Fold another shard's aggregates into this one and return self.
+
+        Counts are summed and error times concatenated, so merging shards in
+        file order is associative and reproduces the serial result exactly.
+        """
+        self.error_counts.update(other.error_counts)
+        for message, times in other.error_times.items():
+            self.error_times[message].extend(times)
+        for severity, count in other.severity_stats.items():
+            self.severity_stats[severity] += count
+        self.lines += other.lines
+        self.malformed += other.malformed
+        return self
+
+    def to_dict(self) -> Dict[str, dict]:
+        """Return results in the same shape as analyze_logs()."""
+        result = {
+            "error_counts": dict(self.error_counts),
+            "severity_stats": dict(self.severity_stats),
+            "unique_errors": len(self.error_counts),
+        }
+        if self.keep_error_times:
+            result["error_times"] = {k: list(v) for k, v in self.error_times.items()}
+        return result
+
+    def to_state(self) -> dict:
+        """Return a JSON-serializable snapshot of the aggregates."""
+        return {
+            "keep_error_times": self.keep_error_times,
+            "epoch_times": self.epoch_times,
+            "error_counts": dict(self.error_counts),
+            "error_times": {
+                k: v if self.epoch_times else [t.isoformat(sep=" ") for t in v]
+                for k, v in self.error_times.items()
+            },
+            "severity_stats": dict(self.severity_stats),
+            "lines": self.lines,
+            "malformed": self.malformed,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "LogStats":
+        """Rebuild aggregates from a to_state() snapshot."""
+        stats = cls(state["keep_error_times"], state["epoch_times"])
+        stats.error_counts.update(state["error_counts"])
+        for message, times in state["error_times"].items():
+            stats.error_times[message] = (
+                times if stats.epoch_times else [datetime.fromisoformat(t) for t in times]
+            )
+        stats.severity_stats.update(state["severity_stats"])
+        stats.lines = state["lines"]
+        stats.malformed = state["malformed"]
+        return stats
+
+
+def save_checkpoint(checkpoint_path: str, log_path: str, offset: int, stats: LogStats) -> None:
+    """Atomically write the aggregates and the byte offset they cover."""
+    state = {"log_path": os.path.abspath(log_path), "offset": offset, "stats": stats.to_state()}
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def load_checkpoint(checkpoint_path: str, log_path: str) -> Tuple[int, LogStats]:
+    """Return (offset, stats) from a checkpoint, or (0, None) if there is none."""
+    if not os.path.exists(checkpoint_path):
+        return 0, None
+    with open(checkpoint_path, encoding="utf-8") as f:
+        state = json.load(f)
+    if state["log_path"] != os.path.abspath(log_path):
+        raise ValueError(f"Checkpoint {checkpoint_path} belongs to {state['log_path']}")
+    return state["offset"], LogStats.from_state(state["stats"])
+
+
+def analyze_log_file(path: str, checkpoint_path: Optional[str] = None,
+                     checkpoint_every: int = 1_000_000,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     use_mmap: bool = False,
+                     keep_error_times: bool = False,
+                     epoch_times: bool = False) -> Dict[str, dict]:
+    """
+    Analyze a log file of any size with constant memory.
+
+    Args:
+        path: Log file to analyze
+        checkpoint_path: If given, progress is saved here every
+            checkpoint_every lines and a previous run is resumed from it.
+            The checkpoint is removed once the whole file has been analyzed.
+        checkpoint_every: Lines between checkpoints
+        chunk_size: Bytes per buffered read
+        use_mmap: Memory-map the file instead of reading chunks
+        keep_error_times: Also collect the timestamp of every error
+        epoch_times: Store error times as epoch seconds instead of datetimes
+
+    Returns:
+        Results in the same shape as analyze_logs()
+    """
+    offset, stats = 0, None
+    if checkpoint_path:
+        offset, stats = load_checkpoint(checkpoint_path, path)
+    if stats is None:
+        stats = LogStats(keep_error_times, epoch_times)
+
+    add = stats.add
+    since_checkpoint = 0
+    for line, offset in iter_lines(path, offset, chunk_size=chunk_size, use_mmap=use_mmap):
+        add(line)
+        if checkpoint_path:
+            since_checkpoint += 1
+            if since_checkpoint >= checkpoint_every:
+                save_checkpoint(checkpoint_path, path, offset, stats)
+                since_checkpoint = 0
+
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return stats.to_dict()
+
+
+def shard_file(path: str, shards: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into roughly equal byte ranges that start and end on line
+    boundaries.
+
+    Returns:
+        List of (start, end) offsets covering the whole file in order
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    boundaries = [0]
+    with open(path, "rb") as f:
+        for i in range(1, shards):
+            target = max(size * i // shards, boundaries[-1])
+            f.seek(target)
+            f.readline()  # Advance to the start of the next line
+            boundary = min(f.tell(), size)
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+    if boundaries[-1] < size:
+        boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def analyze_shard(path: str, start: int, end: int,
+                  keep_error_times: bool = False,
+                  epoch_times: bool = False,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> LogStats:
+    """Analyze the lines in the byte range [start, end) of a file."""
+    stats = LogStats(keep_error_times, epoch_times)
+    add = stats.add
+    for line, _ in iter_lines(path, start, end, chunk_size=chunk_size):
+        add(line)
+    return stats
+
+
+def analyze_log_file_parallel(path: str, workers: Optional[int] = None,
+                              shards_per_worker: int = 4,
+                              keep_error_times: bool = False,
+                              epoch_times: bool = False,
+                              chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, dict]:
+    """
+    Analyze a log file across several processes.
+
+    The file is split into line-aligned shards, each shard is analyzed in a
+    ProcessPoolExecutor worker, and the per-shard aggregates are merged in
+    file order. The result is identical to analyze_log_file().
+
+    Args:
+        path: Log file to analyze
+        workers: Number of worker processes (None means os.cpu_count())
+        shards_per_worker: Shards per worker, to even out uneven shards
+        keep_error_times: Also collect the timestamp of every error
+        epoch_times: Store error times as epoch seconds instead of datetimes
+        chunk_size: Bytes per buffered read inside each worker
+
+    Returns:
+        Results in the same shape as analyze_logs()
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = shard_file(path, workers * shards_per_worker)
+    if workers == 1 or len(ranges) <= 1:
+        partials = [analyze_shard(path, start, end, keep_error_times, epoch_times, chunk_size)
+                    for start, end in ranges]
+    else:
+        n = len(ranges)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(
+                analyze_shard, [path] * n, [start for start, _ in ranges],
+                [end for _, end in ranges], [keep_error_times] * n, [epoch_times] * n,
+                [chunk_size] * n,
+            ))
+    return reduce(LogStats.merge, partials, LogStats(keep_error_times, epoch_times)).to_dict()
+
+
+def write_sample_log(path: str, lines: int, seed: int = 0) -> None:
+    """Write a synthetic log file with a realistic mix of severities."""
+    import random
+
+    rng = random.Random(seed)
+    messages = {
+        "ERROR": ["Database connection failed", "Network timeout", "Disk full",
+                  "Permission denied", "Out of memory"],
+        "WARNING": ["High memory usage", "Slow response", "Retrying request"],
+        "INFO": ["Server started", "Request processed", "User logged in"],
+    }
+    severities = ["INFO"] * 7 + ["WARNING"] * 2 + ["ERROR"]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(lines):
+            seconds = i % 86400
+            severity = rng.choice(severities)
+            f.write(f"2024-03-{14 + i // 86400 % 14:02d} {seconds // 3600:02d}:"
+                    f"{seconds // 60 % 60:02d}:{seconds % 60:02d} {severity} "
+                    f"{rng.choice(messages[severity])}\n")
+
+
+def demonstrate_streaming_analysis():
+    """Demonstrate streaming analysis and resuming from a checkpoint."""
+    import tempfile
+
+    print("=== Streaming Log Analysis ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "app.log")
+        checkpoint_path = os.path.join(tmp, "app.log.checkpoint")
+        write_sample_log(log_path, 100_000)
+
+        full = analyze_log_file(log_path)
+        print(f"Unique errors: {full['unique_errors']}")
+        print(f"Severity distribution: {full['severity_stats']}")
+
+        # Simulate a run that crashed after checkpointing 40,000 lines
+        stats = LogStats()
+        for count, (line, offset) in enumerate(iter_lines(log_path), 1):
+            stats.add(line)
+            if count == 40_000:
+                save_checkpoint(checkpoint_path, log_path, offset, stats)
+                break
+        print(f"Crashed run checkpointed at byte {offset:,}")
+
+        resumed = analyze_log_file(log_path, checkpoint_path=checkpoint_path)
+        same = resumed == full
+        print(f"Resumed run matches a full run: {'✓ Correct!' if same else '✗ Not quite right.'}")
+        mapped = analyze_log_file(log_path, use_mmap=True)
+        print(f"Memory-mapped run matches: {'✓ Correct!' if mapped == full else '✗ Not quite right.'}")
+
+    # Bad timestamps are counted as malformed instead of aborting the run
+    stats = LogStats(keep_error_times=True).add_lines([
+        "2024-03-14 10:00:00 ERROR Disk full",
+        "2024-13-45 10:00:00 ERROR Disk full",
+        "garbage",
+    ])
+    print(f"Lines kept: {stats.lines}, malformed: {stats.malformed} (Expected: 1, 2)")
+    print(f"{'✓ Correct!' if (stats.lines, stats.malformed) == (1, 2) else '✗ Not quite right.'}")
+
+
+def benchmark_streaming(line_counts=(100_000, 500_000)):
+    """Show that peak memory stays flat as the file grows."""
+    import tempfile
+    import time
+    import tracemalloc
+
+    print("\n=== Streaming Memory Benchmark ===")
+    print(f"{'lines':>10} {'file MB':>8} {'peak KB':>8} {'lines/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for lines in line_counts:
+            log_path = os.path.join(tmp, f"{lines}.log")
+            write_sample_log(log_path, lines)
+
+            start = time.perf_counter()
+            analyze_log_file(log_path)
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            analyze_log_file(log_path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            size_mb = os.path.getsize(log_path) / 1e6
+            print(f"{lines:>10,} {size_mb:>8.1f} {peak / 1024:>8.0f} {lines / elapsed:>10,.0f}")
+
+
+def demonstrate_parallel_analysis():
+    """Demonstrate that sharded analysis reproduces the serial result."""
+    import tempfile
+
+    print("\n=== Sharded Log Analysis ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "app.log")
+        write_sample_log(log_path, 50_000)
+        print(f"Shards for 4 workers: {shard_file(log_path, 4)}")
+        serial = analyze_log_file(log_path, keep_error_times=True)
+        parallel = analyze_log_file_parallel(log_path, workers=4, keep_error_times=True)
+        same = serial == parallel
+        print(f"Parallel result matches serial: {'✓ Correct!' if same else '✗ Not quite right.'}")
+
+
+def benchmark_parallel(lines: int = 1_000_000, worker_counts=(1, 2, 4, 8)):
+    """Measure throughput of the sharded analyzer for several worker counts."""
+    import tempfile
+    import time
+
+    print(f"\n=== Parallel Scaling Benchmark ({lines:,} lines, "
+          f"{os.cpu_count()} CPUs available) ===")
+    print(f"{'workers':>8} {'seconds':>8} {'lines/s':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "bench.log")
+        write_sample_log(log_path, lines)
+
+        start = time.perf_counter()
+        analyze_log_file(log_path)
+        serial_time = time.perf_counter() - start
+        print(f"{'serial':>8} {serial_time:>8.2f} {lines / serial_time:>11,.0f} {1:>7.2f}x")
+
+        for workers in worker_counts:
+            start = time.perf_counter()
+            analyze_log_file_parallel(log_path, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>8} {elapsed:>8.2f} {lines / elapsed:>11,.0f} "
+                  f"{serial_time / elapsed:>7.2f}x")
+
+
+def main():
+    """Demonstrate and benchmark streaming log analysis."""
+    demonstrate_streaming_analysis()
+    benchmark_streaming()
+    demonstrate_parallel_analysis()
+    benchmark_parallel()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+O(1) LRU Cache
+This module implements a Least Recently Used cache built from a hash map and
+an intrusive doubly linked list, so get, put and eviction are constant time
+regardless of capacity.
+"""
+
+from typing import Any, Dict, Hashable, Optional
+from timeit import default_timer
+
+
+class _Node:
+    """A single cache entry linked into the recency list."""
+
+    __slots__ = ("key", "value", "prev", "next")
+
+    def __init__(self, key: Hashable = None, value: Any = None):
+        self.key = key
+        self.value = value
+        self.prev: Optional["_Node"] = None
+        self.next: Optional["_Node"] = None
+
+
+class LRUCache:
+    """
+    Least Recently Used (LRU) cache with O(1) get, put and eviction.
+
+    The dictionary maps keys straight to their list nodes, so moving an entry
+    to the most recently used position never scans the recency list. A single
+    sentinel node closes the list into a ring: ``root.next`` is the least
+    recently used entry and ``root.prev`` the most recently used one.
+
+    Example:
+        cache = LRUCache(2)
+        cache.put("A", 1)
+        cache.put("B", 2)
+        cache.get("A")         # 1, "A" is now most recently used
+        cache.put("C", 3)      # evicts "B"
+        cache.get("B")         # None
+    """
+
+    __slots__ = ("capacity", "hits", "misses", "evictions", "_map", "_root")
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._map: Dict[Hashable, _Node] = {}
+        root = _Node()
+        root.prev = root.next = root
+        self._root = root
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._map
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for key and mark it most recently used."""
+        node = self._map.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+
+        # Unlink and re-insert just before the sentinel (most recent end)
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        root = self._root
+        last = root.prev
+        last.next = root.prev = node
+        node.prev = last
+        node.next = root
+        return node.value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or update key, evicting the least recently used entry if full."""
+        root = self._root
+        node = self._map.get(key)
+        if node is not None:
+            node.value = value
+            node.prev.next = node.next
+            node.next.prev = node.prev
+        elif len(self._map) >= self.capacity:
+            # Recycle the oldest node instead of allocating a new one
+            node = root.next
+            del self._map[node.key]
+            node.prev.next = node.next
+            node.next.prev = node.prev
+            node.key = key
+            node.value = value
+            self._map[key] = node
+            self.evictions += 1
+        else:
+            node = _Node(key, value)
+            self._map[key] = node
+
+        last = root.prev
+        last.next = root.prev = node
+        node.prev = last
+        node.next = root
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove key from the cache. Return True if it was present."""
+        node = self._map.pop(key, None)
+        if node is None:
+            return False
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = node.next = None
+        return True
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        self._map.clear()
+        self._root.prev = self._root.next = self._root
+        self.hits = self.misses = self.evictions = 0
+
+    def keys(self) -> list:
+        """Return keys ordered from least to most recently used."""
+        result = []
+        node = self._root.next
+        while node is not self._root:
+            result.append(node.key)
+            node = node.next
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and eviction counters along with the current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._map),
+            "capacity": self.capacity,
+        }
+
+
+def demonstrate_lru_cache():
+    """Demonstrate basic LRU cache behaviour and statistics."""
+    print("=== O(1) LRU Cache ===")
+
+    cache = LRUCache(2)
+    cache.put("A", "Value A")
+    cache.put("B", "Value B")
+    print(f"Get A: {cache.get('A')}")
+    cache.put("C", "Value C")  # This will remove B
+    print(f"Get B: {cache.get('B', 'Not found')}")
+    print(f"Get C: {cache.get('C')}")
+    print(f"Recency order (oldest first): {cache.keys()}")
+    print(f"Statistics: {cache.stats()}")
+
+
+def benchmark_lru_cache(sizes=(1_000, 10_000, 100_000, 1_000_000),
+                        operations: int = 200_000):
+    """
+    Show that per-operation latency stays flat as capacity grows.
+
+    Each run fills a cache to capacity and then performs a mix of hits,
+    misses and evicting inserts over keys drawn from twice the capacity.
+    """
+    import random
+
+    print("\n=== LRU Cache Benchmark ===")
+    print(f"{'capacity':>10} {'fill ns/op':>12} {'mixed ns/op':>12} {'hit rate':>9}")
+    for capacity in sizes:
+        cache = LRUCache(capacity)
+        rng = random.Random(capacity)
+        keys = [rng.randrange(capacity * 2) for _ in range(operations)]
+
+        start = default_timer()
+        for i in range(capacity):
+            cache.put(i, i)
+        fill_time = default_timer() - start
+
+        get, put = cache.get, cache.put
+        start = default_timer()
+        for key in keys:
+            if get(key) is None:
+                put(key, key)
+        mixed_time = default_timer() - start
+
+        stats = cache.stats()
+        hit_rate = stats["hits"] / (stats["hits"] + stats["misses"])
+        print(f"{capacity:>10} {fill_time / capacity * 1e9:>12.0f} "
+              f"{mixed_time / operations * 1e9:>12.0f} {hit_rate:>9.2%}")
+
+
+def main():
+    """Demonstrate and benchmark the LRU cache."""
+    demonstrate_lru_cache()
+    benchmark_lru_cache()
+
+
+if __name__ == "__main__":
+    main()
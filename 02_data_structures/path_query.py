@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Compiled Path Queries
+This module backs get_nested_value() in 03_dictionaries.py. A path such as
+"companies[*].departments[*].technologies[*]" is parsed once and compiled
+into a Python function with one nested loop per wildcard, so extracting
+values from millions of records costs no per-lookup parsing, no per-level
+function calls and no exception handling on the happy path.
+
+Path syntax:
+    name        mapping key (any text without '.', '[' or ']')
+    [0], [-1]   list index
+    ['a.b']     quoted mapping key
+    * or [*]    every value of a list, tuple or dict
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Hashable, Iterable, List, Sequence, Tuple, Union
+
+
+class _Wildcard:
+    """The '*' step: every value of a list, tuple or dict."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "WILDCARD"
+
+
+WILDCARD = _Wildcard()
+
+Path = Union[str, Sequence[Hashable]]
+
+_TOKEN = re.compile(r"""
+    (?P<dot>\.)?
+    (?:
+        (?P<name>[^.\[\]]+)
+      | \[ (?: (?P<index>-?\d+) | (?P<star>\*) | (?P<quoted>'[^']*'|"[^"]*") ) \]
+    )
+""", re.VERBOSE)
+
+_NAME = re.compile(r"[^.\[\]]+")
+
+# Lookup failures that mean "no value here"
+_MISSES = (KeyError, IndexError, TypeError)
+
+
+@lru_cache(maxsize=1024)
+def parse_path(path: str) -> Tuple[Hashable, ...]:
+    """
+    Split a path expression into steps.
+
+    Returns a tuple of str keys, int indices and WILDCARD.
+
+    Raises:
+        ValueError: If the expression is malformed
+    """
+    steps: List[Hashable] = []
+    position = 0
+    while position < len(path):
+        match = _TOKEN.match(path, position)
+        if match is None or (bool(match["dot"]) != (bool(steps) and match["name"] is not None)):
+            raise ValueError(f"invalid path {path!r} at position {position}")
+        if match["name"] is not None:
+            steps.append(WILDCARD if match["name"] == "*" else match["name"])
+        elif match["index"] is not None:
+            steps.append(int(match["index"]))
+        elif match["star"] is not None:
+            steps.append(WILDCARD)
+        else:
+            steps.append(match["quoted"][1:-1])
+        position = match.end()
+    if not steps:
+        raise ValueError("empty path")
+    return tuple(steps)
+
+
+def _values(container: Any) -> Iterable[Any]:
+    """What a wildcard iterates: dict values, or list/tuple items."""
+    if isinstance(container, dict):
+        return container.values()
+    if isinstance(container, (list, tuple)):
+        return container
+    return ()
+
+
+def format_path(steps: Sequence[Hashable]) -> str:
+    """Write steps back as an expression, e.g. "companies[*].name"."""
+    parts = []
+    for step in steps:
+        if step is WILDCARD:
+            parts.append("[*]")
+        elif isinstance(step, str) and step != "*" and _NAME.fullmatch(step):
+            parts.append(f".{step}" if parts else step)
+        else:
+            parts.append(f"[{step!r}]")
+    return "".join(parts)
+
+
+class PathQuery:
+    """
+    A compiled path expression.
+
+    Without wildcards the generated lookup is a single chained subscript,
+    obj[k0][k1]..., inside one try block. With wildcards it is a nest of
+    for loops that appends matches to a list; a record that lacks a step is
+    skipped at that level rather than aborting the whole query.
+
+    Example usage:
+    query = compile_path("companies[*].departments[*].technologies[*]")
+    query.all(data)             # every technology in data
+    query.extract(records)      # every technology in every record
+    """
+
+    __slots__ = ("path", "steps", "source", "_first", "_apply", "_extract")
+
+    def __init__(self, steps: Tuple[Hashable, ...]):
+        self.steps = steps
+        self.path = format_path(steps)
+        namespace = {"_MISSES": _MISSES, "_SEQUENCES": (list, tuple)}
+        self.source = self._generate(namespace)
+        exec(compile(self.source, f"<path {self.path}>", "exec"), namespace)
+        self._first = namespace["_first"]
+        self._apply = namespace["_apply"]
+        self._extract = namespace["_extract"]
+
+    @property
+    def has_wildcard(self) -> bool:
+        return WILDCARD in self.steps
+
+    def _key(self, step: Hashable, namespace: dict) -> str:
+        if type(step) in (str, int):
+            return repr(step)
+        name = f"_k{len(namespace)}"
+        namespace[name] = step
+        return name
+
+    def _generate(self, namespace: dict) -> str:
+        if not self.has_wildcard:
+            chain = "obj" + "".join(f"[{self._key(step, namespace)}]" for step in self.steps)
+            return (
+                "def _first(obj, default):\n"
+                "    try:\n"
+                f"        return {chain}\n"
+                "    except _MISSES:\n"
+                "        return default\n"
+                "def _apply(records, default):\n"
+                "    out = []\n"
+                "    append = out.append\n"
+                "    for obj in records:\n"
+                "        try:\n"
+                f"            append({chain})\n"
+                "        except _MISSES:\n"
+                "            append(default)\n"
+                "    return out\n"
+                "def _extract(records):\n"
+                "    out = []\n"
+                "    append = out.append\n"
+                "    for obj in records:\n"
+                "        try:\n"
+                f"            append({chain})\n"
+                "        except _MISSES:\n"
+                "            pass\n"
+                "    return out\n"
+            )
+
+        # Split into runs of plain keys, each followed by a wildcard:
+        # a.b[*].c[*].d -> (a.b, *), (c, *), then the tail (d)
+        lines = ["def _extract(records):", "    out = []", "    append = out.append",
+                 "    extend = out.extend", "    for v0 in records:"]
+        indent, current, depth = "        ", "v0", 0
+        keys: List[str] = []
+        for index, step in enumerate(self.steps):
+            if step is not WILDCARD:
+                keys.append(self._key(step, namespace))
+                continue
+            if keys:
+                chain = current + "".join(f"[{key}]" for key in keys)
+                depth += 1
+                lines += [f"{indent}try:",
+                          f"{indent}    v{depth} = {chain}",
+                          f"{indent}except _MISSES:",
+                          f"{indent}    continue"]
+                current, keys = f"v{depth}", []
+            # Inlined _values(), with a cheap class check for the usual list
+            lines += [f"{indent}if {current}.__class__ is not list:",
+                      f"{indent}    if isinstance({current}, dict):",
+                      f"{indent}        {current} = {current}.values()",
+                      f"{indent}    elif not isinstance({current}, _SEQUENCES):",
+                      f"{indent}        continue"]
+            if index == len(self.steps) - 1:
+                # A trailing wildcard needs no loop of its own
+                lines.append(f"{indent}extend({current})")
+                break
+            depth += 1
+            lines.append(f"{indent}for v{depth} in {current}:")
+            current, indent = f"v{depth}", indent + "    "
+        else:
+            chain = current + "".join(f"[{key}]" for key in keys)
+            lines += [f"{indent}try:",
+                      f"{indent}    append({chain})",
+                      f"{indent}except _MISSES:",
+                      f"{indent}    pass"]
+        lines.append("    return out")
+        return "\n".join(lines) + (
+            "\ndef _first(obj, default):\n"
+            "    matches = _extract((obj,))\n"
+            "    return matches[0] if matches else default\n"
+            "def _apply(records, default):\n"
+            "    return [_extract((obj,)) for obj in records]\n"
+        )
+
+    def first(self, obj: Any, default: Any = None) -> Any:
+        """The value at the path (first match for wildcards), or default."""
+        return self._first(obj, default)
+
+    def all(self, obj: Any) -> List[Any]:
+        """Every value the path matches in obj."""
+        return self._extract((obj,))
+
+    def apply(self, records: Iterable[Any], default: Any = None) -> List[Any]:
+        """
+        One result per record: the value (or default) for plain paths, the
+        list of matches for wildcard paths.
+        """
+        return self._apply(records, default)
+
+    def extract(self, records: Iterable[Any]) -> List[Any]:
+        """Every match in every record, as one flat list."""
+        return self._extract(records)
+
+    def __repr__(self) -> str:
+        return f"PathQuery({self.path!r})"
+
+
+@lru_cache(maxsize=1024)
+def _compile(steps: Tuple[Hashable, ...], kinds: Tuple[type, ...]) -> PathQuery:
+    # kinds, the type of each step, keeps 1, True and 1.0 apart: they are
+    # equal and hash alike, but compile to different lookups
+    return PathQuery(steps)
+
+
+@lru_cache(maxsize=1024)
+def _compile_expression(path: str) -> PathQuery:
+    # One cache hit per call for the common case of a string path
+    steps = parse_path(path)
+    return _compile(steps, tuple(map(type, steps)))
+
+
+def compile_path(path: Path) -> PathQuery:
+    """
+    Compile a path expression, or a sequence of literal keys, once.
+
+    Compiled queries are cached, so calling this on every lookup only costs
+    a dictionary hit after the first call. A key list holding an
+    unhashable key cannot be cached and is compiled on every call.
+
+    Args:
+        path: An expression like "a.b[0][*].c", or a list of keys such as
+            ["teachers", "physics"] (taken literally; use WILDCARD for '*')
+
+    Returns:
+        PathQuery: The compiled query
+    """
+    if isinstance(path, str):
+        return _compile_expression(path)
+    steps = tuple(path)
+    if not steps:
+        raise ValueError("empty path")
+    try:
+        hash(steps)
+    except TypeError:
+        return PathQuery(steps)
+    return _compile(steps, tuple(map(type, steps)))
+
+
+def get_path(obj: Any, path: Path, default: Any = None) -> Any:
+    """Value at path in obj (first match for wildcards), or default."""
+    return compile_path(path)._first(obj, default)
+
+
+def find_all(obj: Any, path: Path) -> List[Any]:
+    """Every value matching path in obj."""
+    return compile_path(path)._extract((obj,))
+
+
+def _walk(obj: Any, steps: Tuple[Hashable, ...]) -> List[Any]:
+    """Interpreted reference implementation: one recursive call per step."""
+    if not steps:
+        return [obj]
+    step, rest = steps[0], steps[1:]
+    if step is WILDCARD:
+        return [match for value in _values(obj) for match in _walk(value, rest)]
+    try:
+        return _walk(obj[step], rest)
+    except _MISSES:
+        return []
+
+
+def check_path_query():
+    """Check compiled queries on the nested-structure exercises' data."""
+    print("\nTesting path queries:")
+    companies = {'companies': [
+        {'name': 'TechCorp', 'departments': [
+            {'name': 'Engineering', 'technologies': ['Python', 'JavaScript']},
+            {'name': 'Design', 'technologies': ['Figma', 'JavaScript']}]},
+        {'name': 'DataCo', 'departments': [
+            {'name': 'Analytics', 'technologies': ['Python', 'R']}]},
+    ]}
+    technologies = sorted(set(find_all(companies, "companies[*].departments[*].technologies[*]")))
+    print(f"Unique technologies: {technologies} (Expected: ['Figma', 'JavaScript', 'Python', 'R'])")
+
+    sales = {'sales': {
+        'electronics': [{'product': 'laptop', 'price': 1000, 'quantity': 2},
+                        {'product': 'phone', 'price': 500, 'quantity': 3}],
+        'books': [{'product': 'python_book', 'price': 40, 'quantity': 5}],
+    }}
+    print(f"All products: {find_all(sales, 'sales.*[*].product')}")
+    print(f"First department: {get_path(companies, 'companies[0].departments[0].name')}, "
+          f"missing: {get_path(companies, 'companies[5].name', 'n/a')}, "
+          f"literal keys: {get_path(companies, ['companies', -1, 'name'])}")
+
+    ok = compile_path("a.b[*]") is compile_path("a.b[*]")
+    ok &= compile_path("a['x.y'][-1]").steps == ("a", "x.y", -1)
+    for bad in ("", ".a", "a..b", "a[", "a[b]"):
+        try:
+            parse_path(bad)
+            ok = False
+        except ValueError:
+            pass
+    records = [companies, {'companies': [{'departments': None}, {}]}, {}, [1, 2], "text"]
+    for path in ("companies[*].departments[*].technologies[*]", "companies[*].name",
+                 "companies[*].departments[*].technologies[0]", "*", "companies[*].*",
+                 "companies[0].departments[-1].technologies"):
+        query = compile_path(path)
+        expected = [match for record in records for match in _walk(record, query.steps)]
+        ok &= query.extract(records) == expected
+        ok &= query.apply(records) == [
+            _walk(record, query.steps) if query.has_wildcard
+            else next(iter(_walk(record, query.steps)), None) for record in records]
+    print(f"Edge cases match the interpreted walker: {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+    # Equal keys of different types are cached apart; unhashable keys miss
+    letters = ["a", "b"]
+    looked_up = [get_path(letters, [key], "n/a") for key in (1, 1.0, True)]
+    unhashable = get_path({"a": 1}, ["a", ["x"]], "n/a")
+    print(f"Keys 1, 1.0, True on a list: {looked_up}, unhashable key: {unhashable!r} "
+          f"(Expected: ['b', 'n/a', 'b'], 'n/a')")
+    ok = looked_up == ["b", "n/a", "b"] and unhashable == "n/a"
+    print(f"Typed and unhashable keys: {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+
+def benchmark_path_query(n: int = 1_000_000):
+    """Compare compiled queries with hand-written and interpreted lookups."""
+    import random
+    import time
+
+    print(f"\n=== Path Query Benchmark ({n:,} records) ===")
+    rng = random.Random(5)
+    stack = ["Python", "Go", "Rust", "Java", "SQL", "React", "Figma", "R"]
+    records = [{
+        "name": f"company{i}",
+        "departments": [{"name": f"dept{d}", "technologies": rng.sample(stack, 2)}
+                        for d in range(rng.randint(1, 3))],
+    } for i in range(n)]
+
+    def get_nested_value(dict_obj, keys, default=None):
+        # The original helper from 03_dictionaries.py
+        try:
+            for key in keys:
+                dict_obj = dict_obj[key]
+            return dict_obj
+        except (KeyError, TypeError):
+            return default
+
+    query = compile_path("departments[*].technologies[*]")
+    plain = compile_path("departments[0].name")
+    candidates = {
+        "wildcard: nested comprehension": lambda: [
+            tech for record in records for dept in record["departments"]
+            for tech in dept["technologies"]],
+        "wildcard: interpreted walker": lambda: [
+            match for record in records for match in _walk(record, query.steps)],
+        "wildcard: compiled extract": lambda: query.extract(records),
+        "plain: get_nested_value loop": lambda: [
+            get_nested_value(record, ["departments", 0, "name"]) for record in records],
+        "plain: get_path per record": lambda: [
+            get_path(record, "departments[0].name") for record in records],
+        "plain: compiled apply": lambda: plain.apply(records),
+    }
+    print(f"{'variant':<32} {'seconds':>8} {'records/s':>14}")
+    results = {}
+    for name, run in candidates.items():
+        start = time.perf_counter()
+        results[name] = run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<32} {elapsed:>8.2f} {n / elapsed:>14,.0f}")
+    ok = (results["wildcard: compiled extract"] == results["wildcard: nested comprehension"]
+          and results["plain: compiled apply"] == results["plain: get_nested_value loop"])
+    print(f"Results agree: {'✓' if ok else '✗'}")
+
+
+def main():
+    """Check and benchmark compiled path queries."""
+    check_path_query()
+    # Pass n=1_000_000 for the full-size run
+    benchmark_path_query(n=200_000)
+
+
+if __name__ == "__main__":
+    main()
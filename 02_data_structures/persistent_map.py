@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Persistent Nested Maps
+This module backs deep_update() in 03_dictionaries.py. FrozenMap is an
+immutable nested mapping whose merge() returns a new map that shares every
+subtree the update does not touch, so merging a small override into a
+large config tree needs no deepcopy and leaves the original intact. Every
+walk here uses an explicit stack, so tree depth is not limited by the
+recursion limit.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Hashable, Iterator, List, Sequence, Tuple
+
+
+class FrozenMap(Mapping):
+    """
+    Immutable mapping whose nested dicts are FrozenMaps too.
+
+    merge() copies only the nodes on the paths the update touches. Each
+    copied node is a shallow dict.copy() in C, so a merge costs
+    O(sum of the widths of the touched nodes), however large the rest of
+    the tree is. Unchanged subtrees are the very same objects in the old
+    and new maps.
+
+    Example usage:
+    config = FrozenMap({"db": {"host": "localhost", "port": 5432}, "cache": {...}})
+    production = config.merge({"db": {"host": "db.internal"}})
+    production["cache"] is config["cache"]   # True: shared, not copied
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Mapping = ()):
+        self._data = _freeze_items(data)
+
+    @classmethod
+    def _wrap(cls, data: Dict[Hashable, Any]) -> "FrozenMap":
+        """Adopt an already-frozen dict without copying it."""
+        node = object.__new__(cls)
+        node._data = data
+        return node
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def __repr__(self) -> str:
+        return f"FrozenMap({self._data!r})"
+
+    def merge(self, update: Mapping) -> "FrozenMap":
+        """
+        Return a new map with update deep-merged in (deep_update semantics).
+
+        Where both sides hold a mapping the merge descends; anywhere else
+        the update's value replaces the old one.
+        """
+        root = self._data.copy()
+        # (new dict being filled in, the update to apply to it)
+        stack: List[Tuple[Dict[Hashable, Any], Mapping]] = [(root, update)]
+        while stack:
+            target, changes = stack.pop()
+            for key, value in changes.items():
+                current = target.get(key)
+                if isinstance(value, Mapping) and isinstance(current, FrozenMap):
+                    # Copy-on-write: the copy is private until merge() returns
+                    child = current._data.copy()
+                    target[key] = FrozenMap._wrap(child)
+                    stack.append((child, value))
+                elif isinstance(value, dict):
+                    target[key] = FrozenMap(value)
+                else:
+                    target[key] = value
+        return FrozenMap._wrap(root)
+
+    def set_in(self, keys: Sequence[Hashable], value: Any) -> "FrozenMap":
+        """Return a new map with value at the nested key path keys."""
+        if not keys:
+            raise ValueError("keys must not be empty")
+        for key in reversed(keys):
+            value = {key: value}
+        return self.merge(value)
+
+    def to_dict(self) -> Dict[Hashable, Any]:
+        """A plain nested dict copy (iterative, so deep trees are fine)."""
+        root: Dict[Hashable, Any] = {}
+        stack = [(root, self._data)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if isinstance(value, FrozenMap):
+                    child: Dict[Hashable, Any] = {}
+                    target[key] = child
+                    stack.append((child, value._data))
+                else:
+                    target[key] = value
+        return root
+
+
+def _freeze_items(data: Mapping) -> Dict[Hashable, Any]:
+    """Copy data into a dict, turning nested dicts into FrozenMaps."""
+    if isinstance(data, FrozenMap):
+        return data._data
+    root = dict(data)
+    stack = [root]
+    while stack:
+        target = stack.pop()
+        for key, value in target.items():
+            if isinstance(value, dict):
+                # Replacing the value of an existing key is safe mid-iteration
+                child = dict(value)
+                target[key] = FrozenMap._wrap(child)
+                stack.append(child)
+    return root
+
+
+def deep_update(d1: Dict, d2: Mapping) -> None:
+    """
+    Update dictionary d1 in place with d2, merging nested dicts.
+
+    Same result as the recursive version, but walks with an explicit stack,
+    so arbitrarily deep trees cannot hit the recursion limit.
+    """
+    stack = [(d1, d2)]
+    while stack:
+        target, changes = stack.pop()
+        for key, value in changes.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, Mapping):
+                stack.append((current, value))
+            else:
+                target[key] = value
+
+
+def _recursive_deep_update(d1, d2):
+    """The original recursive helper from 03_dictionaries.py, for comparison."""
+    for key, value in d2.items():
+        if key in d1 and isinstance(d1[key], dict) and isinstance(value, dict):
+            _recursive_deep_update(d1[key], value)
+        else:
+            d1[key] = value
+
+
+def _count_nodes(tree: Mapping) -> int:
+    """Number of mappings plus leaves in tree."""
+    total, stack = 0, [tree]
+    while stack:
+        node = stack.pop()
+        total += 1
+        stack.extend(value for value in node.values() if isinstance(value, Mapping))
+        total += sum(1 for value in node.values() if not isinstance(value, Mapping))
+    return total
+
+
+def check_persistent_map():
+    """Check merges against deepcopy + the recursive deep_update."""
+    import copy
+    import random
+
+    print("\nTesting FrozenMap:")
+    config = FrozenMap({"db": {"host": "localhost", "port": 5432},
+                        "cache": {"ttl": 60, "backends": {"redis": {"port": 6379}}}})
+    production = config.merge({"db": {"host": "db.internal"}, "debug": False})
+    print(f"Merged: {production.to_dict()}")
+    print(f"Original unchanged: {config['db']['host'] == 'localhost'}, "
+          f"untouched subtree shared: {production['cache'] is config['cache']} (Expected: True, True)")
+
+    rng = random.Random(12)
+
+    def random_tree(depth):
+        return {f"k{rng.randrange(6)}": (random_tree(depth - 1) if depth and rng.random() < 0.6
+                                         else rng.randrange(100))
+                for _ in range(rng.randint(1, 4))}
+
+    ok = True
+    for _ in range(300):
+        base, update = random_tree(4), random_tree(4)
+        expected = copy.deepcopy(base)
+        _recursive_deep_update(expected, copy.deepcopy(update))
+        frozen = FrozenMap(base)
+        ok &= frozen.merge(update).to_dict() == expected
+        ok &= frozen.to_dict() == base
+        in_place = copy.deepcopy(base)
+        deep_update(in_place, update)
+        ok &= in_place == expected
+    print(f"Random merges match deepcopy + deep_update: {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+    depth = 50_000
+    deep: Dict[str, Any] = {}
+    node = deep
+    for _ in range(depth):
+        node["child"] = node = {}
+    patch: Dict[str, Any] = {}
+    node = patch
+    for _ in range(depth - 1):
+        node["child"] = node = {}
+    node["child"] = {"leaf": True}
+    merged = FrozenMap(deep).merge(patch)
+    deep_update(deep, patch)
+    levels, node = 0, merged
+    while "child" in node:
+        levels, node = levels + 1, node["child"]
+    ok = levels == depth and node["leaf"] is True
+    print(f"Merges {depth:,} levels deep without recursion: {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+
+def benchmark_persistent_map(leaves: int = 100_000, merges: int = 100):
+    """Compare deepcopy + deep_update with a structural-sharing merge."""
+    import copy
+    import random
+    import time
+
+    sections, groups = 20, 50
+    per_group = max(1, leaves // (sections * groups))
+    tree = {f"section{s}": {f"group{g}": {f"key{k}": k for k in range(per_group)}
+                            for g in range(groups)}
+            for s in range(sections)}
+    print(f"\n=== Persistent Merge Benchmark ({_count_nodes(tree):,}-node tree, "
+          f"{merges} small updates) ===")
+    rng = random.Random(3)
+    updates = [{f"section{rng.randrange(sections)}": {f"group{rng.randrange(groups)}": {
+        f"key{rng.randrange(per_group)}": -1, "new": True}}} for _ in range(merges)]
+
+    start = time.perf_counter()
+    for update in updates:
+        merged = copy.deepcopy(tree)
+        _recursive_deep_update(merged, update)
+    copy_seconds = (time.perf_counter() - start) / merges
+
+    frozen = FrozenMap(tree)
+    start = time.perf_counter()
+    for update in updates:
+        result = frozen.merge(update)
+    merge_seconds = (time.perf_counter() - start) / merges
+
+    ok = result.to_dict() == merged
+    shared = sum(result[name] is frozen[name] for name in frozen)
+    print(f"{'variant':<26} {'us/merge':>12}")
+    print(f"{'deepcopy + deep_update':<26} {copy_seconds * 1e6:>12,.0f}")
+    print(f"{'FrozenMap.merge':<26} {merge_seconds * 1e6:>12,.1f} "
+          f"({copy_seconds / merge_seconds:,.0f}x) {'✓' if ok else '✗'}")
+    print(f"Top-level sections shared with the original: {shared}/{len(frozen)}")
+
+
+def main():
+    """Check and benchmark persistent merges."""
+    check_persistent_map()
+    # Pass merges=100 for the full-size run
+    benchmark_persistent_map(merges=20)
+
+
+if __name__ == "__main__":
+    main()
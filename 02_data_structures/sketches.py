@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+"""
+Streaming Sketches
+This module provides fixed-memory alternatives to the exact Counters in
+analyze_logs() (05_advanced.py), count_words() (03_dictionaries.py) and
+word_counter.py, for streams with too many distinct items to count exactly:
+
+- CountMinSketch estimates the frequency of any item, never undercounting,
+  and overcounting by at most epsilon * N with probability 1 - delta
+- SpaceSaving tracks the heavy hitters in a fixed number of counters
+- HyperLogLog counts distinct items (unique words, unique error messages)
+  in a few kilobytes, instead of keeping every distinct item in a set
+
+All are backed by compact typed storage (array.array counters, a
+bytearray of registers), and all can be merged, so sketches built on
+separate shards (see word_counter.shard_file()) combine into a sketch of
+the whole stream.
+"""
+
+import hashlib
+import heapq
+import math
+import random
+from array import array
+from collections import Counter
+from itertools import islice
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional
+from zlib import crc32
+
+# Mersenne prime for the (a * x + b) mod p hash family
+_PRIME = (1 << 61) - 1
+
+# Items tallied per batch by update(): bounds the Counter's memory however
+# many distinct items the stream holds
+_BATCH_SIZE = 1 << 16
+
+
+def _encode(item: Hashable) -> bytes:
+    """
+    Type-tagged bytes for item, the same in every process.
+
+    hash() is randomized per interpreter for str and bytes, and a default
+    repr() embeds a memory address, so neither can key a sketch that is
+    merged across processes. Each supported type gets its own one-byte
+    tag, so 1 and "1" are different items; numbers that compare equal
+    (True, 1, 1.0) encode alike, as they are one key to a Counter.
+
+    Raises:
+        TypeError: item is not a str, bytes, int, float, None or a tuple
+            of those; convert other keys (e.g. with str()) first
+    """
+    cls = item.__class__
+    if cls is str:
+        return b"s" + item.encode("utf-8", "surrogatepass")
+    if isinstance(item, bytes):
+        return b"b" + item
+    if isinstance(item, float) and item.is_integer():
+        item = int(item)
+    if isinstance(item, int):
+        return b"i" + b"%d" % item
+    if isinstance(item, float):
+        return b"f" + repr(item).encode("ascii")
+    if item is None:
+        return b"n"
+    if isinstance(item, tuple):
+        parts = [b"t"]
+        for element in item:
+            data = _encode(element)
+            parts.append(len(data).to_bytes(4, "big"))
+            parts.append(data)
+        return b"".join(parts)
+    raise TypeError(f"cannot sketch items of type {cls.__name__!r}: use str, bytes, "
+                    "int, float, None or tuples of them")
+
+
+# CRC of the str tag, so str fast paths can hash the encoded text alone
+_STR_CRC = crc32(b"s")
+
+
+def _fingerprint(item: Hashable) -> int:
+    """Stable 32-bit fingerprint of item (see _encode())."""
+    return crc32(_encode(item))
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: depth rows of width counters.
+
+    Each item is counted in one counter per row, chosen by a row-specific
+    hash; its estimate is the smallest of those counters. Collisions only
+    ever add, so estimates are never below the true count, and with
+    width = ceil(e / epsilon) and depth = ceil(ln(1 / delta)) an estimate
+    exceeds the true count by more than epsilon * total with probability
+    at most delta. Items (str, bytes, numbers, None or tuples of them)
+    are first reduced to a 32-bit CRC fingerprint;
+    with n distinct items, about n**2 / 2**33 fingerprint pairs collide,
+    which adds to the same overcount.
+
+    Memory is width * depth * 8 bytes, independent of the number of
+    distinct items.
+
+    Example usage:
+    sketch = CountMinSketch.from_error(epsilon=0.001, delta=0.01)
+    sketch.update(words)
+    sketch.estimate("python")
+    """
+
+    __slots__ = ("width", "depth", "seed", "total", "_counts", "_rows")
+
+    def __init__(self, width: int = 2048, depth: int = 5, seed: int = 0):
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be at least 1")
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.total = 0
+        self._counts = array("q", bytes(8 * width * depth))
+        # One (a, b) pair per row, derived from seed so that sketches built
+        # separately with the same parameters are mergeable, stored with
+        # the row's offset into _counts
+        rng = random.Random(seed)
+        self._rows = [(row * width, rng.randrange(1, _PRIME), rng.randrange(_PRIME))
+                      for row in range(depth)]
+
+    @classmethod
+    def from_error(cls, epsilon: float = 0.001, delta: float = 0.01, seed: int = 0) -> "CountMinSketch":
+        """Size a sketch for an additive error of epsilon * total with probability 1 - delta."""
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)), seed)
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+    @property
+    def nbytes(self) -> int:
+        return self._counts.itemsize * len(self._counts)
+
+    def error_bound(self) -> float:
+        """Additive overcount that holds with probability 1 - delta."""
+        return self.epsilon * self.total
+
+    def _cells(self, item: Hashable) -> List[int]:
+        x = _fingerprint(item)
+        width = self.width
+        return [offset + (a * x + b) % _PRIME % width for offset, a, b in self._rows]
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        """Count item count more times."""
+        if count < 0:
+            raise ValueError("count must not be negative")
+        counts = self._counts
+        for cell in self._cells(item):
+            counts[cell] += count
+        self.total += count
+
+    def update(self, items: Iterable[Hashable]) -> None:
+        """
+        Count every item in items.
+
+        items is consumed in batches of _BATCH_SIZE, each tallied exactly
+        with Counter first (in C), so each distinct item is hashed once per
+        batch rather than once per occurrence; on skewed streams that is
+        most of the work saved. Memory stays bounded by the batch size.
+        """
+        counts = self._counts
+        rows = self._rows
+        width = self.width
+        iterator = iter(items)
+        while True:
+            tally = Counter(islice(iterator, _BATCH_SIZE))
+            if not tally:
+                break
+            for item, count in tally.items():
+                # _cells() inlined: this loop runs once per distinct item
+                x = (crc32(item.encode("utf-8", "surrogatepass"), _STR_CRC) if item.__class__ is str
+                     else _fingerprint(item))
+                for offset, a, b in rows:
+                    counts[offset + (a * x + b) % _PRIME % width] += count
+            self.total += sum(tally.values())
+
+    def estimate(self, item: Hashable) -> int:
+        """Estimated count of item (never below the true count)."""
+        counts = self._counts
+        return min(counts[cell] for cell in self._cells(item))
+
+    __getitem__ = estimate
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """
+        Fold another sketch with the same width, depth and seed into this
+        one and return self. The result equals a sketch of both streams.
+        """
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("only sketches with the same width, depth and seed can be merged")
+        self._counts = array("q", map(int.__add__, self._counts, other._counts))
+        self.total += other.total
+        return self
+
+    def __repr__(self) -> str:
+        return (f"CountMinSketch(width={self.width}, depth={self.depth}, "
+                f"total={self.total}, {self.nbytes:,} bytes)")
+
+
+class HeavyHitter(NamedTuple):
+    """A tracked item: count overestimates the true count by at most error."""
+    item: Hashable
+    count: int
+    error: int
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters with a fixed number of counters.
+
+    Tracks at most capacity items. A new item arriving when every counter
+    is in use takes over the counter with the smallest count m, starting
+    from m + 1 with error m. After N items:
+
+    - every item occurring more than N / capacity times is tracked
+    - for a tracked item, count - error <= true count <= count
+
+    Counts and errors live in two array('q') slots per counter. The
+    smallest counter is found with a lazy min-heap holding one entry per
+    slot: counts only grow, so an entry is at worst stale-low and is
+    refreshed when it reaches the top.
+
+    Example usage:
+    top = SpaceSaving(capacity=1000)
+    top.update(words)
+    top.top(10)
+    """
+
+    __slots__ = ("capacity", "total", "_items", "_slots", "_counts", "_errors", "_heap")
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self._items: List[Hashable] = []
+        self._slots: Dict[Hashable, int] = {}
+        self._counts = array("q")
+        self._errors = array("q")
+        self._heap: List[tuple] = []   # (count when pushed, slot)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._slots
+
+    def _min_slot(self) -> int:
+        heap, counts = self._heap, self._counts
+        while True:
+            count, slot = heap[0]
+            current = counts[slot]
+            if count == current:
+                return slot
+            heapq.heapreplace(heap, (current, slot))
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        """Count item count more times."""
+        self.total += count
+        slot = self._slots.get(item)
+        if slot is not None:
+            self._counts[slot] += count
+        elif len(self._items) < self.capacity:
+            slot = len(self._items)
+            self._slots[item] = slot
+            self._items.append(item)
+            self._counts.append(count)
+            self._errors.append(0)
+            heapq.heappush(self._heap, (count, slot))
+        else:
+            slot = self._min_slot()
+            floor = self._counts[slot]
+            del self._slots[self._items[slot]]
+            self._slots[item] = slot
+            self._items[slot] = item
+            self._counts[slot] = floor + count
+            self._errors[slot] = floor
+            heapq.heapreplace(self._heap, (floor + count, slot))
+
+    def update(self, items: Iterable[Hashable]) -> None:
+        """
+        Count every item in items.
+
+        items is consumed in batches of _BATCH_SIZE, each tallied with
+        Counter first and applied heaviest first, which keeps the
+        guarantees above and means an evicted counter is usually one of
+        the batch's rare items. Memory stays bounded by the batch size.
+        """
+        add, slots, counts = self.add, self._slots, self._counts
+        iterator = iter(items)
+        while True:
+            tally = Counter(islice(iterator, _BATCH_SIZE))
+            if not tally:
+                break
+            for item, count in tally.most_common():
+                slot = slots.get(item)
+                if slot is not None:
+                    # Already tracked: the common case, done without a call
+                    counts[slot] += count
+                    self.total += count
+                else:
+                    add(item, count)
+
+    def estimate(self, item: Hashable) -> int:
+        """Upper bound on item's count: its counter, or the smallest counter if untracked."""
+        slot = self._slots.get(item)
+        if slot is not None:
+            return self._counts[slot]
+        if len(self._items) < self.capacity:
+            return 0
+        return self._counts[self._min_slot()]
+
+    def top(self, k: Optional[int] = None) -> List[HeavyHitter]:
+        """The k largest counters (all of them if k is None), largest first."""
+        k = len(self._items) if k is None else k
+        counts, errors, items = self._counts, self._errors, self._items
+        slots = heapq.nlargest(k, range(len(items)), key=counts.__getitem__)
+        return [HeavyHitter(items[slot], counts[slot], errors[slot]) for slot in slots]
+
+    def guaranteed(self, k: Optional[int] = None) -> List[HeavyHitter]:
+        """
+        The entries of top(k) whose lower bound (count - error) is at least
+        the largest count outside top(k): items certain to be in the top k.
+        """
+        ranked = self.top()
+        k = len(ranked) if k is None else k
+        cutoff = ranked[k].count if k < len(ranked) else 0
+        return [hitter for hitter in ranked[:k] if hitter.count - hitter.error >= cutoff]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the counter arrays (the items themselves are not counted)."""
+        return (self._counts.itemsize * len(self._counts)
+                + self._errors.itemsize * len(self._errors))
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Fold another summary into this one and return self.
+
+        An item missing from a full summary may still have occurred there
+        up to that summary's smallest count, so it is credited with that
+        count (as error) before the capacity largest counters are kept.
+        The guarantees above then hold for the combined stream.
+        """
+        def floor(summary):
+            return summary._counts[summary._min_slot()] if len(summary) == summary.capacity else 0
+
+        own_floor, other_floor = floor(self), floor(other)
+        mine = {item: (self._counts[s], self._errors[s]) for item, s in self._slots.items()}
+        theirs = {item: (other._counts[s], other._errors[s]) for item, s in other._slots.items()}
+        merged = []
+        for item in mine.keys() | theirs.keys():
+            count_a, error_a = mine.get(item, (own_floor, own_floor))
+            count_b, error_b = theirs.get(item, (other_floor, other_floor))
+            merged.append((count_a + count_b, error_a + error_b, item))
+        kept = heapq.nlargest(self.capacity, merged, key=lambda entry: entry[0])
+
+        self.total += other.total
+        self._items = [item for _, _, item in kept]
+        self._slots = {item: slot for slot, item in enumerate(self._items)}
+        self._counts = array("q", [count for count, _, _ in kept])
+        self._errors = array("q", [error for _, error, _ in kept])
+        self._heap = [(count, slot) for slot, count in enumerate(self._counts)]
+        heapq.heapify(self._heap)
+        return self
+
+    def __repr__(self) -> str:
+        return f"SpaceSaving(capacity={self.capacity}, tracked={len(self)}, total={self.total})"
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter with 2**precision one-byte registers.
+
+    Each item's 64-bit hash picks a register with its first precision bits;
+    the register keeps the largest "position of the first 1 bit" seen in
+    the remaining bits. The harmonic mean of the registers estimates the
+    number of distinct items, with linear counting for small cardinalities.
+
+    Relative standard error is about 1.04 / sqrt(2**precision):
+
+        precision   registers   memory   standard error
+        10          1,024       1 KB     3.3%
+        12          4,096       4 KB     1.6%
+        14          16,384      16 KB    0.81%
+        16          65,536      64 KB    0.41%
+
+    Estimates stay within about two standard errors 95% of the time. The
+    hash is 64-bit (BLAKE2b), so there is no large-range correction to
+    make and billions of items are fine; it is stable across processes,
+    so sketches from different shards can be merged.
+
+    Example usage:
+    unique = HyperLogLog(precision=14)
+    unique.add_many(words)
+    unique.count()
+    """
+
+    __slots__ = ("precision", "_registers")
+
+    # 1 / 2**rank for every possible register value
+    _INVERSE_POWERS = [2.0 ** -rank for rank in range(66)]
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    @property
+    def standard_error(self) -> float:
+        return 1.04 / math.sqrt(len(self._registers))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._registers)
+
+    def add(self, item: Hashable) -> None:
+        """Record one item."""
+        self.add_many((item,))
+
+    def add_many(self, items: Iterable[Hashable]) -> None:
+        """
+        Record every item in items.
+
+        items is consumed in batches of _BATCH_SIZE; duplicates within a
+        batch are dropped with a set (in C) before hashing, so each
+        distinct item is hashed once per batch while memory stays bounded
+        by the batch size. Items are encoded as in CountMinSketch.
+        """
+        registers = self._registers
+        shift = 64 - self.precision
+        mask = (1 << shift) - 1
+        blake2b, from_bytes = hashlib.blake2b, int.from_bytes
+        iterator = iter(items)
+        while True:
+            batch = set(islice(iterator, _BATCH_SIZE))
+            if not batch:
+                break
+            for item in batch:
+                data = b"s" + item.encode("utf-8", "surrogatepass") if item.__class__ is str else _encode(item)
+                x = from_bytes(blake2b(data, digest_size=8).digest(), "big")
+                index = x >> shift
+                # Position of the first 1 bit in the remaining bits
+                rank = shift - (x & mask).bit_length() + 1
+                if rank > registers[index]:
+                    registers[index] = rank
+
+    def count(self) -> int:
+        """Estimated number of distinct items added."""
+        registers = self._registers
+        m = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(map(self._INVERSE_POWERS.__getitem__, registers))
+        zeros = registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are empty
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    __len__ = count
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Fold another sketch with the same precision into this one and
+        return self. The result equals a sketch of the union of both streams.
+        """
+        if self.precision != other.precision:
+            raise ValueError("only sketches with the same precision can be merged")
+        self._registers = bytearray(map(max, self._registers, other._registers))
+        return self
+
+    def __repr__(self) -> str:
+        return f"HyperLogLog(precision={self.precision}, count~{self.count():,})"
+
+
+def check_sketches():
+    """Check the error guarantees and merging on a skewed stream."""
+    print("\nTesting sketches:")
+    rng = random.Random(21)
+    population = [f"item{i}" for i in range(20_000)]
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(len(population))]
+    stream = rng.choices(population, weights, k=200_000)
+    exact = Counter(stream)
+
+    sketch = CountMinSketch.from_error(epsilon=0.001, delta=0.01)
+    for item in stream[:1000]:
+        sketch.add(item)
+    sketch.update(stream[1000:])
+    bound = sketch.error_bound()
+    errors = [sketch.estimate(item) - count for item, count in exact.items()]
+    ok = min(errors) >= 0 and sum(error > bound for error in errors) <= 0.01 * len(errors)
+    print(f"Count-Min: never under, {sum(e > bound for e in errors)} of {len(errors):,} "
+          f"items over epsilon*N = {bound:.0f}: {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+    left, right = CountMinSketch(1000, 4, seed=3), CountMinSketch(1000, 4, seed=3)
+    whole = CountMinSketch(1000, 4, seed=3)
+    left.update(stream[:70_000])
+    right.update(stream[70_000:])
+    whole.update(stream)
+    ok = left.merge(right)._counts == whole._counts and left.total == whole.total
+    print(f"Merged Count-Min equals one sketch of the whole stream: "
+          f"{'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+    typed = CountMinSketch(1000, 4)
+    typed.update([1, 1, 1.0, True, "1", ("1", 1)])
+    ok = [typed[1], typed["1"], typed[("1", 1)]] == [4, 1, 1]
+    ok &= _fingerprint("é") == crc32("é".encode("utf-8"), _STR_CRC)
+    try:
+        typed.add(object())
+        ok = False
+    except TypeError:
+        pass
+    print(f"1 and '1' counted apart, address-based reprs rejected: "
+          f"{'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+    capacity = 500
+    summary = SpaceSaving(capacity)
+    summary.update(stream[:50_000])
+    for item in stream[50_000:60_000]:
+        summary.add(item)
+    shards = [SpaceSaving(capacity) for _ in range(4)]
+    for index, shard in enumerate(shards):
+        shard.update(stream[60_000 + index * 35_000:60_000 + (index + 1) * 35_000])
+        summary.merge(shard)
+    threshold = len(stream) / capacity
+    ok = summary.total == len(stream)
+    ok &= all(item in summary for item, count in exact.items() if count > threshold)
+    ok &= all(h.count - h.error <= exact[h.item] <= h.count for h in summary.top())
+    expected_top = [item for item, _ in exact.most_common(10)]
+    print(f"Space-Saving top 5: {[(h.item, h.count) for h in summary.top(5)]}")
+    print(f"Exact top 5:        {exact.most_common(5)}")
+    print(f"Bounds hold after merging shards, top 10 found: "
+          f"{'✓ Correct!' if ok and [h.item for h in summary.top(10)] == expected_top else '✗ Not quite right.'}")
+
+
+def benchmark_sketches(words: int = 10_000_000, vocabulary: int = 1_000_000):
+    """Compare accuracy, memory and speed with exact counting on a word stream."""
+    import os
+    import sys
+    import tempfile
+    import time
+
+    from word_counter import iter_text_chunks, top_k, write_sample_corpus
+
+    print(f"\n=== Sketch Benchmark ({words:,} words, vocabulary {vocabulary:,}) ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        write_sample_corpus(path, words, seed=4, vocabulary=vocabulary)
+
+        def run(counter):
+            start = time.perf_counter()
+            for chunk in iter_text_chunks(path):
+                counter.update(chunk.lower().split())
+            return time.perf_counter() - start
+
+        exact = Counter()
+        exact_seconds = run(exact)
+        exact_bytes = sys.getsizeof(exact) + sum(map(sys.getsizeof, exact))
+        sketch = CountMinSketch.from_error(epsilon=0.0005, delta=0.01)
+        sketch_seconds = run(sketch)
+        summary = SpaceSaving(capacity=2_000)
+        summary_seconds = run(summary)
+
+    print(f"{'structure':<22} {'seconds':>8} {'memory':>12}")
+    print(f"{'Counter (exact)':<22} {exact_seconds:>8.2f} {exact_bytes / 1e6:>9.1f} MB "
+          f"({len(exact):,} keys, including the key strings)")
+    print(f"{'CountMinSketch':<22} {sketch_seconds:>8.2f} {sketch.nbytes / 1e6:>9.1f} MB "
+          f"({sketch.width:,} x {sketch.depth})")
+    print(f"{'SpaceSaving(2,000)':<22} {summary_seconds:>8.2f} {summary.nbytes / 1e6:>9.3f} MB "
+          f"(+ 2,000 tracked keys)")
+
+    bound = sketch.error_bound()
+    sample = random.Random(1).sample(list(exact), min(10_000, len(exact)))
+    errors = [sketch.estimate(word) - exact[word] for word in sample]
+    heavy = [word for word, _ in top_k(exact, 100)]
+    heavy_errors = [(sketch.estimate(word) - exact[word]) / exact[word] for word in heavy]
+    print(f"\nCount-Min bound epsilon*N = {bound:,.0f}; random words: mean overcount "
+          f"{sum(errors) / len(errors):,.1f}, {sum(e > bound for e in errors) / len(errors):.2%} over bound; "
+          f"top 100 words: worst relative error {max(heavy_errors):.3%}")
+
+    for k in (10, 100):
+        expected = {word for word, _ in top_k(exact, k)}
+        found = {hitter.item for hitter in summary.top(k)}
+        worst = max(hitter.count - exact[hitter.item] for hitter in summary.top(k))
+        print(f"Space-Saving top {k}: recall {len(expected & found) / k:.0%}, "
+              f"largest overcount {worst:,} (N / capacity = {words / summary.capacity:,.0f})")
+
+
+def check_hyperloglog():
+    """Check HyperLogLog estimates and merging against exact sets."""
+    print("\nTesting HyperLogLog:")
+    unique = HyperLogLog(precision=12)
+    unique.add_many("the quick brown fox jumps over the lazy dog".split())
+    print(f"Unique words in the exercise_2 sentence: {unique.count()} (Expected: 8)")
+    mixed = HyperLogLog(precision=12)
+    mixed.add_many([1, "1", 1.0, True, b"1"])
+    print(f"Distinct among 1, '1', 1.0, True, b'1': {mixed.count()} (Expected: 3)")
+
+    ok = True
+    for cardinality in (100, 10_000, 200_000):
+        sketch = HyperLogLog(precision=12)
+        words = [f"word{i}" for i in range(cardinality)]
+        sketch.add_many(words + words[: cardinality // 2])
+        ok &= abs(sketch.count() - cardinality) <= 3 * sketch.standard_error * cardinality
+    print(f"Estimates within 3 standard errors: {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+    left, right, whole = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+    left.add_many(range(0, 60_000))
+    right.add_many(range(40_000, 100_000))
+    whole.add_many(range(100_000))
+    ok = left.merge(right)._registers == whole._registers
+    print(f"Merged sketch equals a sketch of the union: {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+
+def benchmark_hyperloglog(max_cardinality: int = 10_000_000, precisions=(10, 12, 14, 16)):
+    """Compare HyperLogLog error and memory with an exact set."""
+    import sys
+    import time
+
+    print(f"\n=== HyperLogLog Benchmark (up to {max_cardinality:,} distinct items) ===")
+    cardinalities = [n for n in (10_000, 100_000, 1_000_000, 10_000_000) if n <= max_cardinality]
+    print(f"{'distinct':>12} {'set MB':>8} " + " ".join(f"{f'p={p} err':>10}" for p in precisions))
+    for cardinality in cardinalities:
+        items = [f"user-{i:010d}" for i in range(cardinality)]
+        exact = set(items)
+        set_mb = (sys.getsizeof(exact) + sum(map(sys.getsizeof, items))) / 1e6
+        errors = []
+        for precision in precisions:
+            sketch = HyperLogLog(precision)
+            sketch.add_many(items)
+            errors.append((sketch.count() - cardinality) / cardinality)
+        print(f"{cardinality:>12,} {set_mb:>8.1f} " + " ".join(f"{e:>+10.2%}" for e in errors))
+    print(f"{'memory':>12} {'':>8} " + " ".join(f"{f'{(1 << p) / 1024:.0f} KB':>10}" for p in precisions))
+    print(f"{'std error':>12} {'':>8} " + " ".join(
+        f"{HyperLogLog(p).standard_error:>10.2%}" for p in precisions))
+
+    sketch = HyperLogLog(14)
+    start = time.perf_counter()
+    sketch.add_many(items)
+    elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    set(items)
+    set_elapsed = time.perf_counter() - start
+    print(f"add_many: {cardinality / elapsed:,.0f} distinct items/s "
+          f"(set(): {cardinality / set_elapsed:,.0f}/s, but memory grows with every item)")
+
+
+def main():
+    """Check and benchmark the streaming sketches."""
+    check_sketches()
+    check_hyperloglog()
+    # Pass words=10_000_000 for the full-size run
+    benchmark_sketches(words=2_000_000, vocabulary=500_000)
+    # Pass max_cardinality=10_000_000 for the full-size run
+    benchmark_hyperloglog(max_cardinality=1_000_000)
+
+
+if __name__ == "__main__":
+    main()
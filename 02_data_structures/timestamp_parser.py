@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Fast Fixed-Format Timestamp Parser
+This module parses ``YYYY-MM-DD HH:MM:SS`` timestamps by slicing fixed
+positions instead of calling datetime.strptime() on every log line.
+"""
+
+from datetime import date, datetime
+from typing import Dict, Tuple
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class TimestampParser:
+    """
+    Parser for ``YYYY-MM-DD HH:MM:SS`` timestamps.
+
+    Only the first 19 characters of the input are read, so a whole log line
+    can be passed in directly. Log files repeat the same dates and times on
+    many lines, so parsed date prefixes and ``HH:MM:SS`` strings are cached;
+    the time cache holds at most 86,400 entries (one per second of the day).
+
+    Example:
+        parser = TimestampParser()
+        parser.parse("2024-03-14 10:00:00 ERROR ...")   # datetime(2024, 3, 14, 10, 0)
+        parser.parse_epoch("2024-03-14 10:00:00")      # 1710410400
+    """
+
+    __slots__ = ("_dates", "_times", "_max_dates")
+
+    def __init__(self, max_dates: int = 1024):
+        # "YYYY-MM-DD" -> (year, month, day, epoch seconds at midnight UTC)
+        self._dates: Dict[str, Tuple[int, int, int, int]] = {}
+        # "HH:MM:SS" -> (hour, minute, second, seconds since midnight)
+        self._times: Dict[str, Tuple[int, int, int, int]] = {}
+        self._max_dates = max_dates
+
+    def _parse_date(self, text: str) -> Tuple[int, int, int, int]:
+        if (len(text) != 10 or text[4] != "-" or text[7] != "-"
+                or not (digits := text[0:4] + text[5:7] + text[8:10]).isdigit() or not digits.isascii()):
+            raise ValueError(f"time data {text!r} does not match format 'YYYY-MM-DD'")
+        parsed = date(int(text[0:4]), int(text[5:7]), int(text[8:10]))
+        entry = (parsed.year, parsed.month, parsed.day,
+                 (parsed.toordinal() - _EPOCH_ORDINAL) * 86400)
+        if len(self._dates) >= self._max_dates:
+            self._dates.clear()
+        self._dates[text] = entry
+        return entry
+
+    def _parse_time(self, text: str) -> Tuple[int, int, int, int]:
+        if (len(text) != 8 or text[2] != ":" or text[5] != ":"
+                or not (digits := text[0:2] + text[3:5] + text[6:8]).isdigit() or not digits.isascii()):
+            raise ValueError(f"time data {text!r} does not match format 'HH:MM:SS'")
+        hour, minute, second = int(text[0:2]), int(text[3:5]), int(text[6:8])
+        if not (0 <= hour < 24 and 0 <= minute < 60 and 0 <= second < 60):
+            raise ValueError(f"time data {text!r} is out of range")
+        entry = (hour, minute, second, hour * 3600 + minute * 60 + second)
+        self._times[text] = entry
+        return entry
+
+    def parse(self, text: str) -> datetime:
+        """Parse the leading ``YYYY-MM-DD HH:MM:SS`` of text into a datetime."""
+        if text[10:11] != " ":
+            raise ValueError(f"time data {text[:19]!r} does not match format 'YYYY-MM-DD HH:MM:SS'")
+        date_part = self._dates.get(text[:10]) or self._parse_date(text[:10])
+        time_part = self._times.get(text[11:19]) or self._parse_time(text[11:19])
+        return datetime(date_part[0], date_part[1], date_part[2],
+                        time_part[0], time_part[1], time_part[2])
+
+    def parse_epoch(self, text: str) -> int:
+        """Parse the leading ``YYYY-MM-DD HH:MM:SS`` of text into UTC epoch seconds."""
+        if text[10:11] != " ":
+            raise ValueError(f"time data {text[:19]!r} does not match format 'YYYY-MM-DD HH:MM:SS'")
+        date_part = self._dates.get(text[:10]) or self._parse_date(text[:10])
+        time_part = self._times.get(text[11:19]) or self._parse_time(text[11:19])
+        return date_part[3] + time_part[3]
+
+
+_default_parser = TimestampParser()
+parse_timestamp = _default_parser.parse
+parse_timestamp_epoch = _default_parser.parse_epoch
+
+
+def demonstrate_timestamp_parser():
+    """Demonstrate parsing to datetime and to epoch seconds."""
+    print("=== Fixed-Format Timestamp Parser ===")
+    line = "2024-03-14 10:01:30 WARNING High memory usage"
+    print(f"Line: {line}")
+    print(f"datetime: {parse_timestamp(line)!r}")
+    print(f"epoch:    {parse_timestamp_epoch(line)}")
+    expected = datetime.strptime(line[:19], "%Y-%m-%d %H:%M:%S")
+    print(f"Matches strptime: {parse_timestamp(line) == expected}")
+
+    for bad in ("2024-02-30 10:00:00", "2024-03-14 25:00:00", "14/03/2024 10:00",
+                "2024-03-14T10:00:00", "2024-+3-14 10:00:00"):
+        try:
+            parse_timestamp(bad)
+        except ValueError as e:
+            print(f"Rejected {bad!r}: {e}")
+
+
+def benchmark_timestamp_parsing(lines: int = 10_000_000, distinct_seconds: int = 200_000):
+    """
+    Compare strptime with the cached parser on a stream of log timestamps.
+
+    Timestamps advance one second every few lines, like a busy log, and are
+    drawn from a pool of distinct_seconds consecutive seconds so the input
+    does not have to be held in memory.
+    """
+    import itertools
+    import time
+    from datetime import timedelta
+
+    print(f"\n=== Timestamp Parsing Benchmark ({lines:,} lines) ===")
+    start_time = datetime(2024, 3, 14)
+    pool = [
+        (start_time + timedelta(seconds=i // 5)).strftime("%Y-%m-%d %H:%M:%S")
+        for i in range(distinct_seconds)
+    ]
+
+    def stream():
+        return itertools.islice(itertools.cycle(pool), lines)
+
+    def run_strptime():
+        strptime, fmt = datetime.strptime, "%Y-%m-%d %H:%M:%S"
+        for text in stream():
+            strptime(text, fmt)
+
+    def run_parse():
+        parse = TimestampParser().parse
+        for text in stream():
+            parse(text)
+
+    def run_parse_epoch():
+        parse_epoch = TimestampParser().parse_epoch
+        for text in stream():
+            parse_epoch(text)
+
+    candidates = {
+        "strptime": run_strptime,
+        "parse -> datetime": run_parse,
+        "parse_epoch -> int": run_parse_epoch,
+    }
+
+    baseline = None
+    print(f"{'parser':<20} {'seconds':>8} {'lines/s':>12} {'speedup':>8}")
+    for name, run in candidates.items():
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{name:<20} {elapsed:>8.2f} {lines / elapsed:>12,.0f} {baseline / elapsed:>7.1f}x")
+
+
+def main():
+    """Demonstrate and benchmark the timestamp parser."""
+    demonstrate_timestamp_parser()
+    # Pass lines=10_000_000 for the full-size run (strptime alone takes minutes)
+    benchmark_timestamp_parsing(lines=1_000_000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Streaming Word Counter
+This module runs count_words() from 03_dictionaries.py over corpora of any
+size. Files are read in large buffered chunks that are cut only at
+whitespace, so no word is ever split between chunks; each chunk is
+tokenized with str.split() and counted with Counter.update(), which does
+the counting loop in C. Large files can be split into whitespace-aligned
+shards, counted on several cores and merged.
+"""
+
+import heapq
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# ASCII whitespace: a safe cut point in UTF-8 text (never inside a
+# multi-byte character) and a word boundary for str.split()
+_WHITESPACE = b" \t\n\r\x0b\x0c"
+
+
+def _last_whitespace(data: bytes) -> int:
+    """Index of the last ASCII whitespace byte in data, or -1."""
+    return max(map(data.rfind, (bytes([byte]) for byte in _WHITESPACE)))
+
+
+def iter_text_chunks(path: str, start: int = 0, end: Optional[int] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Lazily yield decoded chunks of a file that end on whitespace.
+
+    Args:
+        path: UTF-8 text file to read
+        start: Byte offset to start from (must be at a word boundary)
+        end: Byte offset to stop at (None means end of file)
+        chunk_size: Bytes read per buffered read
+
+    Yields:
+        Text chunks; concatenated, they are exactly the bytes in
+        [start, end), and no word straddles two chunks
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        end = size if end is None else min(end, size)
+        f.seek(start)
+        remaining = end - start
+        carry = b""
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            data = carry + chunk
+            cut = _last_whitespace(data) + 1
+            # A word longer than the chunk simply keeps growing the carry
+            carry = data[cut:]
+            if cut:
+                yield data[:cut].decode("utf-8", "replace")
+        if carry:
+            yield carry.decode("utf-8", "replace")
+
+
+def count_chunks(chunks: Iterable[str], counts: Optional[Counter] = None) -> Counter:
+    """
+    Count lower-cased, whitespace-separated words over text chunks.
+
+    Chunks must not split words (iter_text_chunks() guarantees this).
+    """
+    counts = Counter() if counts is None else counts
+    update = counts.update
+    for chunk in chunks:
+        update(chunk.lower().split())
+    return counts
+
+
+def count_words_in_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Counter:
+    """Count words in a file with memory bounded by chunk_size and the vocabulary."""
+    return count_chunks(iter_text_chunks(path, chunk_size=chunk_size))
+
+
+def shard_file(path: str, shards: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into roughly equal byte ranges that start and end on
+    whitespace, so no word is split between shards.
+
+    Returns:
+        List of (start, end) offsets covering the whole file in order
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    boundaries = [0]
+    with open(path, "rb") as f:
+        for i in range(1, shards):
+            position = max(size * i // shards, boundaries[-1])
+            f.seek(position)
+            # Advance past the next whitespace byte
+            while position < size:
+                block = f.read(4096)
+                hits = [index for index in map(block.find, (bytes([b]) for b in _WHITESPACE))
+                        if index != -1]
+                if hits:
+                    position += min(hits) + 1
+                    break
+                position += len(block)
+            boundary = min(position, size)
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+    if boundaries[-1] < size:
+        boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def count_shard(path: str, start: int, end: int,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Counter:
+    """Count the words in the byte range [start, end) of a file."""
+    return count_chunks(iter_text_chunks(path, start, end, chunk_size))
+
+
+def count_words_parallel(path: str, workers: Optional[int] = None,
+                         shards_per_worker: int = 4,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> Counter:
+    """
+    Count words in a file across several processes.
+
+    The file is split into whitespace-aligned shards, each shard is counted
+    in a ProcessPoolExecutor worker, and the partial Counters are merged.
+    The result is identical to count_words_in_file().
+
+    Args:
+        path: UTF-8 text file to count
+        workers: Number of worker processes (None means os.cpu_count())
+        shards_per_worker: Shards per worker, to even out uneven shards
+        chunk_size: Bytes per buffered read inside each worker
+
+    Returns:
+        Counter: word -> occurrences
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = shard_file(path, workers * shards_per_worker)
+    if workers == 1 or len(ranges) <= 1:
+        partials = [count_shard(path, start, end, chunk_size) for start, end in ranges]
+    else:
+        n = len(ranges)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(
+                count_shard, [path] * n, [start for start, _ in ranges],
+                [end for _, end in ranges], [chunk_size] * n,
+            ))
+    return reduce(merge_counts, partials, Counter())
+
+
+def merge_counts(total: Counter, part: Counter) -> Counter:
+    """Add a shard's counts into total and return total."""
+    # Counter.update with a mapping adds counts key by key
+    total.update(part)
+    return total
+
+
+def top_k(counts: Counter, k: int) -> List[Tuple[str, int]]:
+    """
+    The k most frequent words, most frequent first.
+
+    Uses a k-sized heap (O(n log k)) rather than sorting every word; ties
+    keep first-seen order, as Counter.most_common(k) does.
+    """
+    return heapq.nlargest(k, counts.items(), key=itemgetter(1))
+
+
+def write_sample_corpus(path: str, words: int, seed: int = 0, vocabulary: int = 50_000) -> None:
+    """Write a Zipf-like synthetic corpus, ten words per line."""
+    import random
+
+    rng = random.Random(seed)
+    lexicon = [f"word{i}" for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    with open(path, "w", encoding="utf-8") as f:
+        written = 0
+        while written < words:
+            batch = rng.choices(lexicon, weights, k=min(100_000, words - written))
+            # Some capitalized words, so lower-casing matters
+            batch[::7] = [word.capitalize() for word in batch[::7]]
+            f.write("\n".join(" ".join(batch[i:i + 10]) for i in range(0, len(batch), 10)))
+            f.write("\n")
+            written += len(batch)
+
+
+def check_word_counter():
+    """Check chunked and sharded counts against text.lower().split()."""
+    import tempfile
+
+    print("\nTesting streaming word counter:")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("The quick brown fox jumps over the lazy dog\n"
+                    "Ünïcödé wörds  and\ttabs\r\nand a verylongwordthatcrosseschunks "
+                    + "x" * 100 + " the end")
+        with open(path, encoding="utf-8", newline="") as f:
+            expected = Counter(f.read().lower().split())
+        ok = True
+        # Tiny chunks force cuts inside words and multi-byte characters
+        for chunk_size in (1, 3, 7, 64, DEFAULT_CHUNK_SIZE):
+            ok &= count_words_in_file(path, chunk_size=chunk_size) == expected
+        for shards in (1, 2, 5, 50):
+            partials = [count_shard(path, start, end, 5) for start, end in shard_file(path, shards)]
+            ok &= reduce(merge_counts, partials, Counter()) == expected
+        ok &= count_words_parallel(path, workers=2, shards_per_worker=3) == expected
+        print(f"Top 2: {top_k(expected, 2)} (Expected: [('the', 3), ('and', 2)])")
+        print(f"Every chunk size and shard count matches: {'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+
+def benchmark_word_counter(words: int = 20_000_000, worker_counts=(1, 2, 4)):
+    """Compare the original count_words() with streaming and parallel counting."""
+    import tempfile
+    import time
+    import tracemalloc
+
+    print(f"\n=== Word Counter Benchmark ({words:,} words, "
+          f"{os.cpu_count()} CPUs available) ===")
+
+    def count_words(text):
+        # The original loop from 03_dictionaries.py
+        frequency = {}
+        for word in text.lower().split():
+            frequency[word] = frequency.get(word, 0) + 1
+        return frequency
+
+    def read_all(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        write_sample_corpus(path, words)
+        print(f"Corpus: {os.path.getsize(path) / 1e6:.0f} MB")
+
+        candidates = {
+            "read + dict.get loop": lambda: count_words(read_all(path)),
+            "read + Counter(split)": lambda: Counter(read_all(path).lower().split()),
+            "streaming Counter.update": lambda: count_words_in_file(path),
+        }
+        print(f"{'variant':<26} {'seconds':>8} {'words/s':>12} {'peak MB':>8}")
+        expected = None
+        for name, run in candidates.items():
+            start = time.perf_counter()
+            result = run()
+            elapsed = time.perf_counter() - start
+            expected = expected or result
+            tracemalloc.start()
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            status = '✓' if dict(result) == dict(expected) else '✗'
+            print(f"{name:<26} {elapsed:>8.2f} {words / elapsed:>12,.0f} {peak / 1e6:>8.0f} {status}")
+
+        for workers in worker_counts:
+            start = time.perf_counter()
+            result = count_words_parallel(path, workers=workers)
+            elapsed = time.perf_counter() - start
+            status = '✓' if dict(result) == dict(expected) else '✗'
+            print(f"{f'parallel, {workers} workers':<26} {elapsed:>8.2f} {words / elapsed:>12,.0f} "
+                  f"{'':>8} {status}")
+
+        counts = count_words_in_file(path)
+        start = time.perf_counter()
+        top = top_k(counts, 10)
+        heap_ms = (time.perf_counter() - start) * 1e3
+        start = time.perf_counter()
+        sorted(counts.items(), key=itemgetter(1), reverse=True)[:10]
+        sort_ms = (time.perf_counter() - start) * 1e3
+        print(f"Top 10 of {len(counts):,} words: heap {heap_ms:.1f} ms, full sort {sort_ms:.1f} ms")
+        print(f"Most common: {top[:3]}")
+
+
+def main():
+    """Check and benchmark the streaming word counter."""
+    check_word_counter()
+    # Pass words=20_000_000 for the full-size run
+    benchmark_word_counter(words=2_000_000)
+
+
+if __name__ == "__main__":
+    main()
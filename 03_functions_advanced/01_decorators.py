@@ -4,77 +4,134 @@ Advanced Python Decorators Examples
 This module demonstrates various uses of decorators in Python.
 """
 
+import asyncio
 import functools
+import inspect
+import random
 import time
-from typing import Callable, Any
+from typing import Callable, Any, Optional, Tuple, Type
 
-def timer_decorator(func: Callable) -> Callable:
+import memoization
+import metrics
+
+def timer_decorator(func: Optional[Callable] = None, *,
+                    registry: Optional[metrics.MetricsRegistry] = None,
+                    sample_every: int = 1) -> Callable:
     """
     A decorator that measures the execution time of a function.
     
+    Timings are recorded with time.perf_counter_ns() into a metrics registry
+    (call counts and p50/p95/p99 latency histograms) instead of being printed
+    on every call. Use registry.to_text() or registry.to_json() to read them.
+    
     Args:
         func: The function to be decorated
+        registry: Registry to record into (defaults to metrics.default_registry)
+        sample_every: Time only one call in every sample_every calls
         
     Returns:
         Callable: The wrapped function
     """
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        print(f"{func.__name__} took {end_time - start_time:.4f} seconds to execute")
-        return result
-    return wrapper
+    registry = registry or metrics.default_registry
+    return registry.timer(func, sample_every=sample_every)
 
-def retry_decorator(max_attempts: int = 3, delay: float = 1.0) -> Callable:
+def retry_decorator(max_attempts: int = 3, delay: float = 1.0, *,
+                    backoff: float = 1.0,
+                    max_delay: Optional[float] = None,
+                    jitter: bool = False,
+                    max_total_time: Optional[float] = None,
+                    retry_on: Tuple[Type[BaseException], ...] = (Exception,)) -> Callable:
     """
     A decorator that retries a function if it fails.
     
+    Works on both regular functions and coroutine functions. For coroutines
+    the wait uses asyncio.sleep(), so other tasks keep running while a retry
+    is pending.
+    
     Args:
         max_attempts: Maximum number of retry attempts
-        delay: Delay between retries in seconds
+        delay: Delay before the first retry in seconds
+        backoff: Multiplier applied to the delay after each failure
+            (1.0 keeps a fixed delay, 2.0 doubles it each time)
+        max_delay: Upper bound on a single delay
+        jitter: Use "full jitter": sleep a random time between 0 and the
+            computed delay, so many clients do not retry in lockstep
+        max_total_time: Give up once another wait would exceed this many
+            seconds since the first attempt
+        retry_on: Exception types that trigger a retry; anything else is
+            raised immediately
         
     Returns:
         Callable: The decorator function
     """
+    def next_delay(attempt: int) -> float:
+        wait = delay * backoff ** (attempt - 1)
+        if max_delay is not None:
+            wait = min(wait, max_delay)
+        if jitter:
+            wait = random.uniform(0, wait)
+        return wait
+    
+    def should_give_up(attempts: int, wait: float, started: float) -> bool:
+        if attempts >= max_attempts:
+            return True
+        return (max_total_time is not None
+                and time.monotonic() - started + wait > max_total_time)
+    
     def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                attempts = 0
+                started = time.monotonic()
+                while True:
+                    try:
+                        return await func(*args, **kwargs)
+                    except retry_on as e:
+                        attempts += 1
+                        wait = next_delay(attempts)
+                        if should_give_up(attempts, wait, started):
+                            raise e
+                        print(f"Attempt {attempts} failed. Retrying in {wait:.2f} seconds...")
+                        await asyncio.sleep(wait)
+            return async_wrapper
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             attempts = 0
-            while attempts < max_attempts:
+            started = time.monotonic()
+            while True:
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
+                except retry_on as e:
                     attempts += 1
-                    if attempts == max_attempts:
+                    wait = next_delay(attempts)
+                    if should_give_up(attempts, wait, started):
                         raise e
-                    print(f"Attempt {attempts} failed. Retrying in {delay} seconds...")
-                    time.sleep(delay)
-            return None
+                    print(f"Attempt {attempts} failed. Retrying in {wait:.2f} seconds...")
+                    time.sleep(wait)
         return wrapper
     return decorator
 
-def memoize_decorator(func: Callable) -> Callable:
+def memoize_decorator(func: Optional[Callable] = None, *, maxsize: Optional[int] = None,
+                      ttl: Optional[float] = None, policy: str = "lru") -> Callable:
     """
     A decorator that caches function results based on arguments.
     
+    Can be used bare (@memoize_decorator) or with options
+    (@memoize_decorator(maxsize=128, policy="lfu")).
+    
     Args:
         func: The function to be decorated
+        maxsize: Maximum number of cached results (None means unbounded)
+        ttl: Seconds before a cached result expires (None means never)
+        policy: Eviction policy when full: "lru", "lfu" or "fifo"
         
     Returns:
-        Callable: The wrapped function with caching
+        Callable: The wrapped function with caching, exposing
+        cache_info() and cache_clear()
     """
-    cache = {}
-    
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        # Create a cache key from both args and kwargs
-        key = str(args) + str(sorted(kwargs.items()))
-        if key not in cache:
-            cache[key] = func(*args, **kwargs)
-        return cache[key]
-    return wrapper
+    return memoization.memoize(func, maxsize=maxsize, ttl=ttl, policy=policy)
 
 # Example usage of decorators
 @timer_decorator
@@ -85,11 +142,37 @@ def slow_function(n: int) -> list:
 @retry_decorator(max_attempts=3, delay=0.1)
 def unreliable_function(success_rate: float = 0.5) -> str:
     """A function that sometimes fails to demonstrate the retry decorator."""
-    import random
     if random.random() > success_rate:
         raise ValueError("Random failure!")
     return "Success!"
 
+@retry_decorator(max_attempts=4, delay=0.05, backoff=2.0, max_delay=1.0,
+                 retry_on=(ConnectionError,))
+async def flaky_fetch(failures: list) -> str:
+    """A coroutine that fails while the failures list is non-empty."""
+    await asyncio.sleep(0)
+    if failures:
+        failures.pop()
+        raise ConnectionError("Service unavailable")
+    return "Fetched!"
+
+async def check_async_retry() -> None:
+    """Check that other tasks keep running while a coroutine waits to retry."""
+    ticks = 0
+    
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+    
+    ticker_task = asyncio.create_task(ticker())
+    result = await flaky_fetch([1, 2])  # Fails twice, then succeeds
+    ticker_task.cancel()
+    print(f"Result: {result}")
+    print(f"Ticker ran {ticks} times during the retries")
+    print(f"{'✓ Correct!' if ticks > 0 else '✗ Event loop was blocked.'}")
+
 @memoize_decorator
 def fibonacci(n: int) -> int:
     """Calculate the nth Fibonacci number with memoization."""
@@ -101,8 +184,10 @@ def main():
     """Demonstrate the usage of decorators."""
     # Timer decorator example
     print("\nTesting timer decorator:")
-    result = slow_function(10000)
+    for _ in range(100):
+        result = slow_function(10000)
     print(f"Result length: {len(result)}")
+    print(metrics.default_registry.to_text())
     
     # Retry decorator example
     print("\nTesting retry decorator:")
@@ -112,6 +197,10 @@ def main():
     except ValueError as e:
         print(f"Final failure: {e}")
     
+    # Async retry example
+    print("\nTesting async retry decorator:")
+    asyncio.run(check_async_retry())
+    
     # Memoize decorator example
     print("\nTesting memoize decorator:")
     start_time = time.time()
@@ -124,6 +213,7 @@ def main():
     
     print(f"First call result: {result1}, took {time1:.4f} seconds")
     print(f"Second call result: {result2}, took {time2:.4f} seconds")
+    print(f"Cache info: {fibonacci.cache_info()}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -7,6 +7,8 @@ This module demonstrates the use of closures and function factories in Python.
 from typing import Callable, List, Any
 import math
 
+from filter_chain import AdaptiveFilterChain
+
 def create_multiplier(factor: float) -> Callable[[float], float]:
     """
     A function factory that creates a function to multiply by a specific factor.
@@ -108,16 +110,28 @@ def create_accumulator(initial_value: float = 0) -> tuple[
     
     return add, get_total, reset
 
-def create_filter_chain(*predicates: Callable[[Any], bool]) -> Callable[[Any], bool]:
+def create_filter_chain(*predicates: Callable[[Any], bool],
+                        adaptive: bool = False, **options: Any) -> Callable[[Any], bool]:
     """
     Creates a function that chains multiple filter predicates.
     
     Args:
         *predicates: Variable number of filter functions
+        adaptive: Measure each predicate's cost and rejection rate and
+            periodically run the cheapest, most selective ones first (see
+            filter_chain.py). Only for independent, side-effect free
+            predicates; the returned chain also has filter_many() and stats()
+        **options: Tuning for the adaptive chain (sample_every,
+            reorder_every, decay, chunk_size)
         
     Returns:
         A function that returns True only if all predicates return True
     """
+    if adaptive:
+        return AdaptiveFilterChain(predicates, **options)
+    if options:
+        raise TypeError(f"unexpected options without adaptive=True: {sorted(options)}")
+
     def combined_filter(x: Any) -> bool:
         """Apply all predicates to the input."""
         return all(predicate(x) for predicate in predicates)
@@ -174,6 +188,12 @@ def main():
     numbers = range(-5, 15)
     filtered_numbers = [n for n in numbers if combined_filter(n)]
     print(f"Filtered numbers: {filtered_numbers}")
+    
+    # Same chain, reordering itself by measured cost and selectivity
+    adaptive_filter = create_filter_chain(is_positive, is_even, is_less_than_10,
+                                          adaptive=True, sample_every=4, reorder_every=8)
+    print(f"Adaptive filter_many: {list(adaptive_filter.filter_many(numbers))}")
+    print(f"Learned order: {adaptive_filter.order}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,20 +4,32 @@ Functional Programming Concepts
 This module demonstrates functional programming concepts in Python.
 """
 
-from typing import Callable, List, Any, TypeVar, Iterable
+from typing import Callable, List, Any, TypeVar, Iterable, Optional, Tuple
 from functools import reduce, partial
 from operator import add, mul
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
 import itertools
+import os
+import time
+
+import batch_pipeline
+import currying
+import memoization
+import pipeline_compiler
 
 T = TypeVar('T')
 R = TypeVar('R')
 
-def compose(*functions: Callable[[Any], Any]) -> Callable[[Any], Any]:
+def compose(*functions: Callable[[Any], Any], compiled: bool = False) -> Callable[[Any], Any]:
     """
     Compose multiple functions from right to left.
     
     Args:
         *functions: Variable number of functions to compose
+        compiled: Generate one flat function instead of looping over the
+            stages on every call (see pipeline_compiler.py). Simple lambdas
+            are inlined, and the globals they use are bound at compile time.
         
     Returns:
         A function that is the composition of all input functions
@@ -25,6 +37,9 @@ def compose(*functions: Callable[[Any], Any]) -> Callable[[Any], Any]:
     Example:
         compose(f, g, h)(x) is equivalent to f(g(h(x)))
     """
+    if compiled:
+        return pipeline_compiler.compile_pipeline(tuple(reversed(functions)))
+
     def composed_function(x: Any) -> Any:
         result = x
         for f in reversed(functions):
@@ -32,12 +47,18 @@ def compose(*functions: Callable[[Any], Any]) -> Callable[[Any], Any]:
         return result
     return composed_function
 
-def pipe(*functions: Callable[[Any], Any]) -> Callable[[Any], Any]:
+def pipe(*functions: Callable[[Any], Any], compiled: bool = False,
+         batch_size: Optional[int] = None) -> Callable[[Any], Any]:
     """
     Pipe multiple functions from left to right.
     
     Args:
         *functions: Variable number of functions to pipe
+        compiled: Generate one flat function, as in compose()
+        batch_size: If given, return a pipeline that takes a whole iterable
+            or array and runs each stage over chunks of this many elements,
+            using NumPy for stages declared with batch_pipeline.vectorize()
+            (see batch_pipeline.py)
         
     Returns:
         A function that applies all functions in sequence
@@ -45,45 +66,44 @@ def pipe(*functions: Callable[[Any], Any]) -> Callable[[Any], Any]:
     Example:
         pipe(f, g, h)(x) is equivalent to h(g(f(x)))
     """
-    return compose(*reversed(functions))
+    if batch_size is not None:
+        return batch_pipeline.batch_pipe(*functions, chunk_size=batch_size)
+    return compose(*reversed(functions), compiled=compiled)
 
-def curry(func: Callable[..., R]) -> Callable[..., Any]:
+def curry(func: Callable[..., R], arity: Optional[int] = None) -> Callable[..., Any]:
     """
     Curry a function to allow partial application of arguments.
     
+    The signature is inspected once (see currying.py): parameters with
+    defaults are optional, keyword-only parameters are honoured, and each
+    partial application is a flat __slots__ object rather than a closure.
+    
     Args:
         func: Function to curry
+        arity: Positional arity for builtins without an inspectable signature
         
     Returns:
         Curried version of the function
     """
-    def curried(*args: Any, **kwargs: Any) -> Any:
-        if len(args) + len(kwargs) >= func.__code__.co_argcount:
-            return func(*args, **kwargs)
-        return lambda *more_args, **more_kwargs: curried(
-            *args, *more_args, **{**kwargs, **more_kwargs}
-        )
-    return curried
-
-def memoize(func: Callable[..., R]) -> Callable[..., R]:
+    return currying.curry(func, arity)
+
+def memoize(func: Optional[Callable[..., R]] = None, *,
+            maxsize: Optional[int] = None,
+            ttl: Optional[float] = None,
+            policy: str = "lru") -> Callable[..., R]:
     """
     Memoize a function to cache its results.
     
     Args:
         func: Function to memoize
+        maxsize: Maximum number of cached results (None means unbounded)
+        ttl: Seconds before a cached result expires (None means never)
+        policy: Eviction policy when full: "lru", "lfu" or "fifo"
         
     Returns:
         Memoized version of the function
     """
-    cache = {}
-    
-    def memoized(*args: Any, **kwargs: Any) -> Any:
-        key = str(args) + str(sorted(kwargs.items()))
-        if key not in cache:
-            cache[key] = func(*args, **kwargs)
-        return cache[key]
-    
-    return memoized
+    return memoization.memoize(func, maxsize=maxsize, ttl=ttl, policy=policy)
 
 @memoize
 def fibonacci(n: int) -> int:
@@ -92,23 +112,115 @@ def fibonacci(n: int) -> int:
         return n
     return fibonacci(n - 1) + fibonacci(n - 2)
 
+def _map_reduce_chunk(mapper: Callable[[T], R],
+                      reducer: Callable[[R, R], R],
+                      chunk: List[T]) -> Tuple[R, float]:
+    """Map and pre-reduce one chunk in a worker; also report how long it took."""
+    start = time.perf_counter()
+    partial_result = reduce(reducer, map(mapper, chunk))
+    return partial_result, time.perf_counter() - start
+
 def map_reduce(data: Iterable[T],
                mapper: Callable[[T], R],
                reducer: Callable[[R, R], R],
-               initial: R) -> R:
+               initial: R,
+               *,
+               workers: Optional[int] = None,
+               executor: Optional[Executor] = None,
+               associative: bool = False,
+               chunk_size: Optional[int] = None,
+               target_chunk_seconds: float = 0.05) -> R:
     """
     Implement a basic map-reduce operation.
     
+    With workers or executor set, the input is split into chunks that are
+    mapped and pre-reduced in worker processes, and the partial results are
+    folded together in input order. This needs the reducer to be associative
+    and the mapper/reducer to be picklable (module-level functions, not
+    lambdas). Without a fixed chunk_size, chunks grow or shrink until each
+    takes about target_chunk_seconds, so pickling overhead stays small.
+    Input is consumed lazily, so generators and other unbounded-size
+    iterables work too.
+    
     Args:
         data: Input data to process
         mapper: Function to map each element
         reducer: Function to reduce mapped elements
         initial: Initial value for reduction
+        workers: Number of worker processes for a parallel run
+        executor: Existing concurrent.futures executor to use instead
+        associative: Declare that reducer(a, reducer(b, c)) equals
+            reducer(reducer(a, b), c); required for a parallel run
+        chunk_size: Fixed number of items per chunk (adaptive if None)
+        target_chunk_seconds: Worker time per chunk that adaptive sizing aims for
         
     Returns:
         Result of the map-reduce operation
     """
-    return reduce(reducer, map(mapper, data), initial)
+    if workers is None and executor is None:
+        return reduce(reducer, map(mapper, data), initial)
+    if not associative:
+        raise ValueError("Parallel map_reduce needs associative=True: partial "
+                         "results are reduced separately and then combined")
+    
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    size = chunk_size or 64
+    result = initial
+    in_flight = deque()
+    iterator = iter(data)
+    
+    def collect_oldest() -> None:
+        nonlocal result, size
+        partial_result, elapsed = in_flight.popleft().result()
+        result = reducer(result, partial_result)
+        if chunk_size is None:
+            # Scale toward the target duration, but no more than 4x per step
+            ratio = target_chunk_seconds / max(elapsed, 1e-6)
+            size = max(1, min(int(size * min(max(ratio, 0.25), 4.0)), 1 << 20))
+    
+    try:
+        while True:
+            chunk = list(itertools.islice(iterator, size))
+            if not chunk:
+                break
+            in_flight.append(executor.submit(_map_reduce_chunk, mapper, reducer, chunk))
+            if len(in_flight) >= max_in_flight:
+                collect_oldest()
+        while in_flight:
+            collect_oldest()
+    finally:
+        if own_executor:
+            executor.shutdown()
+    return result
+
+def collatz_steps(n: int) -> int:
+    """Count Collatz steps from n down to 1 (a CPU-bound mapper for demos)."""
+    steps = 0
+    while n > 1:
+        n = n // 2 if n % 2 == 0 else 3 * n + 1
+        steps += 1
+    return steps
+
+def benchmark_map_reduce(n: int = 100_000, worker_counts=(1, 2, 4)):
+    """Compare serial and process-parallel map_reduce on a CPU-bound mapper."""
+    print(f"\nBenchmarking map_reduce ({n:,} items, {os.cpu_count()} CPUs available):")
+    start = time.perf_counter()
+    expected = map_reduce(range(1, n + 1), collatz_steps, add, 0)
+    serial_time = time.perf_counter() - start
+    print(f"  serial:    {serial_time:.2f}s")
+    
+    for workers in worker_counts:
+        start = time.perf_counter()
+        # A generator input: map_reduce never needs its length
+        result = map_reduce((i for i in range(1, n + 1)), collatz_steps, add, 0,
+                            workers=workers, associative=True)
+        elapsed = time.perf_counter() - start
+        status = "✓" if result == expected else "✗ mismatch"
+        print(f"  {workers} worker{'s' if workers > 1 else ' '}: {elapsed:.2f}s "
+              f"({serial_time / elapsed:.2f}x) {status}")
 
 def demonstrate_partial_application():
     """Demonstrate partial function application."""
@@ -131,10 +243,16 @@ def demonstrate_function_composition():
     # Create composed functions
     square_then_add_one = compose(add_one, square)
     add_one_then_square = compose(square, add_one)
+    # Same pipeline, generated as one flat function with the lambdas inlined
+    compiled_pipeline = pipe(add_one, square, double, compiled=True)
+    # Whole-list version, run stage by stage over chunks
+    batched_pipeline = pipe(add_one, square, double, batch_size=1024)
     
     return {
         'square_then_add_one': square_then_add_one(5),  # 26
-        'add_one_then_square': add_one_then_square(5)   # 36
+        'add_one_then_square': add_one_then_square(5),  # 36
+        'compiled_pipeline': compiled_pipeline(5),      # 72
+        'batched_pipeline': batched_pipeline(range(5))  # [2, 8, 18, 32, 50]
     }
 
 def demonstrate_currying():
@@ -163,6 +281,7 @@ def main():
         0                 # initial value
     )
     print(f"Sum of squares: {sum_of_squares}")
+    benchmark_map_reduce()
     
     # Demonstrate partial application
     print("\nDemonstrating partial application:")
@@ -174,6 +293,7 @@ def main():
     composition_results = demonstrate_function_composition()
     for name, value in composition_results.items():
         print(f"{name}: {value}")
+    pipeline_compiler.benchmark_pipelines(number=20_000)
     
     # Demonstrate currying
     print("\nDemonstrating currying:")
@@ -183,7 +303,6 @@ def main():
     # Demonstrate memoization with Fibonacci
     print("\nDemonstrating memoization:")
     n = 35
-    import time
     start = time.time()
     result = fibonacci(n)
     end = time.time()
@@ -196,6 +315,7 @@ def main():
     end = time.time()
     print(f"Fibonacci({n}) [cached] = {result}")
     print(f"Time taken: {end - start:.4f} seconds")
+    print(f"Cache info: {fibonacci.cache_info()}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Batched Pipelines
+This module backs pipe(..., batch_size=N) in 04_functional_concepts.py.
+Instead of pushing one element at a time through every stage, the input is
+cut into chunks and each stage runs over a whole chunk: as one NumPy
+operation when every stage declares a vectorized implementation, or as a
+map()/filter() pass over the chunk otherwise.
+"""
+
+import itertools
+import time
+from array import array
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; chunks are processed stage by stage
+    np = None
+
+# Integer chunks go through a vectorized map stage only while every value
+# is below this in magnitude, so a stage that multiplies two values (such
+# as square) stays within int64; larger chunks fall back to Python ints,
+# which do not wrap
+_SAFE_INT = 1 << 31
+
+
+def vectorize(vector_func: Callable[[Any], Any]) -> Callable[[Callable], Callable]:
+    """
+    Decorator that attaches a whole-array implementation to a map stage.
+
+    Args:
+        vector_func: Function applied to a NumPy array chunk, returning an
+            array of the same length
+
+    Returns:
+        Callable: Decorator returning the per-element function unchanged,
+        apart from a ``vectorized`` attribute
+
+    Example:
+        @vectorize(lambda a: a * a)
+        def square(x):
+            return x * x
+    """
+    def decorator(func: Callable) -> Callable:
+        func.vectorized = vector_func
+        return func
+    return decorator
+
+
+class keep_if:
+    """
+    Filter stage for a batched pipeline.
+
+    Per element, the stage keeps x when predicate(x) is true. When a
+    vectorized predicate is given, it receives a NumPy array chunk and
+    returns a boolean mask.
+
+    Example:
+        keep_if(lambda x: x >= 0, lambda a: a >= 0)
+    """
+
+    __slots__ = ("predicate", "vectorized")
+
+    def __init__(self, predicate: Callable[[Any], bool],
+                 vectorized: Optional[Callable[[Any], Any]] = None):
+        self.predicate = predicate
+        self.vectorized = vectorized
+
+    def __call__(self, x: Any) -> bool:
+        return self.predicate(x)
+
+
+class BatchPipeline:
+    """
+    Apply map stages and keep_if filter stages, left to right, chunk by chunk.
+
+    Calling the pipeline returns a list. chunks() yields NumPy arrays (on the
+    vectorized path) or lists instead, for callers that consume the output
+    incrementally. Integer chunks holding values of 2**31 or more in
+    magnitude are processed per element even on the vectorized path, so
+    the result never depends on int64 wrap-around.
+    """
+
+    def __init__(self, stages: Iterable[Callable], chunk_size: int = 65_536,
+                 dtype: Optional[str] = None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.stages = tuple(stages)
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+        self.vectorized = np is not None and all(
+            getattr(stage, "vectorized", None) is not None for stage in self.stages
+        )
+
+    def _split(self, data: Iterable) -> Iterator:
+        size = self.chunk_size
+        if isinstance(data, (list, tuple, array)) or (np is not None and isinstance(data, np.ndarray)):
+            # Slicing keeps the chunk type: array.array chunks stay typed, and
+            # NumPy can wrap them without copying
+            for start in range(0, len(data), size):
+                yield data[start:start + size]
+        else:
+            iterator = iter(data)
+            while True:
+                chunk = list(itertools.islice(iterator, size))
+                if not chunk:
+                    return
+                yield chunk
+
+    def _run_vectorized(self, chunk: Any) -> Any:
+        values = self._to_array(chunk)
+        if values is None:
+            return self._run_elementwise(chunk)
+        for stage in self.stages:
+            if isinstance(stage, keep_if):
+                values = values[stage.vectorized(values)]
+            else:
+                if values.dtype.kind in "iu" and values.size and not (
+                        -_SAFE_INT < values.min() and values.max() < _SAFE_INT):
+                    # The stage could wrap around silently; redo the whole
+                    # chunk with Python ints
+                    return self._run_elementwise(chunk)
+                values = stage.vectorized(values)
+        return values
+
+    def _to_array(self, chunk: Any) -> Any:
+        """Wrap chunk as a NumPy array, or return None if it has no fixed-width dtype."""
+        if isinstance(chunk, array):
+            values = np.frombuffer(chunk, dtype=chunk.typecode)
+            # Widen narrow typecodes ('b', 'h', 'i', 'f', ...) before any
+            # arithmetic, so 'i' values squared do not wrap at 32 bits;
+            # 8-byte chunks are wrapped as they are, without a copy
+            if self.dtype is not None:
+                wide = self.dtype
+            elif values.dtype.kind == "f":
+                wide = np.float64
+            elif values.dtype == np.uint64:
+                wide = np.uint64
+            else:
+                wide = np.int64
+            values = values.astype(wide, copy=False)
+        else:
+            try:
+                values = np.asarray(chunk, dtype=self.dtype)
+            except OverflowError:
+                return None
+        # Integers beyond 64 bits become an object array
+        return None if values.dtype.kind == "O" else values
+
+    def _run_elementwise(self, chunk: Any) -> List[Any]:
+        if np is not None and isinstance(chunk, np.ndarray):
+            # Python ints and floats, not NumPy scalars that wrap like arrays
+            chunk = chunk.tolist()
+        for stage in self.stages:
+            if isinstance(stage, keep_if):
+                chunk = list(filter(stage.predicate, chunk))
+            else:
+                chunk = list(map(stage, chunk))
+        return chunk
+
+    def chunks(self, data: Iterable) -> Iterator[Any]:
+        """Yield the processed output one chunk at a time."""
+        run = self._run_vectorized if self.vectorized else self._run_elementwise
+        for chunk in self._split(data):
+            yield run(chunk)
+
+    def __call__(self, data: Iterable) -> List[Any]:
+        result: List[Any] = []
+        for chunk in self.chunks(data):
+            result.extend(chunk if isinstance(chunk, list) else chunk.tolist())
+        return result
+
+
+def batch_pipe(*stages: Callable, chunk_size: int = 65_536,
+               dtype: Optional[str] = None) -> BatchPipeline:
+    """
+    Build a batched pipeline from map stages and keep_if filter stages.
+
+    Args:
+        *stages: Per-element functions, optionally decorated with
+            vectorize(), and keep_if filters
+        chunk_size: Number of input elements processed per chunk
+        dtype: NumPy dtype for chunks on the vectorized path (by default
+            inferred for lists and widened to 64 bits for array.array)
+
+    Returns:
+        BatchPipeline: Callable taking an iterable and returning a list
+    """
+    return BatchPipeline(stages, chunk_size, dtype)
+
+
+# The map/filter/square chain from exercise_1 in
+# 02_data_structures/exercises/05_functional_exercises.py
+@vectorize(lambda values: values * values)
+def square(x: int) -> int:
+    return x * x
+
+
+# exercise_1 expects [64, 16, 4] for [-4, -2, 0, 2, 4, 8, 16], so zero is dropped too
+positive = keep_if(lambda x: x > 0, lambda values: values > 0)
+at_most_100 = keep_if(lambda x: x <= 100, lambda values: values <= 100)
+
+
+def exercise_1_chain(numbers: Iterable[int], chunk_size: int = 65_536) -> List[int]:
+    """Keep positive numbers, square, drop squares above 100, sort descending."""
+    pipeline = batch_pipe(positive, square, at_most_100, chunk_size=chunk_size, dtype="int64")
+    return sorted(pipeline(numbers), reverse=True)
+
+
+def demonstrate_batch_pipeline():
+    """Demonstrate the exercise_1 chain and the per-element fallback."""
+    print("=== Batched Pipelines ===")
+    print(f"NumPy available: {np is not None}")
+    test_input = [-4, -2, 0, 2, 4, 8, 16]
+    result = exercise_1_chain(test_input)
+    print(f"exercise_1 chain on {test_input}: {result} (Expected: [64, 16, 4])")
+    print(f"{'✓ Correct!' if result == [64, 16, 4] else '✗ Not quite right.'}")
+
+    # 32-bit input whose squares only fit in 64 bits
+    wide = batch_pipe(square)(array("i", [70_000, -70_000]))
+    print(f"array('i') 70000 squared: {wide} (Expected: [4900000000, 4900000000])")
+    print(f"{'✓ Correct!' if wide == [4_900_000_000] * 2 else '✗ Not quite right.'}")
+
+    # Squares beyond int64 must not wrap (4e9 squared is 1.6e19)
+    big = [4_000_000_000, 5, -3]
+    results = [batch_pipe(square)(big), batch_pipe(square)(array("q", big)), exercise_1_chain(big)]
+    expected = [[16 * 10**18, 25, 9], [16 * 10**18, 25, 9], [25]]
+    print(f"Large values: {results} (Expected: {expected})")
+    print(f"{'✓ Correct!' if results == expected else '✗ Not quite right.'}")
+
+    # abs has no vectorized implementation, so this runs per element
+    mixed = batch_pipe(abs, square, chunk_size=3)
+    print(f"Vectorized: {mixed.vectorized}, result: {mixed([-3, -2, -1, 0, 1])}")
+
+
+def benchmark_batch_pipeline(n: int = 2_000_000, chunk_size: int = 65_536):
+    """Compare element-at-a-time and batched runs of the exercise_1 chain."""
+    import random
+
+    print(f"\n=== Batched Pipeline Benchmark ({n:,} elements) ===")
+    rng = random.Random(1)
+    numbers = array("q", (rng.randint(-20, 20) for _ in range(n)))
+
+    def element_at_a_time():
+        # Each element goes through every stage before the next one starts
+        keep, cap = positive.predicate, at_most_100.predicate
+        result = []
+        for x in numbers:
+            if keep(x):
+                x = square(x)
+                if cap(x):
+                    result.append(x)
+        return result
+
+    def map_filter_chain():
+        # The reference solution from exercise_1, minus the final sort
+        return list(filter(lambda x: x <= 100,
+                           map(lambda x: x ** 2, filter(lambda x: x > 0, numbers))))
+
+    # Same stages without vectorized implementations
+    elementwise = batch_pipe(keep_if(positive.predicate), lambda x: x * x,
+                             keep_if(at_most_100.predicate), chunk_size=chunk_size)
+    candidates = {
+        "element at a time": element_at_a_time,
+        "map/filter chain": map_filter_chain,
+        "batched, per element": lambda: elementwise(numbers),
+    }
+    if np is not None:
+        vectorized = batch_pipe(positive, square, at_most_100, chunk_size=chunk_size)
+        candidates["batched, vectorized"] = lambda: vectorized(numbers)
+    else:
+        print("(NumPy is not installed; skipping the vectorized run)")
+
+    expected = None
+    baseline = None
+    print(f"{'variant':<22} {'seconds':>8} {'elements/s':>14} {'speedup':>8}")
+    for name, run in candidates.items():
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        expected = expected if expected is not None else result
+        baseline = baseline or elapsed
+        status = '✓' if result == expected else '✗'
+        print(f"{name:<22} {elapsed:>8.3f} {n / elapsed:>14,.0f} {baseline / elapsed:>7.1f}x {status}")
+
+
+def main():
+    """Demonstrate and benchmark batched pipelines."""
+    demonstrate_batch_pipeline()
+    benchmark_batch_pipeline()
+
+
+if __name__ == "__main__":
+    main()
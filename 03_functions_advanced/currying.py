@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Signature-Compiled Currying
+This module backs curry() in 04_functional_concepts.py. The function's
+signature is inspected once, when it is curried; every partial application
+after that is a small __slots__ object holding the flattened arguments.
+"""
+
+import inspect
+import time
+from functools import partial, update_wrapper
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_POSITIONAL = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+
+class _CurrySpec:
+    """What a function needs before it can be called, worked out once."""
+
+    __slots__ = ("func", "arity", "positional", "keywords")
+
+    def __init__(self, func: Callable, arity: Optional[int] = None):
+        self.func = func
+        if arity is not None:
+            if arity < 0:
+                raise ValueError("arity must be non-negative")
+            # Explicit arity: count positional arguments only
+            self.arity, self.positional, self.keywords = arity, (), ()
+            return
+        try:
+            signature = inspect.signature(func)
+        except (TypeError, ValueError):
+            raise TypeError(
+                f"cannot inspect the signature of {func!r}; pass arity= explicitly"
+            ) from None
+        parameters = signature.parameters.values()
+        # Parameters with defaults are optional and never block the call
+        self.positional = tuple(p.name for p in parameters
+                                if p.kind in _POSITIONAL and p.default is p.empty)
+        self.keywords = tuple(p.name for p in parameters
+                              if p.kind is p.KEYWORD_ONLY and p.default is p.empty)
+        self.arity = len(self.positional)
+
+    def is_complete(self, args: Tuple, kwargs: Dict[str, Any]) -> bool:
+        """Return True when args and kwargs cover every required parameter."""
+        if not kwargs:
+            return len(args) >= self.arity and not self.keywords
+        count = len(args)
+        for index, name in enumerate(self.positional):
+            if index >= count and name not in kwargs:
+                return False
+        if not self.positional and count < self.arity:
+            return False
+        for name in self.keywords:
+            if name not in kwargs:
+                return False
+        return True
+
+
+class Curried:
+    """
+    A curried function, possibly with some arguments already applied.
+
+    Applying more arguments returns a new Curried holding one flat tuple of
+    positional arguments and one dict of keyword arguments, so chains like
+    f(1)(2)(3) never nest closures. Once every required parameter is
+    covered, the underlying function is called.
+    """
+
+    __slots__ = ("spec", "args", "kwargs")
+
+    def __init__(self, spec: _CurrySpec, args: Tuple = (), kwargs: Optional[Dict[str, Any]] = None):
+        self.spec = spec
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if self.args:
+            args = self.args + args
+        if self.kwargs:
+            kwargs = {**self.kwargs, **kwargs}
+        return _call_or_curry(self.spec, args, kwargs)
+
+    @property
+    def func(self) -> Callable:
+        """The function being curried."""
+        return self.spec.func
+
+    def __repr__(self) -> str:
+        applied = [repr(arg) for arg in self.args]
+        applied += [f"{name}={value!r}" for name, value in (self.kwargs or {}).items()]
+        name = getattr(self.spec.func, "__qualname__", repr(self.spec.func))
+        return f"curry({name})({', '.join(applied)})"
+
+
+_MISSING = object()
+
+
+def _compile_entry(spec: _CurrySpec) -> Callable[..., Any]:
+    """
+    Generate the first call of a curried function for its exact arity.
+
+    For a two-argument function the generated code is:
+
+        def curried(_0=_MISSING, _1=_MISSING, /, *rest, **kwargs):
+            if _1 is not _MISSING and not kwargs and not rest:
+                return func(_0, _1)
+            if _0 is _MISSING:
+                args = rest
+            elif _1 is _MISSING:
+                args = (_0,)
+            else:
+                args = (_0, _1) + rest
+            return call_or_curry(spec, args, kwargs)
+
+    so a fully applied call does no tuple or dict juggling at all.
+    """
+    names = [f"_{index}" for index in range(spec.arity)]
+    namespace = {"_MISSING": _MISSING, "func": spec.func,
+                 "spec": spec, "call_or_curry": _call_or_curry}
+    if not names:
+        lines = ["def curried(*rest, **kwargs):"]
+        if not spec.keywords:
+            lines += ["    if not kwargs and not rest:", "        return func()"]
+        lines.append("    return call_or_curry(spec, rest, kwargs)")
+    else:
+        parameters = ", ".join(f"{name}=_MISSING" for name in names)
+        lines = [f"def curried({parameters}, /, *rest, **kwargs):"]
+        if not spec.keywords:
+            lines += [f"    if {names[-1]} is not _MISSING and not kwargs and not rest:",
+                      f"        return func({', '.join(names)})"]
+        # Positional arguments fill the parameters from the left, so the
+        # first missing one tells how many were passed
+        for index, name in enumerate(names):
+            keyword = "if" if index == 0 else "elif"
+            applied = f"({', '.join(names[:index])},)" if index else "rest"
+            lines += [f"    {keyword} {name} is _MISSING:", f"        args = {applied}"]
+        lines += ["    else:", f"        args = ({', '.join(names)},) + rest",
+                  "    return call_or_curry(spec, args, kwargs)"]
+    exec("\n".join(lines), namespace)
+    return namespace["curried"]
+
+
+def _call_or_curry(spec: _CurrySpec, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+    """Call the function if args and kwargs complete it, otherwise curry further."""
+    if kwargs:
+        if spec.is_complete(args, kwargs):
+            return spec.func(*args, **kwargs)
+    elif len(args) >= spec.arity and not spec.keywords:
+        return spec.func(*args)
+    return Curried(spec, args, kwargs or None)
+
+
+def curry(func: Callable[..., Any], arity: Optional[int] = None) -> Callable[..., Any]:
+    """
+    Curry a function, inspecting its signature once.
+
+    Parameters with default values, *args and **kwargs are optional: the
+    function is called as soon as every parameter without a default has
+    been supplied, positionally or by keyword.
+
+    Args:
+        func: Function to curry
+        arity: Number of positional arguments to wait for, for callables
+            whose signature cannot be inspected (some builtins)
+
+    Returns:
+        Callable: Function generated for func's arity; calling it with too
+        few arguments returns a Curried holding what has been applied
+    """
+    spec = _CurrySpec(func, arity)
+    curried = _compile_entry(spec)
+    try:
+        update_wrapper(curried, func)
+    except AttributeError:
+        pass
+    curried.spec = spec
+    return curried
+
+
+def closure_curry(func: Callable[..., Any]) -> Callable[..., Any]:
+    """The original closure-based curry, kept for benchmarking."""
+    def curried(*args: Any, **kwargs: Any) -> Any:
+        if len(args) + len(kwargs) >= func.__code__.co_argcount:
+            return func(*args, **kwargs)
+        return lambda *more_args, **more_kwargs: curried(
+            *args, *more_args, **{**kwargs, **more_kwargs}
+        )
+    return curried
+
+
+def demonstrate_currying():
+    """Demonstrate defaults, keyword-only parameters and builtins."""
+    print("=== Signature-Compiled Curry ===")
+
+    def greet(greeting, name, punctuation="!", *, loud=False):
+        message = f"{greeting}, {name}{punctuation}"
+        return message.upper() if loud else message
+
+    curried_greet = curry(greet)
+    hello = curried_greet("Hello")
+    print(f"{hello!r} -> {hello('Ada')!r}")
+    print(f"Keyword step: {curried_greet(name='Ada')('Hi', loud=True)!r}")
+
+    def scale(value, *, factor):
+        return value * factor
+
+    doubled = curry(scale)(factor=2)
+    print(f"Keyword-only: {doubled!r} -> {doubled(21)}")
+
+    # divmod has an inspectable signature; max does not, so it needs arity
+    print(f"Builtin divmod: {curry(divmod)(17)(5)}")
+    print(f"Builtin max with arity=3: {curry(max, arity=3)(4)(9)(2)}")
+    try:
+        curry(max)
+    except TypeError as e:
+        print(f"Without arity: {e}")
+
+
+def benchmark_curry(calls: int = 1_000_000):
+    """Measure the cost of full and stepwise application."""
+    print(f"\n=== Curry Overhead Benchmark ({calls:,} calls, ns/call) ===")
+
+    def volume(length, width, height):
+        return length * width * height
+
+    def run(call: Callable[[int], Any]) -> float:
+        start = time.perf_counter_ns()
+        for i in range(calls):
+            call(i)
+        return (time.perf_counter_ns() - start) / calls
+
+    new, old, wrapped = curry(volume), closure_curry(volume), partial(volume)
+    rows = {
+        "direct call": (lambda i: volume(i, 2, 3), None),
+        "functools.partial": (lambda i: wrapped(i, 2, 3),
+                              lambda i: partial(partial(volume, i), 2)(3)),
+        "closure curry": (lambda i: old(i, 2, 3), lambda i: old(i)(2)(3)),
+        "compiled curry": (lambda i: new(i, 2, 3), lambda i: new(i)(2)(3)),
+    }
+    baseline = run(rows["direct call"][0])
+    print(f"{'variant':<20} {'f(a, b, c)':>11} {'f(a)(b)(c)':>11}")
+    for name, (full, stepwise) in rows.items():
+        full_ns = baseline if stepwise is None else run(full)
+        stepwise_ns = f"{run(stepwise):>11.0f}" if stepwise else f"{'-':>11}"
+        print(f"{name:<20} {full_ns:>11.0f} {stepwise_ns}")
+
+
+def main():
+    """Demonstrate and benchmark the curry implementation."""
+    demonstrate_currying()
+    benchmark_curry()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Memoization Engine
+This module provides the caching machinery shared by the memoizing decorators
+in 01_decorators.py and 04_functional_concepts.py.
+"""
+
+import functools
+import sys
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Any, Callable, Dict, Hashable, Iterable, NamedTuple, Optional, Tuple
+
+# Separates positional from keyword arguments inside a cache key
+_KWD_MARK = (object(),)
+
+# Types whose values can be used directly as a key for a single argument.
+# Restricting this to exact int/str avoids f((1, 2)) colliding with f(1, 2).
+_FAST_TYPES = {int, str}
+
+_MISSING = object()
+
+
+def make_key(args: Tuple, kwargs: Dict[str, Any], typed: bool = False) -> Hashable:
+    """
+    Build a cache key directly from the call arguments.
+
+    Args:
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+        typed: If True, arguments of different types are cached separately
+            (so f(1) and f(1.0) get distinct entries)
+
+    Returns:
+        A hashable key when all arguments are hashable
+    """
+    if not kwargs:
+        if not typed and len(args) == 1 and type(args[0]) in _FAST_TYPES:
+            return args[0]
+        key = args
+    else:
+        key = args + _KWD_MARK + tuple(sorted(kwargs.items()))
+    if typed:
+        key += tuple(type(v) for v in args)
+        if kwargs:
+            key += tuple(type(v) for _, v in sorted(kwargs.items()))
+    return key
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    Recursively convert common unhashable containers into hashable tuples.
+
+    Each container is tagged with its type so that, for example, a list and
+    a tuple holding the same items produce different keys.
+    """
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(freeze(v) for v in value))
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((freeze(k), freeze(v)) for k, v in value.items())))
+    if isinstance(value, (set, frozenset)):
+        return (type(value).__name__, frozenset(freeze(v) for v in value))
+    hash(value)  # Raise TypeError for anything we do not know how to freeze
+    return value
+
+
+def freeze_key(args: Tuple, kwargs: Dict[str, Any]) -> Hashable:
+    """Default key function for calls with unhashable arguments."""
+    return (_KWD_MARK, freeze(args), freeze(kwargs))
+
+
+class CacheInfo(NamedTuple):
+    """Snapshot of a memoized function's cache."""
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+    bytes: int
+
+
+class _DictStore:
+    """Unbounded store used when only a TTL is configured."""
+
+    __slots__ = ("data", "evictions")
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.data: Dict[Hashable, Any] = {}
+        self.evictions = 0
+
+    def lookup(self, key: Hashable) -> Any:
+        return self.data.get(key, _MISSING)
+
+    peek = lookup
+
+    def insert(self, key: Hashable, entry: Any) -> None:
+        self.data[key] = entry
+
+    def discard(self, key: Hashable) -> None:
+        self.data.pop(key, None)
+
+    def items(self):
+        return self.data.items()
+
+    def clear(self) -> None:
+        self.data.clear()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+class _FIFOStore(_DictStore):
+    """Evicts the oldest inserted entry, regardless of how often it is read."""
+
+    __slots__ = ("maxsize",)
+
+    def __init__(self, maxsize: Optional[int] = None):
+        super().__init__()
+        self.data = OrderedDict()
+        self.maxsize = maxsize
+
+    def insert(self, key: Hashable, entry: Any) -> None:
+        data = self.data
+        data[key] = entry
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+            self.evictions += 1
+
+
+class _LRUStore(_FIFOStore):
+    """Evicts the least recently read or written entry."""
+
+    __slots__ = ()
+
+    def lookup(self, key: Hashable) -> Any:
+        data = self.data
+        entry = data.get(key, _MISSING)
+        if entry is not _MISSING:
+            data.move_to_end(key)
+        return entry
+
+    def peek(self, key: Hashable) -> Any:
+        return self.data.get(key, _MISSING)
+
+
+class _LFUStore(_DictStore):
+    """
+    Evicts the least frequently used entry in O(1).
+
+    Keys are grouped into buckets by use count; each bucket is insertion
+    ordered, so ties are broken by evicting the least recently used key.
+    """
+
+    __slots__ = ("maxsize", "buckets", "min_freq")
+
+    def __init__(self, maxsize: Optional[int] = None):
+        super().__init__()
+        self.maxsize = maxsize
+        self.buckets: Dict[int, OrderedDict] = defaultdict(OrderedDict)
+        self.min_freq = 0
+
+    def lookup(self, key: Hashable) -> Any:
+        node = self.data.get(key)
+        if node is None:
+            return _MISSING
+        freq = node[1]
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
+        node[1] = freq + 1
+        self.buckets[freq + 1][key] = None
+        return node[0]
+
+    def peek(self, key: Hashable) -> Any:
+        node = self.data.get(key)
+        return _MISSING if node is None else node[0]
+
+    def insert(self, key: Hashable, entry: Any) -> None:
+        data = self.data
+        if key in data:
+            data[key][0] = entry
+            return
+        if len(data) >= self.maxsize:
+            if self.min_freq not in self.buckets:
+                self.min_freq = min(self.buckets)
+            bucket = self.buckets[self.min_freq]
+            oldest, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.min_freq]
+            del data[oldest]
+            self.evictions += 1
+        data[key] = [entry, 1]
+        self.buckets[1][key] = None
+        self.min_freq = 1
+
+    def discard(self, key: Hashable) -> None:
+        node = self.data.pop(key, None)
+        if node is not None:
+            bucket = self.buckets[node[1]]
+            del bucket[key]
+            if not bucket:
+                del self.buckets[node[1]]
+
+    def items(self):
+        return ((key, node[0]) for key, node in self.data.items())
+
+    def clear(self) -> None:
+        self.data.clear()
+        self.buckets.clear()
+        self.min_freq = 0
+
+
+_POLICIES = {"lru": _LRUStore, "lfu": _LFUStore, "fifo": _FIFOStore}
+
+
+def _approximate_bytes(container: Any, items: Iterable[Tuple[Any, Any]]) -> int:
+    """Shallow size of the container plus every key and value it holds."""
+    getsizeof = sys.getsizeof
+    return getsizeof(container) + sum(getsizeof(k) + getsizeof(v) for k, v in items)
+
+
+def memoize(func: Optional[Callable] = None, *,
+            maxsize: Optional[int] = None,
+            ttl: Optional[float] = None,
+            policy: str = "lru",
+            typed: bool = False,
+            key_func: Callable[[Tuple, Dict[str, Any]], Hashable] = freeze_key) -> Callable:
+    """
+    Cache a function's results keyed on its arguments.
+
+    Can be used bare (``@memoize``) or with options
+    (``@memoize(maxsize=1024, policy="lfu")``).
+
+    Args:
+        func: Function to memoize
+        maxsize: Maximum number of cached results (None means unbounded,
+            0 disables caching)
+        ttl: Seconds after which a cached result expires (None means never)
+        policy: Eviction policy once maxsize is reached: "lru", "lfu" or "fifo"
+        typed: Cache arguments of different types separately
+        key_func: Builds a key from (args, kwargs) when the arguments are not
+            hashable. If it raises TypeError the call runs uncached.
+
+    Returns:
+        The memoized function, with ``cache_info()`` and ``cache_clear()``
+        attached.
+    """
+    if func is None:
+        return functools.partial(memoize, maxsize=maxsize, ttl=ttl, policy=policy,
+                                 typed=typed, key_func=key_func)
+    if policy not in _POLICIES:
+        raise ValueError(f"Unknown eviction policy {policy!r}; "
+                         f"expected one of {sorted(_POLICIES)}")
+    if maxsize is not None and maxsize < 0:
+        raise ValueError("maxsize must be None or a non-negative integer")
+
+    hits = misses = 0
+    fast_types = _FAST_TYPES
+    # TTL is fixed, so deadlines are queued in increasing order and
+    # expired entries can be purged from the front in O(1) amortized;
+    # entries for keys evicted by maxsize are compacted away in bulk
+    deadlines: deque = deque()
+
+    def build_key(args, kwargs):
+        if not kwargs and not typed:
+            if len(args) == 1 and type(args[0]) in fast_types:
+                return args[0]
+            return args
+        return make_key(args, kwargs, typed)
+
+    if maxsize == 0:
+        store = _DictStore()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal misses
+            misses += 1
+            return func(*args, **kwargs)
+
+    elif maxsize is None and ttl is None:
+        store = _DictStore()
+        cache = store.data
+        cache_get = cache.get
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal hits, misses
+            # Fast path: skip make_key for plain positional calls
+            if not kwargs and not typed:
+                if len(args) == 1 and type(args[0]) in fast_types:
+                    key = args[0]
+                else:
+                    key = args
+            else:
+                key = make_key(args, kwargs, typed)
+
+            try:
+                result = cache_get(key, _MISSING)
+            except TypeError:
+                try:
+                    key = key_func(args, kwargs)
+                    result = cache_get(key, _MISSING)
+                except TypeError:
+                    misses += 1
+                    return func(*args, **kwargs)
+
+            if result is _MISSING:
+                misses += 1
+                result = func(*args, **kwargs)
+                cache[key] = result
+            else:
+                hits += 1
+            return result
+
+    else:
+        store = (_POLICIES[policy] if maxsize is not None else _DictStore)(maxsize)
+        lookup, insert, discard, peek = store.lookup, store.insert, store.discard, store.peek
+        clock = time.monotonic
+
+        def purge_expired(now: float) -> None:
+            while deadlines and deadlines[0][0] <= now:
+                deadline, key = deadlines.popleft()
+                entry = peek(key)
+                if entry is not _MISSING and entry[1] == deadline:
+                    discard(key)
+
+        def compact_deadlines() -> None:
+            # Keep only the deadlines of entries still in the store; runs
+            # once stale entries outnumber live ones, so O(1) amortized
+            live = [(deadline, key) for deadline, key in deadlines
+                    if (entry := peek(key)) is not _MISSING and entry[1] == deadline]
+            deadlines.clear()
+            deadlines.extend(live)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal hits, misses
+            key = build_key(args, kwargs)
+            try:
+                entry = lookup(key)
+            except TypeError:
+                try:
+                    key = key_func(args, kwargs)
+                    entry = lookup(key)
+                except TypeError:
+                    misses += 1
+                    return func(*args, **kwargs)
+
+            if entry is not _MISSING:
+                if ttl is None:
+                    hits += 1
+                    return entry
+                if clock() < entry[1]:
+                    hits += 1
+                    return entry[0]
+                discard(key)
+
+            misses += 1
+            result = func(*args, **kwargs)
+            if ttl is None:
+                insert(key, result)
+            else:
+                now = clock()
+                purge_expired(now)
+                deadline = now + ttl
+                insert(key, (result, deadline))
+                deadlines.append((deadline, key))
+                if len(deadlines) > 2 * len(store) + 16:
+                    compact_deadlines()
+            return result
+
+    def cache_info() -> CacheInfo:
+        """Report hits, misses, maxsize, current size and approximate bytes."""
+        # Deadline keys are the stored keys, so only the tuples and times add up
+        deadline_bytes = sys.getsizeof(deadlines) + sum(
+            sys.getsizeof(pair) + sys.getsizeof(pair[0]) for pair in deadlines)
+        return CacheInfo(hits, misses, maxsize, len(store),
+                         _approximate_bytes(store.data, store.items()) + deadline_bytes)
+
+    def cache_clear() -> None:
+        """Drop every cached result and reset the statistics."""
+        nonlocal hits, misses
+        store.clear()
+        deadlines.clear()
+        hits = misses = 0
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+def _string_key_memoize(func: Callable) -> Callable:
+    """The original string-key memoization, kept for benchmarking."""
+    cache = {}
+
+    def memoized(*args, **kwargs):
+        key = str(args) + str(sorted(kwargs.items()))
+        if key not in cache:
+            cache[key] = func(*args, **kwargs)
+        return cache[key]
+
+    return memoized
+
+
+def demonstrate_memoization():
+    """Demonstrate key handling for hashable and unhashable arguments."""
+    print("=== Memoization Engine ===")
+
+    calls = []
+
+    @memoize
+    def describe(value):
+        calls.append(value)
+        return f"{type(value).__name__}: {value!r}"
+
+    print(describe(1))
+    print(describe(1))                 # cache hit
+    print(describe([1, 2]))            # unhashable, goes through freeze_key
+    print(describe((1, 2)))            # distinct from the list above
+    print(f"Underlying calls: {len(calls)} (Expected: 3)")
+
+    # Distinct arguments with equal reprs no longer share a cache entry
+    class Token:
+        def __init__(self, name):
+            self.name = name
+
+        def __repr__(self):
+            return "Token"
+
+    string_keyed = _string_key_memoize(lambda token: token.name)
+    engine_keyed = memoize(lambda token: token.name)
+    first, second = Token("first"), Token("second")
+    print(f"String keys:  {string_keyed(first)}, {string_keyed(second)}")
+    print(f"Engine keys:  {engine_keyed(first)}, {engine_keyed(second)}")
+
+
+def demonstrate_bounded_memoization():
+    """Demonstrate maxsize, eviction policies, TTL and cache introspection."""
+    print("\n=== Bounded Memoization ===")
+
+    for policy in ("lru", "lfu", "fifo"):
+        @memoize(maxsize=2, policy=policy)
+        def square(x):
+            return x * x
+
+        for x in (1, 2, 1, 1):   # reuse 1 so LRU/LFU prefer to keep it
+            square(x)
+        square(3)                # forces an eviction
+        square(1)                # hit for LRU/LFU, miss for FIFO
+        print(f"{policy.upper():>4}: {square.cache_info()}")
+
+    @memoize(ttl=0.05)
+    def stamp(x):
+        return time.monotonic()
+
+    first = stamp("k")
+    time.sleep(0.06)
+    print(f"TTL expired and recomputed: {stamp('k') != first}")
+    stamp.cache_clear()
+    print(f"After cache_clear: {stamp.cache_info()}")
+
+    @memoize(maxsize=10, ttl=3600)
+    def bounded(x):
+        return x
+
+    for x in range(200_000):
+        bounded(x)
+    info = bounded.cache_info()
+    print(f"maxsize=10, ttl=3600 after 200,000 distinct calls: {info}")
+    print(f"Memory stays bounded: {'✓ Correct!' if info.bytes < 10_000 else '✗ Not quite right.'}")
+
+
+def benchmark_memoization(number: int = 200_000):
+    """Compare cache-hit cost of string keys against tuple keys."""
+    from timeit import timeit
+
+    print("\n=== Memoization Key Benchmark (cache hits) ===")
+
+    def identity(*args, **kwargs):
+        return args
+
+    big = tuple(range(1_000))
+    cases = {
+        "single int": ((42,), {}),
+        "three args": ((1, "two", 3.0), {}),
+        "args + kwargs": ((1, 2), {"scale": 3, "offset": 4}),
+        "1k-item tuple": ((big,), {}),
+    }
+
+    print(f"{'case':<15} {'string ns':>10} {'engine ns':>10} {'speedup':>8}")
+    for name, (args, kwargs) in cases.items():
+        old = _string_key_memoize(identity)
+        new = memoize(identity)
+        old(*args, **kwargs)
+        new(*args, **kwargs)
+        n = number // 100 if name == "1k-item tuple" else number
+        old_time = timeit(lambda: old(*args, **kwargs), number=n) / n
+        new_time = timeit(lambda: new(*args, **kwargs), number=n) / n
+        print(f"{name:<15} {old_time * 1e9:>10.0f} {new_time * 1e9:>10.0f} "
+              f"{old_time / new_time:>7.1f}x")
+
+
+def main():
+    """Demonstrate and benchmark the memoization engine."""
+    demonstrate_memoization()
+    demonstrate_bounded_memoization()
+    benchmark_memoization()
+
+
+if __name__ == "__main__":
+    main()
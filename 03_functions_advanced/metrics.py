@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Timing Metrics Registry
+This module collects per-function call counts and latency histograms for
+timer_decorator in 01_decorators.py, instead of printing on every call.
+"""
+
+import functools
+import json
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, Optional
+
+# Each power of two is split into 2**SUB_BUCKET_BITS linear sub-buckets, so a
+# recorded latency is off by at most 1 / 2**SUB_BUCKET_BITS (12.5%).
+SUB_BUCKET_BITS = 3
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_LINEAR_LIMIT = _SUB_BUCKETS * 2
+_MAX_SHIFT = 48  # Covers latencies up to about 2**52 ns (52 days)
+_BUCKET_COUNT = _LINEAR_LIMIT + _MAX_SHIFT * _SUB_BUCKETS
+
+
+def _bucket_index(value: int) -> int:
+    """Map a non-negative nanosecond value to its histogram bucket."""
+    if value < _LINEAR_LIMIT:
+        return value if value > 0 else 0
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    if shift > _MAX_SHIFT:
+        return _BUCKET_COUNT - 1
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def _bucket_bounds(index: int) -> tuple:
+    """Return the (lowest, highest) value that falls into a bucket."""
+    if index < _LINEAR_LIMIT:
+        return index, index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = index - (shift << SUB_BUCKET_BITS)
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Fixed-size HDR-style histogram of nanosecond latencies.
+
+    Recording is a bucket index calculation and one array increment; memory
+    is a fixed array of counters no matter how many values are recorded.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * _BUCKET_COUNT))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """Record one latency in nanoseconds."""
+        self.counts[_bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p: float) -> int:
+        """Return an upper bound for the p-th percentile (0-100), in nanoseconds."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(_bucket_bounds(index)[1], self.max)
+        return self.max
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's counts into this one."""
+        counts = self.counts
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+
+class FunctionMetrics:
+    """Call count and latency histogram for one instrumented function."""
+
+    __slots__ = ("name", "sample_every", "sampled_calls", "histogram", "_pending")
+
+    def __init__(self, name: str, sample_every: int = 1):
+        self.name = name
+        self.sample_every = sample_every
+        self.sampled_calls = 0
+        self.histogram = LatencyHistogram()
+        # Calls since the last sample, reported by the wrapper's closure
+        self._pending: Callable[[], int] = lambda: 0
+
+    @property
+    def calls(self) -> int:
+        """Total number of calls, sampled or not."""
+        return self.sampled_calls * self.sample_every + self._pending()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the metrics as a plain dictionary (latencies in nanoseconds)."""
+        histogram = self.histogram
+        return {
+            "calls": self.calls,
+            "sampled": histogram.count,
+            "sample_every": self.sample_every,
+            "mean_ns": histogram.total // histogram.count if histogram.count else 0,
+            "min_ns": histogram.min or 0,
+            "p50_ns": histogram.percentile(50),
+            "p95_ns": histogram.percentile(95),
+            "p99_ns": histogram.percentile(99),
+            "max_ns": histogram.max,
+        }
+
+
+class MetricsRegistry:
+    """
+    Named collection of FunctionMetrics with JSON and text export.
+
+    Example:
+        registry = MetricsRegistry()
+
+        @registry.timer(sample_every=16)
+        def handler(request):
+            ...
+
+        print(registry.to_text())
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, FunctionMetrics] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, sample_every: int = 1) -> FunctionMetrics:
+        """Return the metrics for name, creating them if needed."""
+        with self._lock:
+            metrics = self._metrics.get(name)
+            if metrics is None:
+                metrics = self._metrics[name] = FunctionMetrics(name, sample_every)
+            return metrics
+
+    def _register(self, name: str, sample_every: int) -> FunctionMetrics:
+        """
+        Create metrics for one wrapper under name, or under name#2, name#3,
+        ... if name is taken. The call count relies on a single wrapper's
+        countdown, so two wrappers never share a FunctionMetrics.
+        """
+        with self._lock:
+            unique, suffix = name, 1
+            while unique in self._metrics:
+                suffix += 1
+                unique = f"{name}#{suffix}"
+            metrics = self._metrics[unique] = FunctionMetrics(unique, sample_every)
+            return metrics
+
+    def timer(self, func: Optional[Callable] = None, *, name: Optional[str] = None,
+              sample_every: int = 1) -> Callable:
+        """
+        Decorator that records call counts and latencies into this registry.
+
+        Args:
+            func: The function to be decorated
+            name: Metric name (defaults to the function's qualified name);
+                a name already in use gets a "#2", "#3", ... suffix
+            sample_every: Time only one call in every sample_every calls;
+                the others only pay for a counter decrement
+
+        Returns:
+            Callable: The wrapped function
+        """
+        if func is None:
+            return functools.partial(self.timer, name=name, sample_every=sample_every)
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+
+        metrics = self._register(name or f"{func.__module__}.{func.__qualname__}", sample_every)
+        record = metrics.histogram.record
+        clock = time.perf_counter_ns
+        countdown = sample_every
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal countdown
+            countdown -= 1
+            # > 0 rather than truthiness: racing threads can skip past zero
+            if countdown > 0:
+                return func(*args, **kwargs)
+            countdown = sample_every
+            metrics.sampled_calls += 1
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(clock() - start)
+
+        metrics._pending = lambda: sample_every - countdown
+        wrapper.metrics = metrics
+        return wrapper
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return every function's metrics as plain dictionaries."""
+        with self._lock:
+            items = list(self._metrics.items())
+        return {name: metrics.snapshot() for name, metrics in items}
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Export a snapshot as a JSON string."""
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_text(self) -> str:
+        """Export a snapshot as an aligned text table (latencies in microseconds)."""
+        lines = [f"{'function':<40} {'calls':>10} {'p50 us':>10} {'p95 us':>10} "
+                 f"{'p99 us':>10} {'max us':>10}"]
+        for name, data in self.snapshot().items():
+            lines.append(
+                f"{name:<40} {data['calls']:>10} {data['p50_ns'] / 1e3:>10.1f} "
+                f"{data['p95_ns'] / 1e3:>10.1f} {data['p99_ns'] / 1e3:>10.1f} "
+                f"{data['max_ns'] / 1e3:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Forget every registered metric."""
+        with self._lock:
+            self._metrics.clear()
+
+
+default_registry = MetricsRegistry()
+
+
+def demonstrate_metrics():
+    """Demonstrate recording latencies and exporting snapshots."""
+    print("=== Timing Metrics Registry ===")
+    registry = MetricsRegistry()
+
+    @registry.timer
+    def build_squares(n: int) -> list:
+        return [i ** 2 for i in range(n)]
+
+    @registry.timer(name="sorted_sample", sample_every=10)
+    def sort_sample(n: int) -> list:
+        return sorted(range(n, 0, -1))
+
+    for n in range(1, 2_000):
+        build_squares(n)
+        sort_sample(n)
+
+    print(registry.to_text())
+    print(registry.to_json(indent=2))
+
+    # Two wrapped functions with the same qualified name keep separate counts
+    twins = []
+    for factor in (2, 3):
+        @registry.timer(sample_every=11)
+        def scale(x: int) -> int:
+            return x * factor
+        twins.append(scale)
+    for twin in twins:
+        for i in range(100):
+            twin(i)
+    calls = [twin.metrics.calls for twin in twins]
+    print(f"Same-named functions: {[twin.metrics.name.rsplit('.', 1)[-1] for twin in twins]}, "
+          f"calls {calls} (Expected: [100, 100])")
+    print(f"{'✓ Correct!' if calls == [100, 100] else '✗ Not quite right.'}")
+
+
+def benchmark_overhead(calls: int = 1_000_000):
+    """Measure per-call overhead of the timer for several sampling rates."""
+    print(f"\n=== Timer Overhead Benchmark ({calls:,} calls) ===")
+
+    def noop(x):
+        return x
+
+    def run(func) -> float:
+        start = time.perf_counter_ns()
+        for i in range(calls):
+            func(i)
+        return (time.perf_counter_ns() - start) / calls
+
+    baseline = run(noop)
+    print(f"{'variant':<22} {'ns/call':>8} {'overhead ns':>12}")
+    print(f"{'undecorated':<22} {baseline:>8.0f} {0:>12.0f}")
+
+    def print_and_time(x):
+        # The original timer_decorator body, minus the print itself
+        start_time = time.time()
+        result = noop(x)
+        end_time = time.time()
+        f"noop took {end_time - start_time:.4f} seconds to execute"
+        return result
+
+    per_call = run(print_and_time)
+    print(f"{'time.time() + format':<22} {per_call:>8.0f} {per_call - baseline:>12.0f}")
+
+    @functools.wraps(noop)
+    def passthrough(*args, **kwargs):
+        return noop(*args, **kwargs)
+
+    # The floor for any *args/**kwargs decorator, before doing any timing
+    per_call = run(passthrough)
+    print(f"{'bare wrapper':<22} {per_call:>8.0f} {per_call - baseline:>12.0f}")
+    for sample_every in (1, 16, 128):
+        registry = MetricsRegistry()
+        per_call = run(registry.timer(noop, sample_every=sample_every))
+        print(f"{f'sample_every={sample_every}':<22} {per_call:>8.0f} {per_call - baseline:>12.0f}")
+
+
+def main():
+    """Demonstrate and benchmark the metrics registry."""
+    demonstrate_metrics()
+    benchmark_overhead()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Pipeline Compiler
+This module backs compose(..., compiled=True) and pipe(..., compiled=True)
+in 04_functional_concepts.py. Instead of looping over the stage list on
+every call, it generates one flat function that calls each stage directly,
+and inlines simple lambdas, builtins and operator partials as expressions.
+"""
+
+import ast
+import builtins
+import functools
+import inspect
+import operator
+import textwrap
+import types
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+# operator functions that can be written as an expression on x
+_UNARY_OPERATORS = {
+    operator.neg: "(-{x})",
+    operator.pos: "(+{x})",
+    operator.not_: "(not {x})",
+    operator.invert: "(~{x})",
+    operator.truth: "bool({x})",
+}
+
+# operator functions that partial(op, constant) turns into "constant op x"
+_BINARY_OPERATORS = {
+    operator.add: "+", operator.sub: "-", operator.mul: "*",
+    operator.truediv: "/", operator.floordiv: "//", operator.mod: "%",
+    operator.pow: "**", operator.and_: "&", operator.or_: "|",
+    operator.xor: "^", operator.lshift: "<<", operator.rshift: ">>",
+    operator.lt: "<", operator.le: "<=", operator.gt: ">",
+    operator.ge: ">=", operator.eq: "==", operator.ne: "!=",
+}
+
+_ARG = "x"
+
+
+class _RenameArgument(ast.NodeTransformer):
+    """
+    Rename a lambda's parameter to the pipeline's running variable, and
+    turn each of its global names into a lookup in its module's globals.
+    """
+
+    def __init__(self, old: str, global_names: Set[str], globals_name: str):
+        self.old = old
+        self.global_names = global_names
+        self.globals_name = globals_name
+
+    def visit_Name(self, node: ast.AST) -> ast.AST:
+        if node.id == self.old:
+            return ast.copy_location(ast.Name(id=_ARG, ctx=node.ctx), node)
+        if node.id in self.global_names:
+            # Read when the pipeline runs, as the lambda itself would
+            lookup = ast.Subscript(value=ast.Name(id=self.globals_name, ctx=ast.Load()),
+                                   slice=ast.Constant(node.id), ctx=node.ctx)
+            return ast.copy_location(lookup, node)
+        return node
+
+
+def _find_lambda_node(func: types.FunctionType) -> Optional[ast.Lambda]:
+    """Locate the AST of a lambda by compiling candidates from its source."""
+    try:
+        source = textwrap.dedent(inspect.getsource(func))
+    except (OSError, TypeError):
+        return None
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        # getsource() can return a fragment, such as one argument of a call
+        # spread over several lines; try it as a bare expression
+        try:
+            tree = ast.parse(f"({source.strip().rstrip(',')})")
+        except SyntaxError:
+            return None
+
+    code = func.__code__
+    similar = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Lambda):
+            continue
+        compiled = compile(ast.Expression(node), code.co_filename, "eval")
+        for const in compiled.co_consts:
+            if (isinstance(const, types.CodeType)
+                    and const.co_consts == code.co_consts
+                    and const.co_names == code.co_names
+                    and const.co_varnames == code.co_varnames):
+                if const.co_code == code.co_code:
+                    return node
+                # Bytecode can differ out of context (method calls on imported
+                # modules, for one), so fall back to an unambiguous match
+                similar.append(node)
+    return similar[0] if len(similar) == 1 else None
+
+
+def _inline_lambda(func: Callable, index: int, namespace: Dict[str, Any]) -> Optional[str]:
+    """
+    Return an expression for a single-argument lambda, or None.
+
+    Global names used by the lambda are looked up in its module's globals
+    each time the pipeline runs, so rebinding one later changes the
+    compiled pipeline just as it changes the lambda. Builtins it uses are
+    recorded in the generated function's namespace, so no later stage can
+    rebind them.
+    """
+    if not isinstance(func, types.FunctionType) or func.__name__ != "<lambda>":
+        return None
+    code = func.__code__
+    if (code.co_argcount != 1 or code.co_kwonlyargcount or func.__closure__
+            or func.__defaults__ or code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)):
+        return None
+
+    node = _find_lambda_node(func)
+    if node is None:
+        return None
+    body = node.body
+    for child in ast.walk(body):
+        # Nested scopes or assignments would change meaning once inlined
+        if isinstance(child, (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp,
+                              ast.GeneratorExp, ast.NamedExpr, ast.Await, ast.Yield,
+                              ast.YieldFrom)):
+            return None
+
+    parameter = node.args.args[0].arg
+    global_names = set()
+    needed = {}
+    for child in ast.walk(body):
+        if isinstance(child, ast.Name) and child.id != parameter:
+            if child.id == _ARG:
+                return None
+            if child.id in func.__globals__:
+                global_names.add(child.id)
+            elif hasattr(builtins, child.id):
+                needed[child.id] = getattr(builtins, child.id)
+            else:
+                return None
+    for name, value in needed.items():
+        if name in namespace and namespace[name] is not value:
+            return None
+
+    namespace.update(needed)
+    globals_name = f"_globals{index}"
+    if global_names:
+        namespace[globals_name] = func.__globals__
+    renamed = _RenameArgument(parameter, global_names, globals_name).visit(body)
+    return f"({ast.unparse(renamed)})"
+
+
+def _inline_known(func: Callable, index: int, namespace: Dict[str, Any]) -> Optional[str]:
+    """
+    Return an expression for builtins and operator functions, or None.
+
+    An inlined builtin's name is reserved in namespace, so a later lambda
+    whose global of that name is something else is not inlined over it.
+    """
+    if isinstance(func, (types.BuiltinFunctionType, type)):
+        template = _UNARY_OPERATORS.get(func)
+        if template:
+            return template.format(x=_ARG)
+        # Builtin functions and types such as abs, len, str or int
+        name = func.__name__
+        if getattr(builtins, name, None) is func and namespace.setdefault(name, func) is func:
+            return f"{name}({_ARG})"
+    if isinstance(func, functools.partial) and not func.keywords and len(func.args) == 1:
+        symbol = _BINARY_OPERATORS.get(func.func)
+        if symbol:
+            constant = f"_const{index}"
+            namespace[constant] = func.args[0]
+            return f"({constant} {symbol} {_ARG})"
+    return None
+
+
+def compile_pipeline(stages: Tuple[Callable[[Any], Any], ...]) -> Callable[[Any], Any]:
+    """
+    Generate a single function that applies stages left to right.
+
+    The generated function for (f, lambda x: x + 1, abs) is equivalent to:
+
+        def compiled_pipeline(x):
+            x = _stage0(x)
+            x = (x + 1)
+            x = abs(x)
+            return x
+
+    An inlined lambda's globals are read on each call through its module's
+    globals dict (x * factor becomes x * _globals1['factor']), so they
+    never share the generated namespace with _stageN and _constN, and a
+    cached pipeline sees a global rebound after it was compiled.
+
+    Results are cached per stage tuple, so building the same pipeline again
+    is a dictionary lookup. Tuples holding unhashable stages (callable
+    instances that define __eq__ without __hash__, say) are compiled
+    every time instead.
+    """
+    try:
+        hash(stages)
+    except TypeError:
+        return _compile_uncached(stages)
+    return _compile_cached(stages)
+
+
+def _compile_uncached(stages: Tuple[Callable[[Any], Any], ...]) -> Callable[[Any], Any]:
+    """Generate the pipeline function for compile_pipeline()."""
+    namespace: Dict[str, Any] = {}
+    lines = [f"def compiled_pipeline({_ARG}):"]
+    for index, stage in enumerate(stages):
+        expression = _inline_lambda(stage, index, namespace) or _inline_known(stage, index, namespace)
+        if expression is None:
+            name = f"_stage{index}"
+            namespace[name] = stage
+            expression = f"{name}({_ARG})"
+        lines.append(f"    {_ARG} = {expression}")
+    lines.append(f"    return {_ARG}")
+    source = "\n".join(lines)
+
+    exec(compile(source, f"<compiled pipeline of {len(stages)} stages>", "exec"), namespace)
+    function = namespace["compiled_pipeline"]
+    function.__source__ = source
+    return function
+
+
+_compile_cached = functools.lru_cache(maxsize=256)(_compile_uncached)
+
+
+def demonstrate_pipeline_compiler():
+    """Show the generated source for a small pipeline."""
+    print("=== Pipeline Compiler ===")
+
+    def describe(value):
+        return f"value={value}"
+
+    pipeline = compile_pipeline((
+        lambda x: x * x,
+        functools.partial(operator.add, 10),
+        operator.neg,
+        abs,
+        describe,
+    ))
+    print(pipeline.__source__)
+    print(f"Result for 5: {pipeline(5)} (Expected: value=35)")
+
+    # A global that shadows a builtin must not rebind an inlined builtin stage
+    shadowed = types.FunctionType((lambda x: abs(x)).__code__, {"abs": lambda x: x + 100})
+    results = [compile_pipeline(stages)(-3) for stages in ((abs, shadowed), (shadowed, abs))]
+    print(f"abs then shadowed abs, and reversed: {results} (Expected: [103, 97])")
+
+    class Scale:
+        # Defining __eq__ without __hash__ makes instances unhashable
+        def __init__(self, factor):
+            self.factor = factor
+
+        def __eq__(self, other):
+            return isinstance(other, Scale) and other.factor == self.factor
+
+        def __call__(self, x):
+            return x * self.factor
+
+    unhashable = compile_pipeline((Scale(3), abs))(-2)
+    print(f"Unhashable stage, uncached: {unhashable} (Expected: 6)")
+
+    # Globals are read when the pipeline runs, so rebinding one is seen even
+    # through the cache, and a global named like a generated stage is harmless
+    module_globals = {"factor": 2, "_stage0": abs}
+    scale = types.FunctionType((lambda x: x * factor).__code__, module_globals)
+    sneaky = types.FunctionType((lambda x: _stage0(x)).__code__, module_globals)
+    before = compile_pipeline((scale,))(1)
+    module_globals["factor"] = 3
+    rebound = [compile_pipeline((scale,))(1), scale(1)]
+    collided = compile_pipeline((Scale(-10), sneaky))(1)
+    print(f"factor 2 then 3: {[before] + rebound} (Expected: [2, 3, 3]), "
+          f"global _stage0: {collided} (Expected: 10)")
+    ok = results == [103, 97] and unhashable == 6
+    ok &= [before] + rebound == [2, 3, 3] and collided == 10
+    print(f"{'✓ Correct!' if ok else '✗ Not quite right.'}")
+
+
+def benchmark_pipelines(stage_counts=(2, 10, 50), number: int = 100_000):
+    """Compare the looping pipeline with compiled pipelines of several lengths."""
+    from timeit import timeit
+
+    print("\n=== Pipeline Benchmark (ns per call) ===")
+
+    def loop_pipeline(*functions):
+        def piped(x):
+            result = x
+            for f in functions:
+                result = f(result)
+            return result
+        return piped
+
+    def add_one(x):
+        return x + 1
+
+    print(f"{'stages':>6} {'loop':>8} {'compiled calls':>15} {'compiled inline':>16}")
+    for count in stage_counts:
+        lambdas = tuple(lambda x: x + 1 for _ in range(count))
+        functions = (add_one,) * count
+        timings = []
+        for pipeline in (loop_pipeline(*lambdas), compile_pipeline(functions),
+                         compile_pipeline(lambdas)):
+            assert pipeline(0) == count
+            timings.append(timeit(lambda: pipeline(1), number=number) / number * 1e9)
+        print(f"{count:>6} {timings[0]:>8.0f} {timings[1]:>15.0f} {timings[2]:>16.0f}")
+
+
+def main():
+    """Demonstrate and benchmark the pipeline compiler."""
+    demonstrate_pipeline_compiler()
+    benchmark_pipelines()
+
+
+if __name__ == "__main__":
+    main()